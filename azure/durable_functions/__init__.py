@@ -10,6 +10,11 @@ from .models.OrchestrationRuntimeStatus import OrchestrationRuntimeStatus
 from .models.DurableOrchestrationContext import DurableOrchestrationContext
 from .models.DurableEntityContext import DurableEntityContext
 from .models.RetryOptions import RetryOptions
+from .models.ReplayCache import ReplayCache
+from .models.OrchestrationMetrics import OrchestrationMetrics
+from .models.EncodedInput import EncodedInput
+from .models.utils.type_codecs import register_codec
+from .models.history import HistoryEventCache
 from .models.TokenSource import ManagedIdentityTokenSource
 import json
 from pathlib import Path
@@ -64,12 +69,17 @@ __all__ = [
     'Orchestrator',
     'Entity',
     'EntityId',
+    'HistoryEventCache',
     'DurableOrchestrationClient',
     'DurableEntityContext',
     'DurableOrchestrationContext',
+    'EncodedInput',
     'ManagedIdentityTokenSource',
+    'OrchestrationMetrics',
     'OrchestrationRuntimeStatus',
-    'RetryOptions'
+    'ReplayCache',
+    'RetryOptions',
+    'register_codec'
 ]
 
 try:
@@ -2,13 +2,24 @@
 #  Licensed under the MIT License.
 from .metadata import OrchestrationTrigger, ActivityTrigger, EntityTrigger,\
     DurableClient
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 from azure.durable_functions.entity import Entity
 from azure.durable_functions.orchestrator import Orchestrator
 from azure.durable_functions import DurableOrchestrationClient
+from azure.durable_functions.constants import PARTITION_ORCHESTRATOR_NAME
+from azure.durable_functions.models.OrchestrationMetrics import OrchestrationMetrics
+from azure.durable_functions.models.ReplayCache import ReplayCache
+from azure.durable_functions.models.history import HistoryEventCache
+from azure.durable_functions.models.utils.partition_utils import partition_orchestrator
+from azure.durable_functions.models.utils import payload_compression, payload_formats, \
+    payload_store, type_codecs
+from azure.durable_functions.models.utils.type_codecs import deserialize_custom_object
+from azure.functions.decorators.function_app import FunctionBuilder
 from typing import Union
-from azure.functions import FunctionRegister, TriggerApi, BindingApi, AuthLevel
+from azure.functions import FunctionRegister, TriggerApi, BindingApi, AuthLevel, Function
 from functools import wraps
+import inspect
+import typing
 
 try:
     from azure.functions import SettingsApi
@@ -19,6 +30,60 @@ except ImportError:  # backwards compatibility path
         pass
 
 
+_JSON_SCALAR_TYPES = (str, bool, int, float, type(None))
+
+
+def _get_parameter_annotation(func: Callable, parameter_name: str) -> typing.Any:
+    try:
+        return typing.get_type_hints(func).get(parameter_name)
+    except Exception:
+        # annotations that cannot be evaluated are not used
+        return None
+
+
+def _get_orchestrator_options(replay_cache: Optional[ReplayCache],
+                              history_cache: Optional[HistoryEventCache],
+                              metrics_callback: Optional[Callable[[OrchestrationMetrics], None]],
+                              deduplicate_inputs: Optional[bool]) -> Dict[str, Any]:
+    """Get the keyword arguments of `Orchestrator.create` that are set."""
+    options = {"replay_cache": replay_cache, "history_cache": history_cache,
+               "metrics_callback": metrics_callback, "deduplicate_inputs": deduplicate_inputs}
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def _has_payload_features() -> bool:
+    return (payload_store.get_payload_store() is not None
+            or payload_compression.get_compressor() is not None
+            or payload_formats.get_binary_format() is not None)
+
+
+def _encode_custom_objects(value: typing.Any) -> typing.Any:
+    """Encode the custom objects with a codec in an activity's output.
+
+    The activity trigger only encodes custom objects following the `to_json` convention,
+    so objects with a codec are replaced by their encoding beforehand. Values without
+    such objects are returned as they are.
+    """
+    if isinstance(value, _JSON_SCALAR_TYPES):
+        return value
+    if isinstance(value, dict):
+        items = {key: _encode_custom_objects(item) for key, item in value.items()}
+        if any(items[key] is not item for key, item in value.items()):
+            return items
+        return value
+    if isinstance(value, (list, tuple)):
+        items = [_encode_custom_objects(item) for item in value]
+        if any(encoded is not item for encoded, item in zip(items, value)):
+            return items
+        return value
+    codec = type_codecs.get_type_codec(type(value))
+    if codec is None:
+        # left to the activity trigger, e.g. objects following the `to_json` convention
+        return value
+    return {type_codecs.TYPE_KEY: codec.name,
+            type_codecs.DATA_KEY: _encode_custom_objects(codec.encode(value))}
+
+
 class Blueprint(TriggerApi, BindingApi, SettingsApi):
     """Durable Functions (DF) Blueprint container.
 
@@ -45,6 +110,9 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
             New instance of a Durable Functions app
         """
         super().__init__(auth_level=http_auth_level)
+        # the options of `Orchestrator.create` for all orchestrators of this container,
+        # unless overridden by `orchestration_trigger`
+        self._orchestrator_options: Dict[str, Any] = {}
 
     def _configure_entity_callable(self, wrap) -> Callable:
         """Obtain decorator to construct an Entity class from a user-defined Function.
@@ -73,7 +141,8 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
 
         return decorator
 
-    def _configure_orchestrator_callable(self, wrap) -> Callable:
+    def _configure_orchestrator_callable(self, wrap,
+                                         orchestrator_options: Dict[str, Any]) -> Callable:
         """Obtain decorator to construct an Orchestrator class from a user-defined Function.
 
         In the old programming model, this decorator's logic was unavoidable boilerplate
@@ -83,6 +152,8 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
         ----------
         wrap: Callable
             The next decorator to be applied.
+        orchestrator_options: Dict[str, Any]
+            The keyword arguments of `Orchestrator.create`, besides the Function.
 
         Returns
         -------
@@ -92,7 +163,7 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
         """
         def decorator(orchestrator_func):
             # Construct an orchestrator based on the end-user code
-            handle = Orchestrator.create(orchestrator_func)
+            handle = Orchestrator.create(orchestrator_func, **orchestrator_options)
 
             # invoke next decorator, with the Orchestrator as input
             handle.__name__ = orchestrator_func.__name__
@@ -100,10 +171,82 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
 
         return decorator
 
+    def _configure_activity_callable(self, wrap, input_name: str) -> Callable:
+        """Obtain decorator to offload the payloads of a user-defined activity Function.
+
+        If a payload store, compressor or binary format is configured, or if the annotated
+        types of the Function's input or output have a codec, the wrapped Function loads
+        its input if it was offloaded to the payload store, compressed or binary-encoded,
+        and encodes, compresses and offloads its output as the orchestrator does. Inputs
+        are converted to the annotated type of their parameter, if it has a codec, and
+        custom objects in outputs are encoded via their codecs. Other Functions are left
+        as they are, so these features must be configured before registering activities.
+
+        Parameters
+        ----------
+        wrap: Callable
+            The next decorator to be applied.
+        input_name: str
+            Parameter name of the Activity input.
+
+        Returns
+        -------
+        Callable
+            The function to wrap the user-defined Function, wrapped by the next
+            decorator in the sequence.
+        """
+        def resolve_input(kwargs, convert_input):
+            if input_name in kwargs:
+                input_ = payload_formats.decode_value(payload_compression.decompress(
+                    payload_store.resolve(kwargs[input_name], deserialize_custom_object),
+                    deserialize_custom_object))
+                kwargs[input_name] = input_ if convert_input is None else convert_input(input_)
+
+        def offload_output(output):
+            return payload_store.offload_value(payload_compression.compress_value(
+                _encode_custom_objects(payload_formats.encode_value(output))))
+
+        def wrap_user_code(activity_func):
+            convert_input = type_codecs.get_converter(
+                _get_parameter_annotation(activity_func, input_name))
+            if (convert_input is None and not _has_payload_features()
+                    and type_codecs.get_converter(
+                        _get_parameter_annotation(activity_func, "return")) is None):
+                return activity_func
+
+            if inspect.iscoroutinefunction(activity_func):
+                @wraps(activity_func)
+                async def handle(*args, **kwargs):
+                    resolve_input(kwargs, convert_input)
+                    return offload_output(await activity_func(*args, **kwargs))
+            else:
+                @wraps(activity_func)
+                def handle(*args, **kwargs):
+                    resolve_input(kwargs, convert_input)
+                    return offload_output(activity_func(*args, **kwargs))
+
+            return handle
+
+        def decorator(activity_func):
+            if isinstance(activity_func, FunctionBuilder):
+                # functions already configured by other decorators wrap their user code
+                activity_func._function._func = wrap_user_code(activity_func._function._func)
+                return wrap(activity_func)
+            return wrap(wrap_user_code(activity_func))
+
+        return decorator
+
     def orchestration_trigger(self, context_name: str,
-                              orchestration: Optional[str] = None):
+                              orchestration: Optional[str] = None,
+                              replay_cache: Optional[ReplayCache] = None,
+                              history_cache: Optional[HistoryEventCache] = None,
+                              metrics_callback: Optional[
+                                  Callable[[OrchestrationMetrics], None]] = None,
+                              deduplicate_inputs: Optional[bool] = None):
         """Register an Orchestrator Function.
 
+        The options of the Orchestrator default to those of the app, see `DFApp`.
+
         Parameters
         ----------
         context_name: str
@@ -111,8 +254,21 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
         orchestration: Optional[str]
             Name of Orchestrator Function.
             The value is None by default, in which case the name of the method is used.
+        replay_cache: Optional[ReplayCache]
+            Opt-in cache of suspended orchestration instances, see `Orchestrator.create`.
+        history_cache: Optional[HistoryEventCache]
+            Opt-in cache of decoded histories, see `Orchestrator.create`.
+        metrics_callback: Optional[Callable[[OrchestrationMetrics], None]]
+            Opt-in callback receiving the metrics of each invocation, see
+            `Orchestrator.create`.
+        deduplicate_inputs: Optional[bool]
+            Whether to encode an input object only once per invocation, see
+            `Orchestrator.create`.
         """
-        @self._configure_orchestrator_callable
+        orchestrator_options = dict(self._orchestrator_options)
+        orchestrator_options.update(_get_orchestrator_options(
+            replay_cache, history_cache, metrics_callback, deduplicate_inputs))
+
         @self._configure_function_builder
         def wrap(fb):
 
@@ -124,7 +280,22 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
 
             return decorator()
 
-        return wrap
+        return self._configure_orchestrator_callable(wrap, orchestrator_options)
+
+    def register_partition_orchestrator(self):
+        """Register the built-in orchestrator of `call_activity_partitioned`.
+
+        It is registered under the name `PARTITION_ORCHESTRATOR_NAME`, unless it already is.
+        `DFApp` registers it automatically, so only Blueprints registered with other apps,
+        which call `DurableOrchestrationContext.call_activity_partitioned`, must do so.
+        """
+        if any(builder._function.get_function_name() == PARTITION_ORCHESTRATOR_NAME
+               for builder in self._function_builders):
+            return
+        register_function = self.function_name(name=PARTITION_ORCHESTRATOR_NAME)
+        register_orchestrator = self.orchestration_trigger(
+            context_name="context", orchestration=PARTITION_ORCHESTRATOR_NAME)
+        register_function(register_orchestrator(partition_orchestrator))
 
     def activity_trigger(self, input_name: str,
                          activity: Optional[str] = None):
@@ -148,7 +319,7 @@ class Blueprint(TriggerApi, BindingApi, SettingsApi):
 
             return decorator()
 
-        return wrap
+        return self._configure_activity_callable(wrap, input_name)
 
     def entity_trigger(self, context_name: str,
                        entity_name: Optional[str] = None):
@@ -246,4 +417,69 @@ class DFApp(Blueprint, FunctionRegister):
     Exports the decorators required to declare and index DF Function-types.
     """
 
-    pass
+    def __init__(self,
+                 http_auth_level: Union[AuthLevel, str] = AuthLevel.FUNCTION,
+                 payload_compressor: Optional[Union[
+                     payload_compression.PayloadCompressor, str]] = None,
+                 payload_format: Optional[Union[payload_formats.BinaryFormat, str]] = None,
+                 replay_cache: Optional[ReplayCache] = None,
+                 history_cache: Optional[HistoryEventCache] = None,
+                 metrics_callback: Optional[Callable[[OrchestrationMetrics], None]] = None,
+                 deduplicate_inputs: bool = False):
+        """Instantiate a Durable Functions app with which to register Functions.
+
+        Parameters
+        ----------
+        http_auth_level: Union[AuthLevel, str]
+            Authorization level required for Function invocation.
+            Defaults to AuthLevel.Function.
+        payload_compressor: Optional[Union[PayloadCompressor, str]]
+            Opt-in compressor of large payloads, or the name of a built-in compressor:
+            "zlib" or "zstd". It is set app-wide, for all functions of this worker.
+            Compressed payloads are decompressed regardless of this setting.
+        payload_format: Optional[Union[BinaryFormat, str]]
+            Opt-in binary format of payloads, or the name of a built-in format:
+            "msgpack" or "cbor". It is set app-wide, for all functions of this worker.
+            Binary-encoded payloads are decoded regardless of this setting.
+        replay_cache: Optional[ReplayCache]
+            Opt-in cache of suspended orchestration instances, shared by the orchestrators
+            of this app, see `Orchestrator.create`.
+        history_cache: Optional[HistoryEventCache]
+            Opt-in cache of decoded histories, shared by the orchestrators of this app,
+            see `Orchestrator.create`.
+        metrics_callback: Optional[Callable[[OrchestrationMetrics], None]]
+            Opt-in callback receiving the metrics of each invocation of the orchestrators
+            of this app, see `Orchestrator.create`.
+        deduplicate_inputs: bool
+            Opt-in to encode an input object only once per invocation of the orchestrators
+            of this app, see `Orchestrator.create`.
+
+        These orchestrator options apply to the orchestrators registered via this app's
+        `orchestration_trigger`, which may override them, but not to those of Blueprints.
+
+        Returns
+        -------
+        DFApp
+            New instance of a Durable Functions app
+        """
+        super().__init__(http_auth_level=http_auth_level)
+        self._orchestrator_options.update(_get_orchestrator_options(
+            replay_cache, history_cache, metrics_callback, deduplicate_inputs))
+        if payload_compressor is not None:
+            payload_compression.set_compressor(payload_compressor)
+        if payload_format is not None:
+            payload_formats.set_binary_format(payload_format)
+
+    def get_functions(self) -> List[Function]:
+        """Get the Functions of this app, including the built-in orchestrators of the SDK.
+
+        The built-in orchestrator of `call_activity_partitioned` is registered on first call,
+        after the Functions of the app and of its Blueprints, unless one of them registered it.
+
+        Returns
+        -------
+        List[Function]
+            The Functions to be indexed by the Python Functions runtime
+        """
+        self.register_partition_orchestrator()
+        return super().get_functions()
@@ -1,6 +1,6 @@
 from typing import Optional, Any, Dict, Tuple, List, Callable
-from azure.functions._durable_functions import _deserialize_custom_object
-import json
+from .utils.type_codecs import deserialize_custom_object
+from .utils import json_codec, payload_compression, payload_formats
 
 
 class DurableEntityContext:
@@ -102,7 +102,7 @@ class DurableEntityContext:
         DurableEntityContext
             The DurableEntityContext originated from the input string
         """
-        json_dict = json.loads(json_str)
+        json_dict = json_codec.loads(json_str)
         json_dict["name"] = json_dict["self"]["name"]
         json_dict["key"] = json_dict["self"]["key"]
         json_dict.pop("self")
@@ -159,7 +159,7 @@ class DurableEntityContext:
         """
         input_ = None
         req_input = self._input
-        req_input = json.loads(req_input)
+        req_input = json_codec.loads(req_input)
         input_ = None if req_input is None else from_json_util(req_input)
         return input_
 
@@ -198,4 +198,5 @@ def from_json_util(json_str: str) -> Any:
     Any:
         The original datatype that was serialized
     """
-    return json.loads(json_str, object_hook=_deserialize_custom_object)
+    return payload_formats.decode_value(payload_compression.decompress(
+        json_codec.loads_custom_objects(json_str), deserialize_custom_object))
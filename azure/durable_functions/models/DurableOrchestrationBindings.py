@@ -1,4 +1,4 @@
-import json
+from .utils import json_codec
 from typing import Dict, Optional
 
 from azure.durable_functions.models.FunctionContext import FunctionContext
@@ -62,5 +62,5 @@ class DurableOrchestrationBindings:
         DurableOrchestrationBindings
             New instance of the durable orchestration binding class
         """
-        json_dict = json.loads(json_string)
+        json_dict = json_codec.loads(json_string)
         return cls(**json_dict)
@@ -1,4 +1,4 @@
-import json
+from .utils import json_codec
 from datetime import datetime
 from typing import List, Any, Optional, Dict, Union
 from time import time
@@ -15,7 +15,7 @@ from .OrchestrationRuntimeStatus import OrchestrationRuntimeStatus
 from ..models.DurableOrchestrationBindings import DurableOrchestrationBindings
 from .utils.http_utils import get_async_request, post_async_request, delete_async_request
 from .utils.entity_utils import EntityId
-from azure.functions._durable_functions import _serialize_custom_object
+from .utils.type_codecs import serialize_custom_object
 
 
 class DurableOrchestrationClient:
@@ -109,7 +109,7 @@ class DurableOrchestrationClient:
         http_management_payload = self.get_client_response_links(request, instance_id)
         response_args = {
             "status_code": 202,
-            "body": json.dumps(http_management_payload),
+            "body": json_codec.dumps(http_management_payload),
             "headers": {
                 "Content-Type": "application/json",
                 "Location": http_management_payload["statusQueryGetUri"],
@@ -244,7 +244,7 @@ class DurableOrchestrationClient:
         request_url = self._get_raise_event_url(
             instance_id, event_name, task_hub_name, connection_name)
 
-        response = await self._post_async_request(request_url, json.dumps(event_data))
+        response = await self._post_async_request(request_url, json_codec.dumps(event_data))
 
         switch_statement = {
             202: lambda: None,
@@ -547,7 +547,7 @@ class DurableOrchestrationClient:
         request_url = options.to_url(self._orchestration_bindings.rpc_base_url)
         response = await self._post_async_request(
             request_url,
-            json.dumps(operation_input) if operation_input else None)
+            json_codec.dumps(operation_input) if operation_input else None)
 
         switch_statement = {
             202: lambda: None  # signal accepted
@@ -565,7 +565,7 @@ class DurableOrchestrationClient:
     @staticmethod
     def _create_http_response(
             status_code: int, body: Union[str, Any]) -> func.HttpResponse:
-        body_as_json = body if isinstance(body, str) else json.dumps(body)
+        body_as_json = body if isinstance(body, str) else json_codec.dumps(body)
         response_args = {
             "status_code": status_code,
             "body": body_as_json,
@@ -598,7 +598,7 @@ class DurableOrchestrationClient:
             If the JSON serialization failed, see `serialize_custom_object`
         """
         if client_input is not None:
-            return json.dumps(client_input, default=_serialize_custom_object)
+            return json_codec.dumps(client_input, default=serialize_custom_object)
         return None
 
     @staticmethod
@@ -16,28 +16,36 @@ from azure.durable_functions.models.actions.CallSubOrchestratorAction import \
     CallSubOrchestratorAction
 from azure.durable_functions.models.actions.CreateTimerAction import CreateTimerAction
 from azure.durable_functions.models.Task import WhenAllTask, WhenAnyTask, AtomicTask, \
-    RetryAbleTask
+    RetryAbleTask, BoundedWhenAllTask, AsCompletedTask, PartitionedWhenAllTask, ReduceTask
 from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
 from azure.durable_functions.models.ReplaySchema import ReplaySchema
-import json
+from .utils import json_codec, payload_compression, payload_formats
 import datetime
 import inspect
-from typing import DefaultDict, List, Any, Dict, Optional, Tuple, Union, Callable
+from typing import DefaultDict, List, Any, Dict, Iterable, Iterator, Optional, Sequence, \
+    Union, Callable
 from uuid import UUID, uuid5, NAMESPACE_URL, NAMESPACE_OID
 from datetime import timezone
 
 from .RetryOptions import RetryOptions
+from .EncodedInput import EncodedInputCache
 from .FunctionContext import FunctionContext
-from .history import HistoryEvent, HistoryEventType
+from .history import HistoryEvent, HistoryEventType, HistoryEventCache, HistoryEventDecoder
 from .actions import Action
 from ..models.TokenSource import TokenSource
 from .utils.entity_utils import EntityId
-from azure.functions._durable_functions import _deserialize_custom_object
-from azure.durable_functions.constants import DATETIME_STRING_FORMAT
+from .utils.partition_utils import split_into_partitions
+from .utils.type_codecs import deserialize_custom_object
+from azure.durable_functions.constants import DATETIME_STRING_FORMAT, \
+    PARTITION_ORCHESTRATOR_NAME
 from azure.durable_functions.decorators.metadata import OrchestrationTrigger, ActivityTrigger
 from azure.functions.decorators.function_app import FunctionBuilder
 
 
+# The size, in characters, from which orchestration trigger payloads are decoded incrementally
+STREAMING_DECODE_THRESHOLD = 2 ** 20
+
+
 class DurableOrchestrationContext:
     """Context of the durable orchestration execution.
 
@@ -47,9 +55,11 @@ class DurableOrchestrationContext:
 
     # parameter names are as defined by JSON schema and do not conform to PEP8 naming conventions
     def __init__(self,
-                 history: List[Dict[Any, Any]], instanceId: str, isReplaying: bool,
-                 parentInstanceId: str, input: Any = None, upperSchemaVersion: int = 0, **kwargs):
-        self._histories: List[HistoryEvent] = [HistoryEvent(**he) for he in history]
+                 history: List[Union[Dict[Any, Any], HistoryEvent]], instanceId: str,
+                 isReplaying: bool, parentInstanceId: str, input: Any = None,
+                 upperSchemaVersion: int = 0, **kwargs):
+        self._histories: List[HistoryEvent] = [
+            he if isinstance(he, HistoryEvent) else HistoryEvent(**he) for he in history]
         self._instance_id: str = instanceId
         self._is_replaying: bool = isReplaying
         self._parent_instance_id: str = parentInstanceId
@@ -57,9 +67,10 @@ class DurableOrchestrationContext:
         self._new_uuid_counter: int = 0
         self._sub_orchestrator_counter: int = 0
         self._continue_as_new_flag: bool = False
-        self.decision_started_event: HistoryEvent = \
-            [e_ for e_ in self.histories
-             if e_.event_type == HistoryEventType.ORCHESTRATOR_STARTED][0]
+        # this is almost always the first event, so there is no need to scan the whole history
+        self.decision_started_event: HistoryEvent = next(
+            e_ for e_ in self._histories
+            if e_.event_type == HistoryEventType.ORCHESTRATOR_STARTED)
         self._current_utc_datetime: datetime.datetime = \
             self.decision_started_event.timestamp
         self._new_uuid_counter = 0
@@ -73,30 +84,52 @@ class DurableOrchestrationContext:
         # make _input always a string
         # (consistent with Python Functions generic trigger/input bindings)
         if (isinstance(input, Dict)):
-            input = json.dumps(input)
+            input = json_codec.dumps(input)
 
         self._input: Any = input
         self.open_tasks: DefaultDict[Union[int, str], Union[List[TaskBase], TaskBase]]
         self.open_tasks = defaultdict(list)
-        self.deferred_tasks: Dict[Union[int, str], Tuple[HistoryEvent, bool, str]] = {}
+        self.deferred_tasks: Dict[Union[int, str], Callable[[], None]] = {}
+        # encodes each input object once per invocation, only set when opted in
+        self._input_cache: Optional[EncodedInputCache] = None
 
     @classmethod
-    def from_json(cls, json_string: str):
+    def from_json(cls, json_string: str, history_cache: Optional[HistoryEventCache] = None,
+                  stream_history: Optional[bool] = None):
         """Convert the value passed into a new instance of the class.
 
         Parameters
         ----------
         json_string: str
             Context passed a JSON serializable value to be converted into an instance of the class
+        history_cache: Optional[HistoryEventCache]
+            Cache of previously decoded histories. When provided, only the history events
+            appended since the instance's previous invocation are decoded.
+        stream_history: Optional[bool]
+            Whether to decode history events one at a time, while the payload is being decoded,
+            instead of decoding the entire payload first. This roughly halves the peak memory
+            of decoding, but cannot take advantage of a faster JSON codec. By default,
+            payloads of at least `STREAMING_DECODE_THRESHOLD` characters are streamed.
 
         Returns
         -------
         DurableOrchestrationContext
             New instance of the durable orchestration context class
         """
+        if stream_history is None:
+            stream_history = (isinstance(json_string, str)
+                              and len(json_string) >= STREAMING_DECODE_THRESHOLD)
+        if stream_history:
+            if history_cache is not None:
+                return cls(**history_cache.decode_payload(json_string))
+            return cls(**HistoryEventDecoder().decode(json_string))
+
         # We should consider parsing the `Input` field here as well,
         # instead of doing so lazily when `get_input` is called.
-        json_dict = json.loads(json_string)
+        json_dict = json_codec.loads(json_string)
+        if history_cache is not None:
+            json_dict["history"] = history_cache.decode(
+                json_dict["instanceId"], json_dict["history"])
         return cls(**json_dict)
 
     def _generate_task(self, action: Action,
@@ -145,6 +178,33 @@ class DurableOrchestrationContext:
         """
         self._is_replaying = is_replaying
 
+    def _set_input_deduplication(self, deduplicate_inputs: bool):
+        """Start a new invocation, deduplicating the encoding of its inputs when enabled.
+
+        Parameters
+        ----------
+        deduplicate_inputs : bool
+            Whether an input object passed to several functions is encoded only once
+        """
+        self._input_cache = EncodedInputCache() if deduplicate_inputs else None
+
+    def _encode_input(self, input_: Any) -> Any:
+        """Get the encoded input from the cache of this invocation, if enabled.
+
+        Parameters
+        ----------
+        input_ : Any
+            The JSON-serializable input
+
+        Returns
+        -------
+        Any
+            The `EncodedInput` of the input, or the input itself if not cached
+        """
+        if self._input_cache is None:
+            return input_
+        return self._input_cache.encode(input_)
+
     def call_activity(self, name: Union[str, Callable], input_: Optional[Any] = None) -> TaskBase:
         """Schedule an activity for execution.
 
@@ -154,25 +214,16 @@ class DurableOrchestrationContext:
             Either the name of the activity function to call, as a string or,
             in the Python V2 programming model, the activity function itself.
         input_: Optional[Any]
-            The JSON-serializable input to pass to the activity function.
+            The JSON-serializable input to pass to the activity function,
+            or its `EncodedInput`.
 
         Returns
         -------
         Task
             A Durable Task that completes when the called activity function completes or fails.
         """
-        if isinstance(name, Callable) and not isinstance(name, FunctionBuilder):
-            error_message = "The `call_activity` API received a `Callable` without an "\
-                "associated Azure Functions trigger-type. "\
-                "Please ensure you're using the Python programming model V2 "\
-                "and that your activity function is annotated with the `activity_trigger`"\
-                "decorator. Otherwise, provide in the name of the activity as a string."
-            raise ValueError(error_message)
-
-        if isinstance(name, FunctionBuilder):
-            name = self._get_function_name(name, ActivityTrigger)
-
-        action = CallActivityAction(name, input_)
+        name = self._get_activity_name(name)
+        action = CallActivityAction(name, self._encode_input(input_))
         task = self._generate_task(action)
         return task
 
@@ -189,7 +240,8 @@ class DurableOrchestrationContext:
         retry_options: RetryOptions
             The retry options for the activity function.
         input_: Optional[Any]
-            The JSON-serializable input to pass to the activity function.
+            The JSON-serializable input to pass to the activity function,
+            or its `EncodedInput`.
 
         Returns
         -------
@@ -197,18 +249,8 @@ class DurableOrchestrationContext:
             A Durable Task that completes when the called activity function completes or
             fails completely.
         """
-        if isinstance(name, Callable) and not isinstance(name, FunctionBuilder):
-            error_message = "The `call_activity` API received a `Callable` without an "\
-                "associated Azure Functions trigger-type. "\
-                "Please ensure you're using the Python programming model V2 "\
-                "and that your activity function is annotated with the `activity_trigger`"\
-                "decorator. Otherwise, provide in the name of the activity as a string."
-            raise ValueError(error_message)
-
-        if isinstance(name, FunctionBuilder):
-            name = self._get_function_name(name, ActivityTrigger)
-
-        action = CallActivityWithRetryAction(name, retry_options, input_)
+        name = self._get_activity_name(name)
+        action = CallActivityWithRetryAction(name, retry_options, self._encode_input(input_))
         task = self._generate_task(action, retry_options)
         return task
 
@@ -237,7 +279,7 @@ class DurableOrchestrationContext:
         """
         json_content: Optional[str] = None
         if content and content is not isinstance(content, str):
-            json_content = json.dumps(content)
+            json_content = json_codec.dumps(content)
         else:
             json_content = content
 
@@ -256,7 +298,8 @@ class DurableOrchestrationContext:
         name: Union[str, Callable]
             The name of the orchestrator function to call.
         input_: Optional[Any]
-            The JSON-serializable input to pass to the orchestrator function.
+            The JSON-serializable input to pass to the orchestrator function,
+            or its `EncodedInput`.
         instance_id: Optional[str]
             A unique ID to use for the sub-orchestration instance.
 
@@ -276,7 +319,7 @@ class DurableOrchestrationContext:
         if isinstance(name, FunctionBuilder):
             name = self._get_function_name(name, OrchestrationTrigger)
 
-        action = CallSubOrchestratorAction(name, input_, instance_id)
+        action = CallSubOrchestratorAction(name, self._encode_input(input_), instance_id)
         task = self._generate_task(action)
         return task
 
@@ -293,7 +336,8 @@ class DurableOrchestrationContext:
         retry_options: RetryOptions
             The settings for retrying this sub-orchestrator in case of a failure.
         input_: Optional[Any]
-            The JSON-serializable input to pass to the activity function. Defaults to None.
+            The JSON-serializable input to pass to the activity function, or its
+            `EncodedInput`. Defaults to None.
         instance_id: str
             The instance ID of the sub-orchestrator to call.
 
@@ -313,14 +357,73 @@ class DurableOrchestrationContext:
         if isinstance(name, FunctionBuilder):
             name = self._get_function_name(name, OrchestrationTrigger)
 
-        action = CallSubOrchestratorWithRetryAction(name, retry_options, input_, instance_id)
+        action = CallSubOrchestratorWithRetryAction(
+            name, retry_options, self._encode_input(input_), instance_id)
         task = self._generate_task(action, retry_options)
         return task
 
+    def call_activity_partitioned(self, name: Union[str, Callable], inputs: Sequence[Any],
+                                  partition_size: int = 1000) -> TaskBase:
+        """Schedule an activity function for every input, via partitioning sub-orchestrations.
+
+        When there are more than `partition_size` inputs, they are split into at most
+        `partition_size` partitions, each of which is handled by a sub-orchestration.
+        The sub-orchestrations partition their inputs in turn, until no more than
+        `partition_size` activities are scheduled by any orchestration. This keeps every
+        history small, at the cost of additional orchestrations.
+
+        The sub-orchestrations run the built-in orchestrator named
+        `PARTITION_ORCHESTRATOR_NAME`, which `DFApp` registers automatically, and which
+        Blueprints registered with other apps register via `register_partition_orchestrator`.
+        Their instance IDs are derived from `new_uuid`, so they are unique per call, and per
+        execution of the calling instance.
+
+        Parameters
+        ----------
+        name: str | Callable
+            Either the name of the activity function or the Function itself
+        inputs: Sequence[Any]
+            The JSON-serializable inputs to pass to the activity function, one per call
+        partition_size: int
+            The maximum number of activities or sub-orchestrations scheduled by a single
+            orchestration. Defaults to 1000.
+
+        Returns
+        -------
+        Task
+            A Durable Task that completes with the results of all activities, in the order
+            of their inputs, or fails when any activity fails.
+
+        Raises
+        ------
+        ValueError
+            When `partition_size` is less than 2, or `name` is a `Callable` that is not
+            an activity function
+        """
+        if partition_size < 2:
+            raise ValueError(f"partition_size must be at least 2, but was {partition_size}.")
+        name = self._get_activity_name(name)
+
+        if len(inputs) <= partition_size:
+            return self.task_all([self.call_activity(name, input_) for input_ in inputs])
+
+        # unique per execution, unlike the instance ID, which `continue_as_new` keeps
+        call_id = self.new_uuid()
+        sub_orchestrations = [
+            self.call_sub_orchestrator(
+                PARTITION_ORCHESTRATOR_NAME,
+                {"name": name, "inputs": partition, "partitionSize": partition_size},
+                f"{call_id}:{partition_index}")
+            for partition_index, partition in enumerate(
+                split_into_partitions(inputs, partition_size))]
+        return PartitionedWhenAllTask(sub_orchestrations, self._replay_schema)
+
     def get_input(self) -> Optional[Any]:
         """Get the orchestration input."""
-        return None if self._input is None else json.loads(self._input,
-                                                           object_hook=_deserialize_custom_object)
+        if self._input is None:
+            return None
+        return payload_formats.decode_value(payload_compression.decompress(
+            json_codec.loads_custom_objects(self._input), deserialize_custom_object))
 
     def new_uuid(self) -> str:
         """Create a new UUID that is safe for replay within an orchestration or operation.
@@ -365,6 +468,68 @@ class DurableOrchestrationContext:
         """
         return WhenAllTask(activities, replay_schema=self._replay_schema)
 
+    def task_all_bounded(self, factory: Callable[[Any], TaskBase], items: Iterable[Any],
+                         max_concurrency: int) -> TaskBase:
+        """Schedule a Task for every item, with at most `max_concurrency` of them running.
+
+        Similar to `task_all`, but the Tasks are created by calling `factory` with each
+        item, and only once earlier Tasks have completed. When called with `yield` or
+        `return`, returns an array containing the results of all Tasks, in the order of
+        `items`. It returns when all of the Tasks have completed.
+
+        Throws an exception if any of the Tasks fails, after which no further Tasks
+        are scheduled.
+
+        Parameters
+        ----------
+        factory: Callable[[Any], Task]
+            Creates the Task of an item, e.g. `lambda item: context.call_activity("F", item)`
+        items: Iterable[Any]
+            The items to create Tasks for
+        max_concurrency: int
+            The maximum number of Tasks that are running at a time
+
+        Returns
+        -------
+        TaskSet
+            The results of all Tasks.
+
+        Raises
+        ------
+        ValueError
+            When `max_concurrency` is not positive
+        """
+        return BoundedWhenAllTask(factory, items, max_concurrency, self)
+
+    def task_reduce(self, activities: List[TaskBase], reducer: Callable[[Any, Any], Any],
+                    initial: Any) -> TaskBase:
+        """Schedule the execution of all activities, folding their results as they complete.
+
+        Similar to `task_all`, but instead of an array of all results, returns the
+        value obtained by combining `initial` with the result of each activity, in order
+        of completion, via `reducer`. Only the accumulated value is kept in memory, not
+        the results nor the [[Task]]s that completed. It returns when all of the
+        [[Task]] instances have completed.
+
+        Throws an exception if any of the activities fails
+
+        Parameters
+        ----------
+        activities: List[Task]
+            List of activities to schedule
+        reducer: Callable[[Any, Any], Any]
+            Combines the accumulated value and the result of an activity into a new
+            accumulated value, e.g. `lambda total, result: total + result`
+        initial: Any
+            The accumulated value before any activity completes
+
+        Returns
+        -------
+        Task
+            The accumulated value, after all activities completed.
+        """
+        return ReduceTask(activities, reducer, initial, replay_schema=self._replay_schema)
+
     def task_any(self, activities: List[TaskBase]) -> TaskBase:
         """Schedule the execution of all activities.
 
@@ -385,6 +550,30 @@ class DurableOrchestrationContext:
         """
         return WhenAnyTask(activities, replay_schema=self._replay_schema)
 
+    def task_as_completed(self, activities: List[TaskBase]) -> Iterator[TaskBase]:
+        """Schedule the execution of all activities, to process them as they complete.
+
+        Returns an iterator of one [[Task]] per activity. When called with `yield`, each
+        returns the next [[Task]] instance to complete, in order of completion, e.g.:
+
+            for next_completed in context.task_as_completed(tasks):
+                completed_task = yield next_completed
+                process(completed_task.result)
+
+        Parameters
+        ----------
+        activities: List[Task]
+            List of activities to schedule
+
+        Returns
+        -------
+        Iterator[Task]
+            The Tasks that complete with the activities, in order of completion.
+        """
+        as_completed = AsCompletedTask(activities, replay_schema=self._replay_schema)
+        for _ in range(len(activities)):
+            yield as_completed.next_completion()
+
     def set_custom_status(self, status: Any):
         """Set the customized orchestration status for your orchestrator function.
 
@@ -656,28 +845,44 @@ class DurableOrchestrationContext:
                     if isinstance(val, datetime.date):
                         val = val.replace(tzinfo=timezone.utc).timetuple()
                     json_dict[key] = val
-            return json.dumps(json_dict)
+            return json_codec.dumps(json_dict)
         return str(list(map(history_to_string, self._histories)))
 
     def _add_to_open_tasks(self, task: TaskBase):
+        # atomic tasks are visited in depth-first order, which determines their sequence numbers
+        tasks_to_add = [task]
+        while tasks_to_add:
+            task = tasks_to_add.pop()
+            if task._is_scheduled:
+                continue
+
+            if isinstance(task, AtomicTask):
+                if task.id is None:
+                    task.id = self._sequence_number
+                    self._sequence_number += 1
+                    self.open_tasks[task.id] = task
+                elif task.id != -1:
+                    self.open_tasks[task.id].append(task)
+
+                task_update_action = self.deferred_tasks.pop(task.id, None)
+                if task_update_action is not None:
+                    task_update_action()
+            else:
+                tasks_to_add.extend(reversed(task.children))
 
-        if task._is_scheduled:
-            return
+    def _get_activity_name(self, name: Union[str, Callable]) -> str:
+        """Get the name of an activity function, passed by name or as the function itself."""
+        if isinstance(name, Callable) and not isinstance(name, FunctionBuilder):
+            error_message = "The `call_activity` API received a `Callable` without an "\
+                "associated Azure Functions trigger-type. "\
+                "Please ensure you're using the Python programming model V2 "\
+                "and that your activity function is annotated with the `activity_trigger`"\
+                "decorator. Otherwise, provide in the name of the activity as a string."
+            raise ValueError(error_message)
 
-        if isinstance(task, AtomicTask):
-            if task.id is None:
-                task.id = self._sequence_number
-                self._sequence_number += 1
-                self.open_tasks[task.id] = task
-            elif task.id != -1:
-                self.open_tasks[task.id].append(task)
-
-            if task.id in self.deferred_tasks:
-                task_update_action = self.deferred_tasks[task.id]
-                task_update_action()
-        else:
-            for child in task.children:
-                self._add_to_open_tasks(child)
+        if isinstance(name, FunctionBuilder):
+            return self._get_function_name(name, ActivityTrigger)
+        return name
 
     def _get_function_name(self, name: FunctionBuilder,
                            trigger_type: Union[OrchestrationTrigger, ActivityTrigger]):
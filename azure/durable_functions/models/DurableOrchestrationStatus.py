@@ -1,8 +1,12 @@
 from datetime import datetime
-from dateutil.parser import parse as dt_parse
 from typing import Any, List, Dict, Optional, Union
 from .OrchestrationRuntimeStatus import OrchestrationRuntimeStatus
 from .utils.json_utils import add_attrib, add_datetime_attrib
+from .utils.datetime_utils import parse_timestamp
+from .utils import payload_compression, payload_formats, payload_store
+
+# stands in for the loaded output and custom status, until they are first accessed
+_NOT_LOADED = object()
 
 
 class DurableOrchestrationStatus:
@@ -22,15 +26,17 @@ class DurableOrchestrationStatus:
         self._name: Optional[str] = name
         self._instance_id: Optional[str] = instanceId
         self._created_time: Optional[datetime] = \
-            dt_parse(createdTime) if createdTime is not None else None
-        self._last_updated_time: Optional[datetime] = dt_parse(lastUpdatedTime) \
+            parse_timestamp(createdTime) if createdTime is not None else None
+        self._last_updated_time: Optional[datetime] = parse_timestamp(lastUpdatedTime) \
             if lastUpdatedTime is not None else None
         self._input: Any = input
         self._output: Any = output
+        self._loaded_output: Any = _NOT_LOADED
         self._runtime_status: Optional[OrchestrationRuntimeStatus] = runtimeStatus
         if runtimeStatus is not None:
             self._runtime_status = OrchestrationRuntimeStatus(runtimeStatus)
         self._custom_status: Any = customStatus
+        self._loaded_custom_status: Any = _NOT_LOADED
         self._history: Optional[List[Any]] = history
         if kwargs is not None:
             for key, value in kwargs.items():
@@ -129,8 +135,15 @@ class DurableOrchestrationStatus:
 
     @property
     def output(self) -> Any:
-        """Get the output of the orchestration instance."""
-        return self._output
+        """Get the output of the orchestration instance.
+
+        An output offloaded to the payload store is loaded, a compressed output
+        decompressed, and a binary-encoded output decoded, on first access.
+        """
+        if self._loaded_output is _NOT_LOADED:
+            self._loaded_output = payload_formats.decode_value(
+                payload_compression.decompress(payload_store.resolve(self._output)))
+        return self._loaded_output
 
     @property
     def runtime_status(self) -> Optional[OrchestrationRuntimeStatus]:
@@ -142,8 +155,11 @@ class DurableOrchestrationStatus:
         """Get the custom status payload (if any).
 
         Set by [[DurableOrchestrationContext]].[[set_custom_status]].
+        A compressed status is decompressed on first access.
         """
-        return self._custom_status
+        if self._loaded_custom_status is _NOT_LOADED:
+            self._loaded_custom_status = payload_compression.decompress(self._custom_status)
+        return self._loaded_custom_status
 
     @property
     def history(self) -> Optional[List[Any]]:
@@ -0,0 +1,94 @@
+from typing import Any, Dict, Tuple
+
+from .utils import payload_formats
+from .utils.json_codec import dumps
+from .utils.type_codecs import serialize_custom_object
+
+
+class EncodedInput:
+    """A JSON-encoded function input.
+
+    Passing an `EncodedInput` instead of a value skips encoding the value for every
+    function it is passed to, e.g. when fanning out to many activities with the same
+    large input.
+    """
+
+    __slots__ = ('json_string',)
+
+    def __init__(self, json_string: str):
+        """Wrap an already JSON-encoded input.
+
+        Parameters
+        ----------
+        json_string: str
+            The JSON-formatted input, as the function expects to decode it
+        """
+        self.json_string: str = json_string
+
+    @classmethod
+    def encode(cls, value: Any) -> 'EncodedInput':
+        """Encode a JSON-serializable input.
+
+        Parameters
+        ----------
+        value: Any
+            The JSON-serializable input
+
+        Returns
+        -------
+        EncodedInput
+            The encoded input
+        """
+        return cls(dumps(payload_formats.encode_value(value), default=serialize_custom_object))
+
+
+def encode_input(input_: Any) -> str:
+    """Encode a function input, unless it is already encoded.
+
+    Parameters
+    ----------
+    input_: Any
+        The JSON-serializable input, or an `EncodedInput`
+
+    Returns
+    -------
+    str
+        The JSON-formatted input
+    """
+    if isinstance(input_, EncodedInput):
+        return input_.json_string
+    return dumps(payload_formats.encode_value(input_), default=serialize_custom_object)
+
+
+class EncodedInputCache:
+    """Encodes the inputs of an orchestrator invocation, encoding each object only once.
+
+    Objects are identified by identity rather than equality, which is cheap regardless
+    of their size, so an object must not be modified after it was passed as an input.
+    The cache keeps its inputs alive, so that their identities are not reused.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[Any, EncodedInput]] = {}
+
+    def encode(self, input_: Any) -> Any:
+        """Encode an input, or get its encoding if it was encoded before.
+
+        Parameters
+        ----------
+        input_: Any
+            The JSON-serializable input
+
+        Returns
+        -------
+        Any
+            The `EncodedInput` of the input, or the input itself if encoding it again
+            costs no more than looking it up
+        """
+        if input_ is None or isinstance(input_, (EncodedInput, bool, int, float)):
+            return input_
+        entry = self._entries.get(id(input_))
+        if entry is None:
+            entry = (input_, EncodedInput.encode(input_))
+            self._entries[id(input_)] = entry
+        return entry[1]
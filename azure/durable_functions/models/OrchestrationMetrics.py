@@ -0,0 +1,98 @@
+from typing import List, Optional, Union
+
+from .actions.Action import Action
+from .actions.CompoundAction import CompoundAction
+from .history import HistoryEvent
+
+
+class OrchestrationMetrics:
+    """Phase durations and counters of a single orchestrator invocation.
+
+    Collected when a metrics callback is registered via `Orchestrator.create`,
+    and handed to that callback once the invocation completes, or fails.
+    Durations are in seconds, sizes are the lengths of the JSON payloads.
+
+    Attributes
+    ----------
+    instance_id : Optional[str]
+        The ID of the orchestration instance
+    decode_duration : float
+        Time spent decoding the orchestration context from its JSON payload
+    replay_duration : float
+        Time spent replaying history events, excluding user code
+    user_code_duration : float
+        Time spent executing the user's orchestrator function
+    serialize_duration : float
+        Time spent serializing the orchestrator state
+    events_processed : int
+        Number of history events processed in this invocation
+    events_replayed : int
+        Number of processed history events that were already played in previous invocations
+    events_new : int
+        Number of processed history events that are new to this invocation
+    actions_emitted : int
+        Number of actions in the orchestrator state, counting those of compound actions
+    input_size : int
+        Length of the JSON payload of the orchestration context
+    output_size : int
+        Length of the JSON payload of the orchestrator state
+    """
+
+    def __init__(self, instance_id: Optional[str] = None):
+        """Create an empty set of metrics.
+
+        Parameters
+        ----------
+        instance_id : Optional[str]
+            The ID of the orchestration instance
+        """
+        self.instance_id: Optional[str] = instance_id
+        self.decode_duration: float = 0.0
+        self.replay_duration: float = 0.0
+        self.user_code_duration: float = 0.0
+        self.serialize_duration: float = 0.0
+        self.events_processed: int = 0
+        self.events_replayed: int = 0
+        self.events_new: int = 0
+        self.actions_emitted: int = 0
+        self.input_size: int = 0
+        self.output_size: int = 0
+
+    @property
+    def total_duration(self) -> float:
+        """Get the time spent in all phases of the invocation."""
+        return (self.decode_duration + self.replay_duration
+                + self.user_code_duration + self.serialize_duration)
+
+    def record_events(self, events: List[HistoryEvent]):
+        """Count processed history events.
+
+        Parameters
+        ----------
+        events : List[HistoryEvent]
+            The processed history events
+        """
+        num_replayed = sum(1 for event in events if event.is_played)
+        self.events_processed += len(events)
+        self.events_replayed += num_replayed
+        self.events_new += len(events) - num_replayed
+
+    def record_actions(self, actions: Union[List[List[Action]], List[Action]]):
+        """Count the actions of an orchestrator state.
+
+        Parameters
+        ----------
+        actions : Union[List[List[Action]], List[Action]]
+            The actions, grouped by orchestrator episode in the V1 replay schema
+        """
+        num_actions = 0
+        actions_to_count: list = list(actions)
+        while actions_to_count:
+            action = actions_to_count.pop()
+            if isinstance(action, list):
+                actions_to_count.extend(action)
+            elif isinstance(action, CompoundAction):
+                actions_to_count.extend(action.compound_tasks)
+            else:
+                num_actions += 1
+        self.actions_emitted = num_actions
@@ -1,11 +1,11 @@
-import json
+from .utils import json_codec, payload_compression, payload_formats, payload_store
 from typing import List, Any, Dict, Optional, Union
 
 from azure.durable_functions.models.ReplaySchema import ReplaySchema
 
 from .utils.json_utils import add_attrib
 from azure.durable_functions.models.actions.Action import Action
-from azure.functions._durable_functions import _serialize_custom_object
+from .utils.type_codecs import serialize_custom_object
 
 
 class OrchestratorState:
@@ -84,34 +84,50 @@ class OrchestratorState:
         Dict[str, Any]
             The instance of the class converted into a json dictionary
         """
+        return self._to_json([[action_obj.to_json() for action_obj in action_list]
+                              for action_list in self._actions])
+
+    def _to_json(self, actions: Any) -> Dict[str, Any]:
         json_dict: Dict[str, Any] = {}
         add_attrib(json_dict, self, '_is_done', 'isDone')
         if self._replay_schema != ReplaySchema.V1:
             add_attrib(json_dict, self, 'schema_version', 'schemaVersion')
-        self._add_actions(json_dict)
+        json_dict['actions'] = actions
         if not (self._output is None):
-            json_dict['output'] = self._output
+            json_dict['output'] = payload_store.offload_value(payload_compression.compress_value(
+                payload_formats.encode_value(self._output)))
         if self._error:
             json_dict['error'] = self._error
         if self._custom_status:
-            json_dict['customStatus'] = self._custom_status
+            json_dict['customStatus'] = payload_compression.compress_value(self._custom_status)
         return json_dict
 
-    def _add_actions(self, json_dict):
-        json_dict['actions'] = []
-        for action_list in self._actions:
-            action_result_list = []
-            for action_obj in action_list:
-                action_result_list.append(action_obj.to_json())
-            json_dict['actions'].append(action_result_list)
-
     def to_json_string(self) -> str:
         """Convert object into a json string.
 
+        Actions are usually serialized once. However, the actions of orchestrations
+        resumed from a replay cache are part of the payload of every invocation, so
+        the payload is then assembled from the json strings that the actions cache,
+        and only new actions are encoded.
+
         Returns
         -------
         str
             The instance of the object in json string format
         """
-        json_dict = self.to_json()
-        return json.dumps(json_dict, default=_serialize_custom_object)
+        # every serialization includes the first action, so if it was never
+        # serialized, neither were the others
+        first_action = next((action_obj for action_list in self._actions
+                             for action_obj in action_list), None)
+        if first_action is None or not first_action._was_serialized():
+            if first_action is not None:
+                first_action._mark_as_serialized()
+            return json_codec.dumps(self.to_json(), default=serialize_custom_object)
+
+        actions = json_codec.join_array(
+            json_codec.join_array([action_obj.to_json_string() for action_obj in action_list])
+            for action_list in self._actions)
+        return json_codec.join_object(
+            (key, actions if key == 'actions'
+             else json_codec.dumps(value, default=serialize_custom_object))
+            for key, value in self._to_json(None).items())
@@ -0,0 +1,59 @@
+from typing import Any, List, Tuple
+
+from .history import HistoryEvent
+from .utils.instance_cache import InstanceCache
+
+
+def _event_signature(event: HistoryEvent) -> Tuple[Any, Any, Any]:
+    """Obtain a cheap identity for a history event, used to detect diverging histories."""
+    return (event.event_type, event.event_id, event.timestamp)
+
+
+class ReplayCacheEntry:
+    """The in-memory state of a suspended orchestration instance."""
+
+    def __init__(self, executor, history: List[HistoryEvent]):
+        """Capture the state of an executor after it processed `history`.
+
+        Parameters
+        ----------
+        executor : TaskOrchestrationExecutor
+            The executor holding the suspended user generator and its open tasks
+        history : List[HistoryEvent]
+            The history that the executor has processed so far
+        """
+        self.executor = executor
+        self.num_events: int = len(history)
+        self.last_event_signature = _event_signature(history[-1])
+
+    def is_prefix_of(self, history: List[HistoryEvent]) -> bool:
+        """Determine if the processed history is a prefix of a newly received one.
+
+        Parameters
+        ----------
+        history : List[HistoryEvent]
+            The history of the new invocation
+
+        Returns
+        -------
+        bool
+            True if the new history extends the processed history. False otherwise.
+        """
+        num_events = self.num_events
+        if len(history) < num_events:
+            return False
+        return _event_signature(history[num_events - 1]) == self.last_event_signature
+
+
+class ReplayCache(InstanceCache):
+    """A bounded, in-process LRU cache of suspended orchestration instances.
+
+    When an orchestration instance is invoked again on the same worker, and its new history
+    is an extension of the one processed in the previous invocation, the cached executor is
+    resumed with only the newly appended events instead of replaying the entire history.
+    If the histories diverge, the instance is replayed from scratch.
+
+    The cache is opt-in, see `Orchestrator.create`.
+    """
+
+    pass
@@ -8,7 +8,9 @@ from azure.durable_functions.models.actions.WhenAllAction import WhenAllAction
 from azure.durable_functions.models.actions.CreateTimerAction import CreateTimerAction
 
 import enum
-from typing import Any, List, Optional, Set, Type, Union
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, List, Optional, Set, Type, Union
 
 
 class TaskState(enum.Enum):
@@ -26,6 +28,9 @@ class TaskBase:
     instantiated on its own.
     """
 
+    __slots__ = ('id', 'state', 'parent', '_api_name', '_result', '_get_result', 'action_repr',
+                 'is_played', '_is_scheduled_flag', '_has_new_value', '__weakref__')
+
     def __init__(self, id_: Union[int, str], actions: Union[List[Action], Action]):
         """Initialize the TaskBase.
 
@@ -53,10 +58,12 @@ class TaskBase:
 
         self._api_name = api_action.__class__.__name__
 
-        self.result: Any = None
+        self._result: Any = None
+        self._get_result: Optional[Callable[[], Any]] = None
         self.action_repr: Union[List[Action], Action] = actions
         self.is_played = False
         self._is_scheduled_flag = False
+        self._has_new_value = False
 
     @property
     def _is_scheduled(self) -> bool:
@@ -65,6 +72,35 @@ class TaskBase:
     def _set_is_scheduled(self, is_scheduled: bool):
         self._is_scheduled_flag = is_scheduled
 
+    def _mark_as_scheduled(self):
+        tasks_to_mark: List[TaskBase] = [self]
+        while tasks_to_mark:
+            task = tasks_to_mark.pop()
+            if task._is_scheduled:
+                # e.g. a compound task yielded before, as part of another compound task
+                continue
+            if isinstance(task, CompoundTask):
+                tasks_to_mark.extend(task.children)
+            else:
+                task._set_is_scheduled(True)
+
+    @property
+    def result(self) -> Any:
+        """Get the value of this Task: either an exception or a result.
+
+        Results set via `set_lazy_value` are computed on first access.
+        """
+        get_result = self._get_result
+        if get_result is not None:
+            self._get_result = None
+            self._result = get_result()
+        return self._result
+
+    @result.setter
+    def result(self, value: Any):
+        self._get_result = None
+        self._result = value
+
     @property
     def is_completed(self) -> bool:
         """Get indicator of whether the task completed.
@@ -117,6 +153,22 @@ class TaskBase:
         Exception
             When the Task failed but its value was not an Exception
         """
+        self._set_value(is_error, value)
+        self.propagate()
+
+    def set_lazy_value(self, get_value: Callable[[], Any]):
+        """Set the value of this Task to a successful result that is computed on first access.
+
+        Parameters
+        ----------
+        get_value : Callable[[], Any]
+            A 0-argument function producing the value of this Task
+        """
+        self._set_lazy_value(get_value)
+        self.propagate()
+
+    def _set_value(self, is_error: bool, value: Any):
+        """Set the value of this Task without notifying its parent Task."""
         new_state = self.state
         if is_error:
             if not isinstance(value, Exception):
@@ -128,14 +180,35 @@ class TaskBase:
             new_state = TaskState.SUCCEEDED
         self.change_state(new_state)
         self.result = value
-        self.propagate()
+        self._has_new_value = True
+
+    def _set_lazy_value(self, get_value: Callable[[], Any]):
+        """Set the lazily computed value of this Task without notifying its parent Task."""
+        self.change_state(TaskState.SUCCEEDED)
+        self._result = None
+        self._get_result = get_value
+        self._has_new_value = True
 
     def propagate(self):
-        """Notify parent Task of this Task's state change."""
-        has_completed = not (self.state is TaskState.RUNNING)
-        has_parent = not (self.parent is None)
-        if has_completed and has_parent:
-            self.parent.handle_completion(self)
+        """Notify the ancestors of this Task of its state change.
+
+        The Task hierarchy is walked iteratively: a parent Task that obtains a value
+        when handling the completion of its child, in turn notifies its own parent.
+        """
+        task: TaskBase = self
+        while True:
+            # the new value is consumed here, so that a parent which propagated
+            # its own value from within `handle_completion` is not notified twice
+            task._has_new_value = False
+            parent = task.parent
+            if parent is None or task.state is TaskState.RUNNING:
+                break
+            parent.handle_completion(task)
+            # a Task only completes once, so its parent needs no further notifications
+            task.parent = None
+            if not parent._has_new_value:
+                break
+            task = parent
 
 
 class CompoundTask(TaskBase):
@@ -145,6 +218,13 @@ class CompoundTask(TaskBase):
     Should never be instantiated on its own.
     """
 
+    __slots__ = ('_first_error', 'pending_tasks', 'completed_tasks', 'children',
+                 '_num_scheduled_children')
+
+    # whether completed children are kept, in `completed_tasks` and `children`, once they
+    # are no longer needed. Sub-classes that fold or stream many children do not keep them.
+    _retains_completed_children = True
+
     def __init__(self, tasks: List[TaskBase], compound_action_constructor=None):
         """Instantiate CompoundTask attributes.
 
@@ -176,6 +256,8 @@ class CompoundTask(TaskBase):
         self.pending_tasks: Set[TaskBase] = set(tasks)
         self.completed_tasks: List[TaskBase] = []
         self.children = tasks
+        # the length of the prefix of `children` known to be scheduled
+        self._num_scheduled_children = 0
 
         if len(self.children) == 0:
             self.state = TaskState.SUCCEEDED
@@ -184,10 +266,33 @@ class CompoundTask(TaskBase):
         for child in self.children:
             if not (child.state is TaskState.RUNNING):
                 self.handle_completion(child)
+        # a value obtained from these sub-tasks is not propagated, as this Task has no parent
+        # yet: a parent handles it when created, and must not be notified of it again later
+        self._has_new_value = False
 
     @property
     def _is_scheduled(self) -> bool:
-        return all([child._is_scheduled for child in self.children])
+        # Tasks never become unscheduled, so every child is only found to be scheduled once,
+        # making this constant-time when amortized over the scheduling of all children
+        children = self.children
+        num_scheduled_children = self._num_scheduled_children
+        num_children = len(children)
+        while (num_scheduled_children < num_children
+               and children[num_scheduled_children]._is_scheduled):
+            num_scheduled_children += 1
+        self._num_scheduled_children = num_scheduled_children
+        return num_scheduled_children == num_children
+
+    def _release_children(self):
+        """Drop the references to the children, once they are no longer needed.
+
+        Only used by Tasks that do not retain their completed children. Children are
+        needed until they are all scheduled, to be scheduled themselves, and completed
+        children are only needed to compute the value of this Task.
+        """
+        if self._is_scheduled:
+            self.children = []
+            self._num_scheduled_children = 0
 
     def handle_completion(self, child: TaskBase):
         """Manage sub-task completion events.
@@ -210,14 +315,16 @@ class CompoundTask(TaskBase):
                 f"Parent Task {self.id} does not have pending sub-task with ID {child.id}."
                 f"This most likely means that Task {child.id} completed twice.")
 
-        self.completed_tasks.append(child)
+        if self._retains_completed_children:
+            self.completed_tasks.append(child)
         self.set_is_played(child.is_played)
         self.try_set_value(child)
 
     def try_set_value(self, child: TaskBase):
         """Transition a CompoundTask to a terminal state and set its value.
 
-        Should be implemented by sub-classes.
+        Should be implemented by sub-classes, via `_set_value` or `_set_lazy_value`.
+        Notifying the parent Task is handled by `propagate`.
 
         Parameters
         ----------
@@ -235,6 +342,8 @@ class CompoundTask(TaskBase):
 class AtomicTask(TaskBase):
     """A Task with no subtasks."""
 
+    __slots__ = ()
+
     def _get_action(self) -> Action:
         action: Action
         if isinstance(self.action_repr, list):
@@ -247,6 +356,8 @@ class AtomicTask(TaskBase):
 class TimerTask(AtomicTask):
     """A Timer Task."""
 
+    __slots__ = ()
+
     def __init__(self, id_: Union[int, str], action: CreateTimerAction):
         super().__init__(id_, action)
         self.action_repr: Union[List[CreateTimerAction], CreateTimerAction]
@@ -281,6 +392,8 @@ class TimerTask(AtomicTask):
 class WhenAllTask(CompoundTask):
     """A Task representing `when_all` scenarios."""
 
+    __slots__ = ()
+
     def __init__(self, task: List[TaskBase], replay_schema: ReplaySchema):
         """Initialize a WhenAllTask.
 
@@ -308,18 +421,98 @@ class WhenAllTask(CompoundTask):
             # A WhenAll Task only completes when it has no pending tasks
             # i.e _when all_ of its children have completed
             if len(self.pending_tasks) == 0:
-                results = list(map(lambda x: x.result, self.children))
-                self.set_value(is_error=False, value=results)
+                self._set_lazy_value(self._get_children_results)
         else:  # child.state is TaskState.FAILED:
             # a single error is sufficient to fail this task
             if self._first_error is None:
                 self._first_error = child.result
-                self.set_value(is_error=True, value=self._first_error)
+                self._set_value(is_error=True, value=self._first_error)
+
+    def _get_children_results(self) -> List[Any]:
+        return [child.result for child in self.children]
+
+
+class BoundedWhenAllTask(WhenAllTask):
+    """A Task representing `task_all_bounded` scenarios.
+
+    It inherits from WhenAllTask because it completes with the results of all of its
+    children. However, children are only created from the remaining items as earlier
+    children succeed, so that at most `max_concurrency` of them are running at a time.
+    """
+
+    __slots__ = ('context', '_factory', '_items')
+
+    def __init__(self, factory: Callable[[Any], TaskBase], items: Iterable[Any],
+                 max_concurrency: int, context):
+        """Initialize a BoundedWhenAllTask.
+
+        Parameters
+        ----------
+        factory : Callable[[Any], TaskBase]
+            Creates the child Task of an item
+        items : Iterable[Any]
+            The items, in the order of the results of this Task
+        max_concurrency : int
+            The maximum number of running children
+        context : DurableOrchestrationContext
+            The orchestration context, to schedule children with
+
+        Raises
+        ------
+        ValueError
+            When `max_concurrency` is not positive
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, but was {max_concurrency}.")
+        self.context = context
+        self._factory = factory
+        self._items = iter(items)
+        tasks = [factory(item) for item in islice(self._items, max_concurrency)]
+        super().__init__(tasks, context._replay_schema)
+
+    def try_set_value(self, child: TaskBase):
+        """Replace a succeeded child with the next one, or transition to a terminal state.
+
+        Parameters
+        ----------
+        child : TaskBase
+            A sub-task that just completed
+        """
+        if child.state is TaskState.SUCCEEDED and self.state is TaskState.RUNNING:
+            self._schedule_next_child()
+        super().try_set_value(child)
+
+    def _schedule_next_child(self):
+        for item in islice(self._items, 1):
+            child = self._factory(item)
+            child.parent = self
+            self.children.append(child)
+            self.pending_tasks.add(child)
+            # this happens while replaying the completion of another child, which
+            # deterministically orders the child's actions after those of its siblings
+            self.context._add_to_open_tasks(child)
+            self.context._add_to_actions(child.action_repr)
+            child._mark_as_scheduled()
+
+
+class PartitionedWhenAllTask(WhenAllTask):
+    """A Task representing `call_activity_partitioned` scenarios.
+
+    Its children are the sub-orchestrations of the partitions, each resulting in
+    a list, and its value is the concatenation of those lists.
+    """
+
+    __slots__ = ()
+
+    def _get_children_results(self) -> List[Any]:
+        return [result for results in super()._get_children_results() for result in results]
 
 
 class WhenAnyTask(CompoundTask):
     """A Task representing `when_any` scenarios."""
 
+    __slots__ = ()
+
     def __init__(self, task: List[TaskBase], replay_schema: ReplaySchema):
         """Initialize a WhenAnyTask.
 
@@ -344,7 +537,151 @@ class WhenAnyTask(CompoundTask):
             A sub-task that just completed
         """
         if self.state is TaskState.RUNNING:
-            self.set_value(is_error=False, value=child)
+            self._set_value(is_error=False, value=child)
+
+
+class ReduceTask(CompoundTask):
+    """A Task representing `task_reduce` scenarios.
+
+    Folds the result of every child into an accumulated value, in order of completion,
+    and completes with that value once all children have completed. Fails with the
+    first failing child, or with the first exception raised by the reducer. Completed
+    children are not retained, so that only the accumulated value is kept alive:
+    `children` and `completed_tasks` stay empty once all children are scheduled.
+    """
+
+    __slots__ = ('_reducer', '_accumulated_value')
+
+    _retains_completed_children = False
+
+    def __init__(self, tasks: List[TaskBase], reducer: Callable[[Any, Any], Any],
+                 initial: Any, replay_schema: ReplaySchema):
+        """Initialize a ReduceTask.
+
+        Parameters
+        ----------
+        tasks : List[Task]
+            The list of child tasks
+        reducer : Callable[[Any, Any], Any]
+            Combines the accumulated value with the result of a child into a new one
+        initial : Any
+            The initial accumulated value
+        replay_schema : ReplaySchema
+            The ReplaySchema, which determines the inner action payload representation
+        """
+        self._reducer = reducer
+        self._accumulated_value = initial
+        compound_action_constructor = None
+        if replay_schema is ReplaySchema.V2:
+            compound_action_constructor = WhenAllAction
+        super().__init__(tasks, compound_action_constructor)
+        if len(tasks) == 0:
+            self.result = initial
+
+    def try_set_value(self, child: TaskBase):
+        """Fold the result of a child, and transition to a terminal state after the last one.
+
+        Parameters
+        ----------
+        child : TaskBase
+            A sub-task that just completed
+        """
+        # completed children are only needed for their result
+        self._release_children()
+
+        if self.state is not TaskState.RUNNING:
+            return
+        if child.state is TaskState.FAILED:
+            self._set_value(is_error=True, value=child.result)
+            return
+        try:
+            self._accumulated_value = self._reducer(self._accumulated_value, child.result)
+        except Exception as e:
+            # fail the task, rather than the replay, so that user code can handle the error
+            self._accumulated_value = None
+            self._set_value(is_error=True, value=e)
+            return
+        if len(self.pending_tasks) == 0:
+            self._set_value(is_error=False, value=self._accumulated_value)
+            self._accumulated_value = None
+
+
+class AsCompletedTask(WhenAnyTask):
+    """A Task representing `task_as_completed` scenarios.
+
+    It inherits from WhenAnyTask because it completes with its first child to complete.
+    In addition, it hands out a Task for each of its children, via `next_completion`,
+    which completes with the next child to complete, in order of completion. Completed
+    children are not retained once handed out, so `children` and `completed_tasks` stay
+    empty once all children are scheduled.
+    """
+
+    __slots__ = ('_has_handed_out_self', '_completed_children', '_waiting_tasks')
+
+    _retains_completed_children = False
+
+    def __init__(self, task: List[TaskBase], replay_schema: ReplaySchema):
+        """Initialize an AsCompletedTask.
+
+        Parameters
+        ----------
+        task : List[Task]
+            The list of child tasks
+        replay_schema : ReplaySchema
+            The ReplaySchema, which determines the inner action payload representation
+        """
+        self._has_handed_out_self = False
+        # completed children that are not handed out yet, beyond the value of this Task,
+        # and handed out Tasks that wait for children to complete
+        self._completed_children: Deque[TaskBase] = deque()
+        self._waiting_tasks: Deque[TaskBase] = deque()
+        super().__init__(task, replay_schema)
+
+    def next_completion(self) -> TaskBase:
+        """Obtain a Task that completes with the next child to complete.
+
+        The first such Task is this Task itself, so that yielding it schedules the
+        children. The others complete as soon as their child does, without
+        scheduling anything.
+
+        Returns
+        -------
+        TaskBase
+            A Task whose value is the next child to complete
+        """
+        if not self._has_handed_out_self:
+            self._has_handed_out_self = True
+            return self
+
+        task = AtomicTask(-1, [])
+        task._set_is_scheduled(True)
+        if self._completed_children:
+            self._complete_with(task, self._completed_children.popleft())
+        else:
+            self._waiting_tasks.append(task)
+        return task
+
+    def try_set_value(self, child: TaskBase):
+        """Transition a waiting Task, and this Task on first completion, to a terminal state.
+
+        Parameters
+        ----------
+        child : TaskBase
+            A sub-task that just completed
+        """
+        # completed children are only needed until they are handed out
+        self._release_children()
+        if self.state is TaskState.RUNNING:
+            super().try_set_value(child)
+        elif self._waiting_tasks:
+            self._complete_with(self._waiting_tasks.popleft(), child)
+        else:
+            self._completed_children.append(child)
+
+    @staticmethod
+    def _complete_with(task: TaskBase, child: TaskBase):
+        task.set_is_played(child.is_played)
+        task.set_value(is_error=False, value=child)
 
 
 class RetryAbleTask(WhenAllTask):
@@ -356,6 +693,9 @@ class RetryAbleTask(WhenAllTask):
     to the list of pending tasks.
     """
 
+    __slots__ = ('retry_options', 'num_attempts', 'context', 'actions', 'is_waiting_on_timer',
+                 'error')
+
     def __init__(self, child: TaskBase, retry_options: RetryOptions, context):
         tasks = [child]
         super().__init__(tasks, context._replay_schema)
@@ -399,7 +739,7 @@ class RetryAbleTask(WhenAllTask):
             if self.num_attempts >= self.retry_options.max_number_of_attempts:
                 self.is_waiting_on_timer = True
                 # we have reached the maximum number of attempts, set error
-                self.set_value(is_error=True, value=self.error)
+                self._set_value(is_error=True, value=self.error)
             else:
                 rescheduled_task = self.context._generate_task(
                     action=NoOpAction("rescheduled task"), parent=self)
@@ -413,7 +753,7 @@ class RetryAbleTask(WhenAllTask):
                 # if all pending tasks have completed,
                 # and we have a successful child, then
                 # we can set the Task's event
-                self.set_value(is_error=False, value=child.result)
+                self._set_lazy_value(lambda: child.result)
 
         else:  # child.state is TaskState.FAILED:
             # increase size of pending tasks by adding a timer task
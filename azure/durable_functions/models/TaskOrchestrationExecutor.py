@@ -1,15 +1,97 @@
-from azure.durable_functions.models.Task import TaskBase, TaskState, AtomicTask, CompoundTask
+from azure.durable_functions.models.Task import TaskBase, TaskState, AtomicTask
 from azure.durable_functions.models.OrchestratorState import OrchestratorState
 from azure.durable_functions.models.DurableOrchestrationContext import DurableOrchestrationContext
-from typing import Any, List, Optional, Union
+from azure.durable_functions.models.OrchestrationMetrics import OrchestrationMetrics
+from typing import Any, Callable, Dict, List, Optional, Union
 from azure.durable_functions.models.history.HistoryEventType import HistoryEventType
 from azure.durable_functions.models.history.HistoryEvent import HistoryEvent
 from types import GeneratorType
 import warnings
 from collections import namedtuple
-import json
+from functools import partial
+from operator import attrgetter
+from time import perf_counter
+from .utils import json_codec, payload_compression, payload_formats, payload_store
 from ..models.entities.ResponseMessage import ResponseMessage
-from azure.functions._durable_functions import _deserialize_custom_object
+from .utils.type_codecs import deserialize_custom_object
+
+
+def get_history_event_payload(event: HistoryEvent) -> Optional[str]:
+    """Obtain the JSON-serialized value carried by a Task-resolution event.
+
+    Parameters
+    ----------
+    event : HistoryEvent
+        The history event containing the value for a Task
+
+    Returns
+    -------
+    Optional[str]
+        The JSON-formatted payload of the event, if any
+    """
+    event_type = event.event_type
+    if event_type is None:
+        raise ValueError("EventType is not found in task object")
+
+    if (event_type == HistoryEventType.SUB_ORCHESTRATION_INSTANCE_COMPLETED
+            or event_type == HistoryEventType.TASK_COMPLETED):
+        return event.Result
+    if event_type == HistoryEventType.EVENT_RAISED:
+        # TODO: Investigate why the payload is in "Input" instead of "Result"
+        return event.Input
+    return None
+
+
+def parse_payload(payload: Optional[str]) -> Any:
+    """Deserialize the JSON-formatted payload of a Task-resolution event.
+
+    We provide the ability to deserialize custom objects, because the output of this
+    will be passed directly to the orchestrator as the output of some activity.
+    Payloads offloaded to the payload store are loaded, compressed payloads
+    decompressed, and binary-encoded payloads decoded, here.
+
+    Parameters
+    ----------
+    payload : Optional[str]
+        The JSON-formatted payload
+
+    Returns
+    -------
+    Any
+        The deserialized payload
+    """
+    if payload is None:
+        return None
+    value = payload_store.resolve(
+        json_codec.loads_custom_objects(payload), deserialize_custom_object)
+    return payload_formats.decode_value(
+        payload_compression.decompress(value, deserialize_custom_object))
+
+
+# The way in which an event transitions a Task from its running state to a terminal one:
+#   (1) whether the event type represents a task success
+#   (2) the attribute in the corresponding event object that identifies the Task
+#   (3) a getter of that attribute
+SetTaskValuePayload = namedtuple("SetTaskValuePayload",
+                                 ("is_success", "task_id_key", "get_task_id"))
+
+
+def _set_task_value_payload(is_success: bool, task_id_key: str) -> SetTaskValuePayload:
+    return SetTaskValuePayload(is_success, task_id_key, attrgetter(task_id_key))
+
+
+EVENT_TO_SET_TASK_VALUE_PAYLOAD: Dict[HistoryEventType, SetTaskValuePayload] = {
+    HistoryEventType.TASK_COMPLETED: _set_task_value_payload(True, "TaskScheduledId"),
+    HistoryEventType.TIMER_FIRED: _set_task_value_payload(True, "TimerId"),
+    HistoryEventType.SUB_ORCHESTRATION_INSTANCE_COMPLETED:
+        _set_task_value_payload(True, "TaskScheduledId"),
+    HistoryEventType.EVENT_RAISED: _set_task_value_payload(True, "Name"),
+    HistoryEventType.TASK_FAILED: _set_task_value_payload(False, "TaskScheduledId"),
+    HistoryEventType.SUB_ORCHESTRATION_INSTANCE_FAILED:
+        _set_task_value_payload(False, "TaskScheduledId"),
+}
+
+TASK_COMPLETION_EVENTS = frozenset(EVENT_TO_SET_TASK_VALUE_PAYLOAD)
 
 
 class TaskOrchestrationExecutor:
@@ -17,23 +99,11 @@ class TaskOrchestrationExecutor:
 
     def __init__(self):
         """Initialize TaskOrchestrationExecutor."""
-        # A mapping of event types to a tuple of
-        #   (1) whether the event type represents a task success
-        #   (2) the attribute in the corresponding event object that identifies the Task
-        # this mapping is used for processing events that transition a Task from its running state
-        # to a terminal one
-        SetTaskValuePayload = namedtuple("SetTaskValuePayload", ("is_success", "task_id_key"))
-        self.event_to_SetTaskValuePayload = dict([
-            (HistoryEventType.TASK_COMPLETED, SetTaskValuePayload(True, "TaskScheduledId")),
-            (HistoryEventType.TIMER_FIRED, SetTaskValuePayload(True, "TimerId")),
-            (HistoryEventType.SUB_ORCHESTRATION_INSTANCE_COMPLETED,
-             SetTaskValuePayload(True, "TaskScheduledId")),
-            (HistoryEventType.EVENT_RAISED, SetTaskValuePayload(True, "Name")),
-            (HistoryEventType.TASK_FAILED, SetTaskValuePayload(False, "TaskScheduledId")),
-            (HistoryEventType.SUB_ORCHESTRATION_INSTANCE_FAILED,
-             SetTaskValuePayload(False, "TaskScheduledId"))
-        ])
-        self.task_completion_events = set(self.event_to_SetTaskValuePayload.keys())
+        # kept for backwards compatibility, the replay loop uses the module-level mappings
+        self.event_to_SetTaskValuePayload = EVENT_TO_SET_TASK_VALUE_PAYLOAD
+        self.task_completion_events = TASK_COMPLETION_EVENTS
+        # metrics of the current invocation, only collected when set by the Orchestrator
+        self.metrics: Optional[OrchestrationMetrics] = None
         self.initialize()
 
     def initialize(self):
@@ -66,7 +136,13 @@ class TaskOrchestrationExecutor:
             A JSON-formatted string of the user's orchestration state, payload for the extension.
         """
         self.context = context
-        evaluated_user_code = fn(context)
+        metrics = self.metrics
+        start = 0.0 if metrics is None else perf_counter()
+        try:
+            evaluated_user_code = fn(context)
+        finally:
+            if metrics is not None:
+                metrics.user_code_duration += perf_counter() - start
 
         # The minimum History size is 2, in the shape: [OrchestratorStarted, ExecutionStarted].
         # At the start of replay, the `is_replaying` flag is determined from the
@@ -89,10 +165,7 @@ class TaskOrchestrationExecutor:
         # them with values when the history provides them
         if isinstance(evaluated_user_code, GeneratorType):
             self.generator = evaluated_user_code
-            for event in history:
-                self.process_event(event)
-                if self.has_execution_completed:
-                    break
+            self.process_events(history)
 
         # Due to backwards compatibility reasons, it's possible
         # for the `continue_as_new` API to be called without `yield` statements.
@@ -103,6 +176,56 @@ class TaskOrchestrationExecutor:
             self.output = evaluated_user_code
         return self.get_orchestrator_state_str()
 
+    def resume(self, context: DurableOrchestrationContext, history: List[HistoryEvent],
+               start_index: int) -> str:
+        """Continue a suspended orchestration with the events appended to its history.
+
+        The executor must have previously executed the orchestration up to, but excluding,
+        the event at `start_index`, without completing it.
+
+        Parameters
+        ----------
+        context : DurableOrchestrationContext
+            The context of the new invocation, from which the updated history is adopted.
+        history : List[HistoryEvent]
+            The full orchestration history of the new invocation.
+        start_index : int
+            The index of the first history event that the executor has not processed yet.
+
+        Returns
+        -------
+        str
+            A JSON-formatted string of the user's orchestration state, payload for the extension.
+        """
+        self.context._histories = context.histories
+        self.process_events(history, start_index)
+        return self.get_orchestrator_state_str()
+
+    def process_events(self, history: List[HistoryEvent], start_index: int = 0):
+        """Evaluate history events, in order, until the orchestration completes.
+
+        Parameters
+        ----------
+        history : List[HistoryEvent]
+            The orchestration history
+        start_index : int
+            The index of the first history event to evaluate. Defaults to 0.
+        """
+        end_index = len(history)
+        handlers = _EVENT_HANDLERS
+        for index in range(start_index, end_index):
+            event = history[index]
+            handler = handlers.get(event._event_type)
+            # events without a handler have no side-effects, so cannot complete the execution
+            if handler is not None:
+                handler(self, event)
+                if self.has_execution_completed:
+                    end_index = index + 1
+                    break
+
+        if self.metrics is not None:
+            self.metrics.record_events(history[start_index:end_index])
+
     def process_event(self, event: HistoryEvent):
         """Evaluate a history event.
 
@@ -114,35 +237,36 @@ class TaskOrchestrationExecutor:
         event : HistoryEvent
             The history event to process
         """
-        event_type = event.event_type
-        if event_type == HistoryEventType.ORCHESTRATOR_STARTED:
-            # update orchestration's deterministic timestamp
-            timestamp = event.timestamp
-            if timestamp > self.context.current_utc_datetime:
-                self.context.current_utc_datetime = event.timestamp
-        elif event.event_type == HistoryEventType.CONTINUE_AS_NEW:
-            # re-initialize the orchestration state
-            self.initialize()
-        elif event_type == HistoryEventType.EXECUTION_STARTED:
-            # begin replaying user code
-            self.resume_user_code()
-        elif event_type == HistoryEventType.EVENT_SENT:
-            # we want to differentiate between a "proper" event sent, and a signal/call entity
-            key = getattr(event, "event_id")
-            if key in self.context.open_tasks.keys():
-                task = self.context.open_tasks[key]
-                if task._api_name == "CallEntityAction":
-                    # in the signal entity case, the Task is represented
-                    # with a GUID, not with a sequential integer
-                    self.context.open_tasks.pop(key)
-                    event_id = json.loads(event.Input)["id"]
-                    self.context.open_tasks[event_id] = task
-
-        elif self.is_task_completion_event(event.event_type):
-            # transition a task to a success or failure state
-            (is_success, id_key) = self.event_to_SetTaskValuePayload[event_type]
-            self.set_task_value(event, is_success, id_key)
-            self.resume_user_code()
+        handler = _EVENT_HANDLERS.get(event.event_type)
+        if handler is not None:
+            handler(self, event)
+
+    def _process_orchestrator_started(self, event: HistoryEvent):
+        # update orchestration's deterministic timestamp
+        timestamp = event.timestamp
+        if timestamp > self.context.current_utc_datetime:
+            self.context.current_utc_datetime = timestamp
+
+    def _process_continue_as_new(self, event: HistoryEvent):
+        # re-initialize the orchestration state
+        self.initialize()
+
+    def _process_execution_started(self, event: HistoryEvent):
+        # begin replaying user code
+        self.resume_user_code()
+
+    def _process_event_sent(self, event: HistoryEvent):
+        # we want to differentiate between a "proper" event sent, and a signal/call entity
+        key = event.event_id
+        open_tasks = self.context.open_tasks
+        if key in open_tasks:
+            task = open_tasks[key]
+            if task._api_name == "CallEntityAction":
+                # in the signal entity case, the Task is represented
+                # with a GUID, not with a sequential integer
+                open_tasks.pop(key)
+                event_id = json_codec.loads(event.Input)["id"]
+                open_tasks[event_id] = task
 
     def set_task_value(self, event: HistoryEvent, is_success: bool, id_key: str):
         """Set a running task to either a success or failed state, and sets its value.
@@ -156,31 +280,12 @@ class TaskOrchestrationExecutor:
         id_key : str
             The attribute in the event object containing the ID of the Task to target
         """
+        self._set_task_value(event, is_success, attrgetter(id_key))
 
-        def parse_history_event(directive_result):
-            """Based on the type of event, parse the JSON.serializable portion of the event."""
-            event_type = directive_result.event_type
-            if event_type is None:
-                raise ValueError("EventType is not found in task object")
-
-            # We provide the ability to deserialize custom objects, because the output of this
-            # will be passed directly to the orchestrator as the output of some activity
-            if (event_type == HistoryEventType.SUB_ORCHESTRATION_INSTANCE_COMPLETED
-                    and directive_result.Result is not None):
-                return json.loads(directive_result.Result, object_hook=_deserialize_custom_object)
-            if (event_type == HistoryEventType.TASK_COMPLETED
-                    and directive_result.Result is not None):
-                return json.loads(directive_result.Result, object_hook=_deserialize_custom_object)
-            if (event_type == HistoryEventType.EVENT_RAISED
-                    and directive_result.Input is not None):
-                # TODO: Investigate why the payload is in "Input" instead of "Result"
-                response = json.loads(directive_result.Input,
-                                      object_hook=_deserialize_custom_object)
-                return response
-            return None
-
+    def _set_task_value(self, event: HistoryEvent, is_success: bool,
+                        get_task_id: Callable[[HistoryEvent], Any]):
         # get target task
-        key = getattr(event, id_key)
+        key = get_task_id(event)
         try:
             task: Union[TaskBase, List[TaskBase]] = self.context.open_tasks.pop(key)
             if isinstance(task, list):
@@ -191,75 +296,87 @@ class TaskOrchestrationExecutor:
         except KeyError:
             warning = f"Potential duplicate Task completion for TaskId: {key}"
             warnings.warn(warning)
-            self.context.deferred_tasks[key] = lambda: self.set_task_value(
-                event, is_success, id_key)
+            self.context.deferred_tasks[key] = lambda: self._set_task_value(
+                event, is_success, get_task_id)
             return
 
+        task.set_is_played(event._is_played)
         if is_success:
             # retrieve result
-            new_value = parse_history_event(event)
+            payload = get_history_event_payload(event)
             if task._api_name == "CallEntityAction":
-                event_payload = ResponseMessage.from_dict(new_value)
-                new_value = json.loads(event_payload.result)
+                event_payload = ResponseMessage.from_dict(parse_payload(payload))
+                new_value = json_codec.loads(event_payload.result)
 
                 if event_payload.is_exception:
                     new_value = Exception(new_value)
                     is_success = False
+            elif payload is not None:
+                # the result is only deserialized if and when it is accessed
+                task.set_lazy_value(partial(parse_payload, payload))
+                return
+            else:
+                new_value = None
         else:
             # generate exception
             new_value = Exception(f"{event.Reason} \n {event.Details}")
 
         # with a yielded task now evaluated, we can try to resume the user code
-        task.set_is_played(event._is_played)
         task.set_value(is_error=not is_success, value=new_value)
 
     def resume_user_code(self):
         """Attempt to continue executing user code.
 
         We can only continue executing if the active/current task has resolved to a value.
+        User code is advanced, in a loop, until it yields a task that is still running,
+        or until it completes.
         """
-        current_task = self.current_task
-        self.context._set_is_replaying(current_task.is_played)
-        if current_task.state is TaskState.RUNNING:
-            # if the current task hasn't been resolved, we can't
-            # continue executing the user code.
-            return
-
-        new_task = None
-        try:
-            # resume orchestration with a resolved task's value
-            task_value = current_task.result
-            task_succeeded = current_task.state is TaskState.SUCCEEDED
-            new_task = self.generator.send(
-                task_value) if task_succeeded else self.generator.throw(task_value)
-            if isinstance(new_task, TaskBase) and not (new_task._is_scheduled):
-                self.context._add_to_open_tasks(new_task)
-        except StopIteration as stop_exception:
-            # the orchestration returned,
-            # flag it as such and capture its output
-            self.orchestrator_returned = True
-            self.output = stop_exception.value
-        except Exception as exception:
-            # the orchestration threw an exception
-            self.exception = exception
-
-        self.current_task = new_task
-        if not (new_task is None):
-            if not (new_task.state is TaskState.RUNNING):
-                # user yielded the same task multiple times, continue executing code
-                # until a new/not-previously-yielded task is encountered
-                self.resume_user_code()
-            elif not (self.current_task._is_scheduled):
-                # new task is received. it needs to be resolved to a value
-                self.context._add_to_actions(self.current_task.action_repr)
-                self._mark_as_scheduled(self.current_task)
+        while True:
+            current_task = self.current_task
+            self.context._set_is_replaying(current_task.is_played)
+            if current_task.state is TaskState.RUNNING:
+                # if the current task hasn't been resolved, we can't
+                # continue executing the user code.
+                return
+
+            new_task = None
+            try:
+                # resume orchestration with a resolved task's value
+                task_value = current_task.result
+                task_succeeded = current_task.state is TaskState.SUCCEEDED
+                metrics = self.metrics
+                start = 0.0 if metrics is None else perf_counter()
+                try:
+                    new_task = self.generator.send(
+                        task_value) if task_succeeded else self.generator.throw(task_value)
+                finally:
+                    if metrics is not None:
+                        metrics.user_code_duration += perf_counter() - start
+                if isinstance(new_task, TaskBase) and not (new_task._is_scheduled):
+                    self.context._add_to_open_tasks(new_task)
+            except StopIteration as stop_exception:
+                # the orchestration returned,
+                # flag it as such and capture its output
+                self.orchestrator_returned = True
+                self.output = stop_exception.value
+            except Exception as exception:
+                # the orchestration threw an exception
+                self.exception = exception
+
+            self.current_task = new_task
+            if new_task is None:
+                return
+            if new_task.state is TaskState.RUNNING:
+                if not (new_task._is_scheduled):
+                    # new task is received. it needs to be resolved to a value
+                    self.context._add_to_actions(new_task.action_repr)
+                    self._mark_as_scheduled(new_task)
+                return
+            # user yielded the same task multiple times, continue executing code
+            # until a new/not-previously-yielded task is encountered
 
     def _mark_as_scheduled(self, task: TaskBase):
-        if isinstance(task, CompoundTask):
-            for task in task.children:
-                self._mark_as_scheduled(task)
-        else:
-            task._set_is_scheduled(True)
+        task._mark_as_scheduled()
 
     def get_orchestrator_state_str(self) -> str:
         """Obtain a JSON-formatted string representing the orchestration's state.
@@ -276,6 +393,8 @@ class TaskOrchestrationExecutor:
             message contains in it the string representation of the orchestration's
             state
         """
+        metrics = self.metrics
+        start = 0.0 if metrics is None else perf_counter()
         state = OrchestratorState(
             is_done=self.orchestration_invocation_succeeded,
             actions=self.context._actions,
@@ -284,16 +403,21 @@ class TaskOrchestrationExecutor:
             error=None if self.exception is None else str(self.exception),
             custom_status=self.context.custom_status
         )
+        state_str = state.to_json_string()
+
+        if metrics is not None:
+            metrics.serialize_duration += perf_counter() - start
+            metrics.output_size = len(state_str)
+            metrics.record_actions(state.actions)
 
         if self.exception is not None:
             # Create formatted error, using out-of-proc error schema
             error_label = "\n\n$OutOfProcData$:"
-            state_str = state.to_json_string()
             formatted_error = f"{self.exception}{error_label}{state_str}"
 
             # Raise exception, re-set stack to original location
             raise Exception(formatted_error) from self.exception
-        return state.to_json_string()
+        return state_str
 
     def is_task_completion_event(self, event_type: HistoryEventType) -> bool:
         """Determine if some event_type corresponds to a Task-resolution event.
@@ -334,3 +458,26 @@ class TaskOrchestrationExecutor:
             Whether the orchestration returned or continued-as-new
         """
         return self.orchestrator_returned or self.context.will_continue_as_new
+
+
+def _task_completion_handler(
+        payload: SetTaskValuePayload) -> Callable[[TaskOrchestrationExecutor, HistoryEvent], None]:
+    is_success, _, get_task_id = payload
+
+    def process_task_completion(executor: TaskOrchestrationExecutor, event: HistoryEvent):
+        # transition a task to a success or failure state
+        executor._set_task_value(event, is_success, get_task_id)
+        executor.resume_user_code()
+    return process_task_completion
+
+
+# The handlers of the event types that affect the orchestration, all others are ignored
+_EVENT_HANDLERS: Dict[HistoryEventType, Callable[[TaskOrchestrationExecutor, HistoryEvent], None]]
+_EVENT_HANDLERS = {
+    HistoryEventType.ORCHESTRATOR_STARTED: TaskOrchestrationExecutor._process_orchestrator_started,
+    HistoryEventType.CONTINUE_AS_NEW: TaskOrchestrationExecutor._process_continue_as_new,
+    HistoryEventType.EXECUTION_STARTED: TaskOrchestrationExecutor._process_execution_started,
+    HistoryEventType.EVENT_SENT: TaskOrchestrationExecutor._process_event_sent,
+    **{event_type: _task_completion_handler(payload)
+       for event_type, payload in EVENT_TO_SET_TASK_VALUE_PAYLOAD.items()},
+}
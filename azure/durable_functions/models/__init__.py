@@ -9,6 +9,9 @@ from .RetryOptions import RetryOptions
 from .DurableHttpRequest import DurableHttpRequest
 from .TokenSource import ManagedIdentityTokenSource
 from .DurableEntityContext import DurableEntityContext
+from .ReplayCache import ReplayCache
+from .OrchestrationMetrics import OrchestrationMetrics
+from .EncodedInput import EncodedInput
 
 __all__ = [
     'DurableOrchestrationBindings',
@@ -16,9 +19,12 @@ __all__ = [
     'DurableEntityContext',
     'DurableOrchestrationContext',
     'DurableHttpRequest',
+    'EncodedInput',
     'ManagedIdentityTokenSource',
     'OrchestratorState',
+    'OrchestrationMetrics',
     'OrchestrationRuntimeStatus',
     'PurgeHistoryResult',
+    'ReplayCache',
     'RetryOptions'
 ]
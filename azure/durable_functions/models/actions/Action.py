@@ -1,10 +1,15 @@
 from typing import Dict, Any
 from abc import ABC, abstractmethod
 
+from ..utils import json_codec
+from ..utils.type_codecs import serialize_custom_object
+
 
 class Action(ABC):
     """Defines the base abstract class for Actions that need to be implemented."""
 
+    __slots__ = ('_json_string',)
+
     @property
     @abstractmethod
     def action_type(self) -> int:
@@ -21,3 +26,38 @@ class Action(ABC):
             The instance of the class converted into a json dictionary
         """
         pass
+
+    def to_json_string(self) -> str:
+        """Convert object into a json string.
+
+        Actions do not change once scheduled, so the string is cached. Sub-classes
+        with mutable attributes must reset it with `_invalidate_json_string`.
+
+        Returns
+        -------
+        str
+            The instance of the object in json string format
+        """
+        json_string = getattr(self, '_json_string', None)
+        if not json_string:
+            json_string = json_codec.dumps(self.to_json(), default=serialize_custom_object)
+            self._json_string = json_string
+        return json_string
+
+    def _was_serialized(self) -> bool:
+        """Determine if the action was serialized before, as part of an actions payload.
+
+        Returns
+        -------
+        bool
+            True if `_mark_as_serialized` was called since the action last changed
+        """
+        return getattr(self, '_json_string', None) is not None
+
+    def _mark_as_serialized(self):
+        if getattr(self, '_json_string', None) is None:
+            # an empty string marks the action as serialized, but not cached
+            self._json_string = ''
+
+    def _invalidate_json_string(self):
+        self._json_string = None
@@ -3,8 +3,9 @@ from typing import Dict, Union
 from .Action import Action
 from .ActionType import ActionType
 from ..utils.json_utils import add_attrib
-from json import dumps
-from azure.functions._durable_functions import _serialize_custom_object
+from ..EncodedInput import encode_input
+from ..utils.payload_compression import compress
+from ..utils.payload_store import offload
 
 
 class CallActivityAction(Action):
@@ -13,10 +14,12 @@ class CallActivityAction(Action):
     Provides the information needed by the durable extension to be able to schedule the activity.
     """
 
+    __slots__ = ('function_name', 'input_')
+
     def __init__(self, function_name: str, input_=None):
         self.function_name: str = function_name
         # It appears that `.input_` needs to be JSON-serializable at this point
-        self.input_ = dumps(input_, default=_serialize_custom_object)
+        self.input_ = offload(compress(encode_input(input_)))
 
         if not self.function_name:
             raise ValueError("function_name cannot be empty")
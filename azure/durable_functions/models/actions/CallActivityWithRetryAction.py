@@ -1,11 +1,12 @@
-from json import dumps
+from ..EncodedInput import encode_input
+from ..utils.payload_compression import compress
+from ..utils.payload_store import offload
 from typing import Dict, Union
 
 from .Action import Action
 from .ActionType import ActionType
 from ..RetryOptions import RetryOptions
 from ..utils.json_utils import add_attrib, add_json_attrib
-from azure.functions._durable_functions import _serialize_custom_object
 
 
 class CallActivityWithRetryAction(Action):
@@ -14,11 +15,13 @@ class CallActivityWithRetryAction(Action):
     Provides the information needed by the durable extension to be able to schedule the activity.
     """
 
+    __slots__ = ('function_name', 'retry_options', 'input_')
+
     def __init__(self, function_name: str,
                  retry_options: RetryOptions, input_=None):
         self.function_name: str = function_name
         self.retry_options: RetryOptions = retry_options
-        self.input_ = dumps(input_, default=_serialize_custom_object)
+        self.input_ = offload(compress(encode_input(input_)))
 
         if not self.function_name:
             raise ValueError("function_name cannot be empty")
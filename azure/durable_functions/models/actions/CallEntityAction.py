@@ -3,8 +3,7 @@ from typing import Any, Dict
 from .Action import Action
 from .ActionType import ActionType
 from ..utils.json_utils import add_attrib
-from json import dumps
-from azure.functions._durable_functions import _serialize_custom_object
+from ..EncodedInput import encode_input
 from ..utils.entity_utils import EntityId
 
 
@@ -14,6 +13,8 @@ class CallEntityAction(Action):
     Provides the information needed by the durable extension to be able to call an activity
     """
 
+    __slots__ = ('entity_id', 'instance_id', 'operation', 'input_')
+
     def __init__(self, entity_id: EntityId, operation: str, input_=None):
         self.entity_id: EntityId = entity_id
 
@@ -23,7 +24,7 @@ class CallEntityAction(Action):
 
         self.instance_id: str = EntityId.get_scheduler_id(entity_id)
         self.operation: str = operation
-        self.input_: str = dumps(input_, default=_serialize_custom_object)
+        self.input_: str = encode_input(input_)
 
     @property
     def action_type(self) -> int:
@@ -12,8 +12,9 @@ class CallHttpAction(Action):
     Provides the information needed by the durable extension to be able to schedule the activity.
     """
 
+    __slots__ = ('http_request',)
+
     def __init__(self, http_request: DurableHttpRequest):
-        self._action_type: int = ActionType.CALL_HTTP
         self.http_request = http_request
 
     @property
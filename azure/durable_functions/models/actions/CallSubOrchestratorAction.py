@@ -3,17 +3,19 @@ from typing import Any, Dict, Optional, Union
 from .Action import Action
 from .ActionType import ActionType
 from ..utils.json_utils import add_attrib
-from json import dumps
-from azure.functions._durable_functions import _serialize_custom_object
+from ..EncodedInput import encode_input
+from ..utils.payload_compression import compress
 
 
 class CallSubOrchestratorAction(Action):
     """Defines the structure of the Call SubOrchestrator object."""
 
+    __slots__ = ('function_name', '_input', 'instance_id')
+
     def __init__(self, function_name: str, _input: Optional[Any] = None,
                  instance_id: Optional[str] = None):
         self.function_name: str = function_name
-        self._input: str = dumps(_input, default=_serialize_custom_object)
+        self._input: str = compress(encode_input(_input))
         self.instance_id: Optional[str] = instance_id
 
         if not self.function_name:
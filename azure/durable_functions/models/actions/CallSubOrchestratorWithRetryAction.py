@@ -3,19 +3,21 @@ from typing import Any, Dict, Union, Optional
 from .Action import Action
 from .ActionType import ActionType
 from ..utils.json_utils import add_attrib, add_json_attrib
-from json import dumps
+from ..EncodedInput import encode_input
+from ..utils.payload_compression import compress
 from ..RetryOptions import RetryOptions
-from azure.functions._durable_functions import _serialize_custom_object
 
 
 class CallSubOrchestratorWithRetryAction(Action):
     """Defines the structure of the Call SubOrchestrator object."""
 
+    __slots__ = ('function_name', '_input', 'retry_options', 'instance_id')
+
     def __init__(self, function_name: str, retry_options: RetryOptions,
                  _input: Optional[Any] = None,
                  instance_id: Optional[str] = None):
         self.function_name: str = function_name
-        self._input: str = dumps(_input, default=_serialize_custom_object)
+        self._input: str = compress(encode_input(_input))
         self.retry_options: RetryOptions = retry_options
         self.instance_id: Optional[str] = instance_id
 
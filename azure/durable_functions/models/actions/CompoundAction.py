@@ -1,6 +1,7 @@
 from typing import Dict, Union
 
 from .Action import Action
+from ..utils import json_codec
 from ..utils.json_utils import add_attrib
 from typing import List
 from abc import abstractmethod
@@ -12,6 +13,8 @@ class CompoundAction(Action):
     Provides the information needed by the durable extension to be able to invoke WhenAll tasks.
     """
 
+    __slots__ = ('compound_tasks',)
+
     def __init__(self, compound_tasks: List[Action]):
         self.compound_tasks = compound_tasks
 
@@ -33,3 +36,19 @@ class CompoundAction(Action):
         add_attrib(json_dict, self, 'action_type', 'actionType')
         json_dict['compoundActions'] = list(map(lambda x: x.to_json(), self.compound_tasks))
         return json_dict
+
+    def to_json_string(self) -> str:
+        """Convert object into a json string.
+
+        Compound actions may contain actions that change, like cancelled timers, so
+        only the strings of the latter are cached.
+
+        Returns
+        -------
+        str
+            The instance of the object in json string format
+        """
+        return json_codec.join_object([
+            ('actionType', json_codec.dumps(self.action_type)),
+            ('compoundActions', json_codec.join_array(
+                [action.to_json_string() for action in self.compound_tasks]))])
@@ -3,8 +3,7 @@ from typing import Dict, Union
 from .Action import Action
 from .ActionType import ActionType
 from ..utils.json_utils import add_attrib
-from json import dumps
-from azure.functions._durable_functions import _serialize_custom_object
+from ..EncodedInput import encode_input
 
 
 class ContinueAsNewAction(Action):
@@ -14,8 +13,10 @@ class ContinueAsNewAction(Action):
     and continue as new.
     """
 
+    __slots__ = ('input_',)
+
     def __init__(self, input_=None):
-        self.input_ = dumps(input_, default=_serialize_custom_object)
+        self.input_ = encode_input(input_)
 
     @property
     def action_type(self) -> int:
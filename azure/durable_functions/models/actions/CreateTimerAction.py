@@ -19,14 +19,25 @@ class CreateTimerAction(Action):
         if the event fired is not of valid datetime object
     """
 
+    __slots__ = ('fire_at', '_is_cancelled')
+
     def __init__(self, fire_at: datetime.datetime, is_cancelled: bool = False):
-        self._action_type: ActionType = ActionType.CREATE_TIMER
         self.fire_at: datetime.datetime = fire_at
         self.is_cancelled: bool = is_cancelled
 
         if not isinstance(self.fire_at, datetime.date):
             raise ValueError("fireAt: Expected valid datetime object but got ", self.fire_at)
 
+    @property
+    def is_cancelled(self) -> bool:
+        """Get whether the timer has been cancelled."""
+        return self._is_cancelled
+
+    @is_cancelled.setter
+    def is_cancelled(self, is_cancelled: bool):
+        self._is_cancelled = is_cancelled
+        self._invalidate_json_string()
+
     def to_json(self) -> Dict[str, Any]:
         """
         Convert object into a json dictionary.
@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 class NoOpAction(Action):
     """A no-op action, for anonymous tasks only."""
 
+    __slots__ = ('metadata',)
+
     def __init__(self, metadata: Optional[str] = None):
         """Create a NoOpAction object.
 
@@ -19,6 +19,8 @@ class WaitForExternalEventAction(Action):
         Raises error if external_event_name is not defined.
     """
 
+    __slots__ = ('external_event_name', 'reason')
+
     def __init__(self, external_event_name: str):
         self.external_event_name: str = external_event_name
         self.reason = "ExternalEvent"
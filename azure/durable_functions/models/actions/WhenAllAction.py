@@ -8,6 +8,8 @@ class WhenAllAction(CompoundAction):
     Provides the information needed by the durable extension to be able to invoke WhenAll tasks.
     """
 
+    __slots__ = ()
+
     @property
     def action_type(self) -> int:
         """Get the type of action this class represents."""
@@ -1,8 +1,8 @@
 from typing import List, Optional, Dict, Any
 from .Signal import Signal
-from azure.functions._durable_functions import _serialize_custom_object
+from ..utils.type_codecs import serialize_custom_object
 from .OperationResult import OperationResult
-import json
+from ..utils import json_codec, payload_compression, payload_formats
 
 
 class EntityState:
@@ -56,7 +56,9 @@ class EntityState:
         serialized_results = list(map(lambda x: x.to_json(), self.results))
 
         json_dict["entityExists"] = self.entity_exists
-        json_dict["entityState"] = json.dumps(self.state, default=_serialize_custom_object)
+        json_dict["entityState"] = payload_compression.compress(
+            json_codec.dumps(payload_formats.encode_value(self.state),
+                             default=serialize_custom_object))
         json_dict["results"] = serialized_results
         json_dict["signals"] = self.signals
         return json_dict
@@ -71,4 +73,4 @@ class EntityState:
         """
         # TODO: Same implementation as in Orchestrator.py, we should refactor to shared a base
         json_dict = self.to_json()
-        return json.dumps(json_dict)
+        return json_codec.dumps(json_dict)
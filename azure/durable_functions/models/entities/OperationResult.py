@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any
-from azure.functions._durable_functions import _serialize_custom_object
-import json
+from ..utils.type_codecs import serialize_custom_object
+from ..utils import json_codec
 
 
 class OperationResult:
@@ -72,5 +72,5 @@ class OperationResult:
         to_json: Dict[str, Any] = {}
         to_json["isError"] = self.is_error
         to_json["duration"] = self.duration
-        to_json["result"] = json.dumps(self.result, default=_serialize_custom_object)
+        to_json["result"] = json_codec.dumps(self.result, default=serialize_custom_object)
         return to_json
@@ -1,6 +1,6 @@
 from typing import List, Optional, Any
 from ..utils.entity_utils import EntityId
-import json
+from ..utils import json_codec
 
 
 class RequestMessage:
@@ -48,6 +48,6 @@ class RequestMessage:
         """
         # We replace the `id` key for `id_` to avoid clashes with reserved
         # identifiers in Python
-        json_dict = json.loads(json_str)
+        json_dict = json_codec.loads(json_str)
         json_dict["id_"] = json_dict.pop("id")
         return cls(**json_dict)
@@ -1,5 +1,5 @@
 from typing import Dict, Any
-import json
+from ..utils import json_codec
 
 
 class ResponseMessage:
@@ -23,7 +23,7 @@ class ResponseMessage:
         # for this by re-serializing the payload.
         if result.strip().startswith("Timeout value of"):
             is_exception = True
-            result = json.dumps(result)
+            result = json_codec.dumps(result)
 
         self.result = result
         self.is_exception = is_exception
@@ -1,19 +1,27 @@
 import datetime
-from dateutil.parser import parse as dt_parse
 from .HistoryEventType import HistoryEventType
+from ..utils.datetime_utils import parse_timestamp
 
 
 class HistoryEvent:
     """Used to communicate state relevant information from the durable extension to the client."""
 
+    # Attributes of the most common history event schemas are stored in slots.
+    # Rarely used ones, like those of the `ExecutionStarted` event, overflow into the
+    # instance's `__dict__`, which is only allocated when needed.
+    __slots__ = ('_event_type', '_event_id', '_is_played', '_timestamp', 'Name', 'InstanceId',
+                 'TaskScheduledId', 'TimerId', 'Reason', 'Details', 'Input', 'Result',
+                 'Version', 'FireAt', '__dict__')
+
+    _is_processed: bool = False
+
     # parameter names are as defined by JSON schema and do not conform to PEP8 naming conventions
     def __init__(self, EventType: HistoryEventType, EventId: int, IsPlayed: bool, Timestamp: str,
                  **kwargs):
         self._event_type: HistoryEventType = EventType
         self._event_id: int = EventId
         self._is_played: bool = IsPlayed
-        self._timestamp: datetime.datetime = dt_parse(Timestamp)
-        self._is_processed: bool = False
+        self._timestamp: datetime.datetime = parse_timestamp(Timestamp)
 
         self.Name = None
         self.InstanceId = None
@@ -23,7 +31,7 @@ class HistoryEvent:
         self.Input = None
         if kwargs is not None:
             for key, value in kwargs.items():
-                self.__setattr__(key, value)
+                setattr(self, key, value)
 
     @property
     def event_type(self) -> HistoryEventType:
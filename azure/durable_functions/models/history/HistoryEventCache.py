@@ -0,0 +1,137 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from .HistoryEvent import HistoryEvent
+from .HistoryEventDecoder import HistoryEventDecoder, HistoryPrefixMismatchError, \
+    raw_event_signature
+from ..utils.instance_cache import InstanceCache
+
+_INSTANCE_ID_PATTERN = re.compile(r'"instanceId"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def _find_instance_id(json_string: str) -> Optional[str]:
+    """Find the instance ID of an orchestration trigger payload, without decoding it.
+
+    The history usually precedes the instance ID in the payload. Since the keys of history
+    events are not camel-cased, the key should only appear once, at the top-level.
+    Callers must nevertheless verify the result once the payload is decoded.
+    """
+    match = _INSTANCE_ID_PATTERN.match(json_string, max(json_string.rfind('"instanceId"'), 0))
+    return None if match is None else json.loads(match.group(1))
+
+
+class HistoryEventCacheEntry:
+    """The decoded history of an orchestration instance."""
+
+    def __init__(self, events: List[HistoryEvent], last_raw_event: Dict[str, Any]):
+        """Capture a decoded history.
+
+        Parameters
+        ----------
+        events : List[HistoryEvent]
+            The decoded history events
+        last_raw_event : Dict[str, Any]
+            The JSON-decoded representation of the last history event
+        """
+        self.events = events
+        self.num_events: int = len(events)
+        self.last_event_signature = raw_event_signature(last_raw_event)
+
+    def is_prefix_of(self, history: List[Dict[str, Any]]) -> bool:
+        """Determine if the decoded history is a prefix of a newly received one.
+
+        Parameters
+        ----------
+        history : List[Dict[str, Any]]
+            The JSON-decoded history of the new invocation
+
+        Returns
+        -------
+        bool
+            True if the new history extends the decoded history. False otherwise.
+        """
+        num_events = self.num_events
+        if len(history) < num_events:
+            return False
+        return raw_event_signature(history[num_events - 1]) == self.last_event_signature
+
+
+class HistoryEventCache(InstanceCache):
+    """A bounded, in-process LRU cache of decoded orchestration histories.
+
+    Since histories are append-only, a new invocation of a cached instance only
+    needs to decode the history events appended since its previous invocation.
+    The decoded prefix is validated via its length and the identity of its last event.
+
+    The cache is opt-in, see `Orchestrator.create`.
+    """
+
+    def decode(self, instance_id: str, history: List[Dict[str, Any]]) -> List[HistoryEvent]:
+        """Decode the history of an orchestration instance, reusing its cached prefix.
+
+        Parameters
+        ----------
+        instance_id : str
+            The ID of the orchestration instance
+        history : List[Dict[str, Any]]
+            The JSON-decoded history of the new invocation
+
+        Returns
+        -------
+        List[HistoryEvent]
+            The decoded history events
+        """
+        events: List[HistoryEvent]
+        entry = self.take(instance_id, history)
+        if entry is None:
+            events = [HistoryEvent(**raw_event) for raw_event in history]
+        else:
+            events = entry.events[:]
+            num_cached = entry.num_events
+            # Events can transition from "not played" to "played" between invocations
+            for event, raw_event in zip(events, history):
+                event._is_played = raw_event["IsPlayed"]
+            events.extend(HistoryEvent(**raw_event) for raw_event in history[num_cached:])
+
+        if len(events) > 0:
+            self.put(instance_id, HistoryEventCacheEntry(events, history[-1]))
+        return events
+
+    def decode_payload(self, json_string: str) -> Dict[str, Any]:
+        """Decode an orchestration trigger payload, reusing the cached prefix of its history.
+
+        History events are decoded while the payload is being JSON-decoded, see
+        `HistoryEventDecoder`. If the history turns out not to extend the cached one,
+        the payload is decoded again, from scratch.
+
+        Parameters
+        ----------
+        json_string : str
+            The orchestration trigger payload
+
+        Returns
+        -------
+        Dict[str, Any]
+            The JSON-decoded payload, with the decoded history events as its history
+        """
+        instance_id = _find_instance_id(json_string)
+        entry = None if instance_id is None else self._take_unverified(instance_id)
+        try:
+            decoder = HistoryEventDecoder() if entry is None \
+                else HistoryEventDecoder(entry.events, entry.last_event_signature)
+            json_dict = decoder.decode(json_string)
+            if entry is not None and (not decoder.has_decoded_prefix
+                                      or json_dict.get("instanceId") != instance_id):
+                raise HistoryPrefixMismatchError()
+        except HistoryPrefixMismatchError:
+            entry = None
+            decoder = HistoryEventDecoder()
+            json_dict = decoder.decode(json_string)
+        self._record_lookup(entry is not None)
+
+        instance_id = json_dict.get("instanceId")
+        if decoder.last_raw_event is not None and isinstance(instance_id, str):
+            self.put(instance_id, HistoryEventCacheEntry(json_dict["history"],
+                                                         decoder.last_raw_event))
+        return json_dict
@@ -0,0 +1,150 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .HistoryEvent import HistoryEvent
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# decodes a single JSON value, starting at an index of a string, via the stdlib's scanner
+_scan_once = json.JSONDecoder().scan_once
+
+
+def _skip_whitespace(s: str, index: int) -> int:
+    return _WHITESPACE.match(s, index).end()
+
+
+def raw_event_signature(raw_event: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """Obtain a cheap identity for a JSON-decoded history event."""
+    return (raw_event.get("EventType"), raw_event.get("EventId"), raw_event.get("Timestamp"))
+
+
+class HistoryPrefixMismatchError(Exception):
+    """Raised when a history does not start with the expected, previously decoded, events."""
+
+    pass
+
+
+class HistoryEventDecoder:
+    """Decodes history events while their orchestration trigger payload is being JSON-decoded.
+
+    The payload's top-level object is parsed here, and the elements of its `history` array
+    are JSON-decoded one at a time, each turned into a `HistoryEvent` as soon as it is
+    parsed. Therefore, the JSON-decoded history events never all reside in memory at once,
+    alongside the decoded ones. JSON objects anywhere else in the payload, e.g. in inputs,
+    are left as they are, even if they have an `EventType`.
+
+    A previously decoded prefix of the history can be provided, whose events are reused
+    instead of being decoded again. The prefix is verified via its last event, and a
+    `HistoryPrefixMismatchError` is raised if the history does not match it.
+    """
+
+    def __init__(self, prefix: Optional[List[HistoryEvent]] = None,
+                 last_prefix_event_signature: Optional[Tuple[Any, Any, Any]] = None):
+        """Create a decoder for a single trigger payload.
+
+        Parameters
+        ----------
+        prefix : Optional[List[HistoryEvent]]
+            The expected, previously decoded, first events of the history
+        last_prefix_event_signature : Optional[Tuple[Any, Any, Any]]
+            The `raw_event_signature` of the last event of the prefix
+        """
+        self._prefix: List[HistoryEvent] = [] if prefix is None else prefix
+        self._last_prefix_event_signature = last_prefix_event_signature
+        self.num_events: int = 0
+        self.last_raw_event: Optional[Dict[str, Any]] = None
+
+    @property
+    def has_decoded_prefix(self) -> bool:
+        """Determine if the history included the entire prefix."""
+        return self.num_events >= len(self._prefix)
+
+    def decode(self, json_string: Union[str, bytes]) -> Any:
+        """Decode an orchestration trigger payload, and the history events of its history.
+
+        Parameters
+        ----------
+        json_string : Union[str, bytes]
+            The JSON-formatted orchestration trigger payload
+
+        Returns
+        -------
+        Any
+            The JSON-decoded payload, with the decoded history events as its history
+        """
+        s = json_string.decode() if isinstance(json_string, (bytes, bytearray)) \
+            else json_string
+        try:
+            json_dict, end = self._decode_payload(s, _skip_whitespace(s, 0))
+            if _skip_whitespace(s, end) != len(s):
+                raise ValueError("Extra data")
+            return json_dict
+        except (ValueError, IndexError, StopIteration):
+            # let the stdlib either decode the payload, or raise its own error
+            self.num_events = 0
+            self.last_raw_event = None
+            json_dict = json.loads(s)
+            history = json_dict.get("history") if isinstance(json_dict, dict) else None
+            if isinstance(history, list):
+                json_dict["history"] = [self._decode_event(raw_event) for raw_event in history]
+            return json_dict
+
+    def _decode_payload(self, s: str, index: int) -> Tuple[Dict[str, Any], int]:
+        if s[index] != "{":
+            raise ValueError("Expecting an object")
+        json_dict: Dict[str, Any] = {}
+        index = _skip_whitespace(s, index + 1)
+        if s[index] == "}":
+            return json_dict, index + 1
+        while True:
+            if s[index] != '"':
+                raise ValueError("Expecting a property name")
+            key, index = scanstring(s, index + 1)
+            index = _skip_whitespace(s, index)
+            if s[index] != ":":
+                raise ValueError("Expecting ':' delimiter")
+            index = _skip_whitespace(s, index + 1)
+            if key == "history" and s[index] == "[":
+                json_dict[key], index = self._decode_history(s, index)
+            else:
+                json_dict[key], index = _scan_once(s, index)
+            index = _skip_whitespace(s, index)
+            if s[index] == "}":
+                return json_dict, index + 1
+            if s[index] != ",":
+                raise ValueError("Expecting ',' delimiter")
+            index = _skip_whitespace(s, index + 1)
+
+    def _decode_history(self, s: str, index: int) -> Tuple[List[Any], int]:
+        history: List[Any] = []
+        index = _skip_whitespace(s, index + 1)
+        if s[index] == "]":
+            return history, index + 1
+        while True:
+            raw_event, index = _scan_once(s, index)
+            history.append(self._decode_event(raw_event))
+            index = _skip_whitespace(s, index)
+            if s[index] == "]":
+                return history, index + 1
+            if s[index] != ",":
+                raise ValueError("Expecting ',' delimiter")
+            index = _skip_whitespace(s, index + 1)
+
+    def _decode_event(self, raw_event: Any) -> Any:
+        if type(raw_event) is not dict or "EventType" not in raw_event:
+            return raw_event
+
+        index = self.num_events
+        self.num_events += 1
+        self.last_raw_event = raw_event
+        if index >= len(self._prefix):
+            return HistoryEvent(**raw_event)
+
+        if (index == len(self._prefix) - 1
+                and raw_event_signature(raw_event) != self._last_prefix_event_signature):
+            raise HistoryPrefixMismatchError()
+        # Events can transition from "not played" to "played" between invocations
+        event = self._prefix[index]
+        event._is_played = raw_event["IsPlayed"]
+        return event
@@ -1,8 +1,12 @@
 """Contains models related to the orchestration history of the durable functions."""
 from .HistoryEvent import HistoryEvent
 from .HistoryEventType import HistoryEventType
+from .HistoryEventCache import HistoryEventCache
+from .HistoryEventDecoder import HistoryEventDecoder
 
 __all__ = [
     'HistoryEvent',
+    'HistoryEventCache',
+    'HistoryEventDecoder',
     'HistoryEventType'
 ]
@@ -0,0 +1,47 @@
+import re
+from datetime import datetime
+
+from dateutil.parser import parse as dt_parse
+
+# Timestamps emitted by the durable extension, i.e. `DATETIME_STRING_FORMAT` with
+# between zero and seven fractional digits (.NET's precision) and an optional `Z` suffix.
+_TIMESTAMP_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,7}))?(Z?)\Z")
+
+# The timezone that `dateutil` assigns to `Z`-suffixed timestamps. Depending on the
+# worker's local timezone, this is either `tzutc()` or `tzlocal()`, so we obtain it
+# from `dateutil` itself to keep both parsing paths interchangeable.
+_UTC_TZINFO = dt_parse("2000-01-01T00:00:00Z").tzinfo
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp string, as emitted by the durable extension.
+
+    Timestamps in the extension's fixed ISO-8601 format are parsed via a fast path,
+    any other format is delegated to `dateutil`. Both paths produce identical results.
+
+    Parameters
+    ----------
+    value: str
+        The timestamp string to parse
+
+    Returns
+    -------
+    datetime
+        The parsed timestamp
+    """
+    match = _TIMESTAMP_PATTERN.match(value)
+    if match is None:
+        return dt_parse(value)
+
+    year, month, day, hour, minute, second, fraction, utc_suffix = match.groups()
+    # like `dateutil`, we truncate digits beyond microseconds
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+
+    try:
+        # built directly rather than via `datetime.fromisoformat`, which needs Python 3.7
+        timestamp = datetime(int(year), int(month), int(day), int(hour), int(minute),
+                             int(second), microsecond)
+    except ValueError:
+        return dt_parse(value)
+    return timestamp.replace(tzinfo=_UTC_TZINFO) if utc_suffix else timestamp
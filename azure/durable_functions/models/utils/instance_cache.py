@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+
+class InstanceCache:
+    """A bounded, thread-safe LRU cache of per-orchestration-instance state.
+
+    Entries must expose a `num_events` attribute, the number of history events they
+    represent, and an `is_prefix_of(history)` method, which determines if they can be
+    reused for a newly received history.
+    """
+
+    def __init__(self, max_instances: int = 128, max_history_events: int = 500000):
+        """Create a new InstanceCache.
+
+        Parameters
+        ----------
+        max_instances : int
+            The maximum number of orchestration instances to keep in memory
+        max_history_events : int
+            The maximum number of history events, across all cached instances,
+            to keep in memory. Used as a proxy for the cache's memory budget.
+        """
+        if max_instances < 1:
+            raise ValueError("max_instances must be a positive integer")
+        if max_history_events < 1:
+            raise ValueError("max_history_events must be a positive integer")
+        self.max_instances: int = max_instances
+        self.max_history_events: int = max_history_events
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._num_history_events: int = 0
+        self._lock = Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Get the number of invocations that reused a cached entry."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Get the number of invocations that could not reuse a cached entry."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Get the number of entries evicted to stay within the cache bounds."""
+        return self._evictions
+
+    def __len__(self) -> int:
+        """Get the number of cached orchestration instances."""
+        return len(self._entries)
+
+    def __contains__(self, instance_id: str) -> bool:
+        """Determine if an orchestration instance is cached."""
+        return instance_id in self._entries
+
+    def take(self, instance_id: str, history: Any) -> Optional[Any]:
+        """Remove and return the cached entry of an instance, if it can be reused for `history`.
+
+        The entry is removed from the cache so that concurrent invocations of the same
+        instance never share it. It should be returned via `put` once the invocation
+        no longer needs exclusive access to it.
+
+        Parameters
+        ----------
+        instance_id : str
+            The ID of the orchestration instance being invoked
+        history : Any
+            The history of the new invocation
+
+        Returns
+        -------
+        Optional[Any]
+            The cached entry, or None if there is no reusable entry for the instance
+        """
+        with self._lock:
+            entry = self._pop(instance_id)
+            if entry is not None and entry.is_prefix_of(history):
+                self._hits += 1
+                return entry
+            self._misses += 1
+            return None
+
+    def _take_unverified(self, instance_id: str) -> Optional[Any]:
+        """Remove and return the cached entry of an instance, without verifying it.
+
+        For sub-classes that can only verify an entry while processing the new history.
+        They must report the outcome of the verification via `_record_lookup`.
+        """
+        with self._lock:
+            return self._pop(instance_id)
+
+    def _record_lookup(self, is_hit: bool):
+        """Record whether a cached entry could be reused by an invocation."""
+        with self._lock:
+            if is_hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _pop(self, instance_id: str) -> Optional[Any]:
+        """Remove and return the cached entry of an instance. The lock must be held."""
+        entry = self._entries.pop(instance_id, None)
+        if entry is not None:
+            self._num_history_events -= entry.num_events
+        return entry
+
+    def put(self, instance_id: str, entry: Any):
+        """Cache the entry of an instance, evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        instance_id : str
+            The ID of the orchestration instance
+        entry : Any
+            The state of the instance after its latest invocation
+        """
+        with self._lock:
+            self._pop(instance_id)
+            if entry.num_events > self.max_history_events:
+                # the instance alone exceeds the budget, so we never cache it
+                self._evictions += 1
+                return
+
+            self._entries[instance_id] = entry
+            self._num_history_events += entry.num_events
+            while (len(self._entries) > self.max_instances
+                   or self._num_history_events > self.max_history_events):
+                _, evicted_entry = self._entries.popitem(last=False)
+                self._num_history_events -= evicted_entry.num_events
+                self._evictions += 1
+
+    def evict(self, instance_id: str):
+        """Remove an orchestration instance from the cache, if present.
+
+        Parameters
+        ----------
+        instance_id : str
+            The ID of the orchestration instance
+        """
+        with self._lock:
+            self._pop(instance_id)
+
+    def clear(self):
+        """Remove all orchestration instances from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._num_history_events = 0
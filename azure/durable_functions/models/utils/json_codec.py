@@ -0,0 +1,320 @@
+"""JSON encoding and decoding used throughout the SDK.
+
+All JSON payloads exchanged with the durable extension, and with the user's functions,
+are encoded and decoded via `dumps` and `loads`. These delegate to the active codec,
+the stdlib-based `JsonCodec` by default. The faster `OrjsonCodec` encodes some values
+differently, so it is opt-in: via the `DURABLE_FUNCTIONS_JSON_CODEC` environment variable,
+or via `set_codec`.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
+
+from .type_codecs import deserialize_custom_object
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency
+    orjson = None
+
+JSON_CODEC_ENVIRONMENT_VARIABLE = "DURABLE_FUNCTIONS_JSON_CODEC"
+# The keys marking the JSON objects encoding custom objects, see `serialize_custom_object`
+# and the `to_json` convention of `azure.functions._durable_functions`
+_CUSTOM_OBJECT_MARKERS = ('"$durableType"', '"__class__"')
+_CUSTOM_OBJECT_MARKERS_BYTES = tuple(marker.encode() for marker in _CUSTOM_OBJECT_MARKERS)
+
+
+@lru_cache(maxsize=16)
+def _get_encoder(default: Callable[[Any], Any]) -> json.JSONEncoder:
+    return json.JSONEncoder(default=default)
+
+
+class JsonCodec:
+    """Encodes and decodes JSON via the stdlib `json` module.
+
+    Sub-classes may use a different backend, but must produce and accept the same
+    JSON documents, and must honor `default` and `object_hook` like the stdlib does.
+    """
+
+    name = "json"
+    # the separators that `dumps` emits between items, and between keys and values
+    item_separator = ", "
+    key_separator = ": "
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        """Encode a value as a JSON-formatted string.
+
+        Parameters
+        ----------
+        obj : Any
+            The value to encode
+        default : Optional[Callable[[Any], Any]]
+            Function that obtains an encodable version of a value that is not
+            natively supported. It should raise a TypeError otherwise.
+
+        Returns
+        -------
+        str
+            The JSON-formatted string
+        """
+        if default is None:
+            return json.dumps(obj)
+        # `json.dumps` creates an encoder per call when given a `default`
+        return _get_encoder(default).encode(obj)
+
+    def loads(self, s: Union[str, bytes],
+              object_hook: Optional[Callable[[dict], Any]] = None) -> Any:
+        """Decode a JSON-formatted string.
+
+        Parameters
+        ----------
+        s : Union[str, bytes]
+            The JSON-formatted string
+        object_hook : Optional[Callable[[dict], Any]]
+            Function that transforms every decoded JSON object
+
+        Returns
+        -------
+        Any
+            The decoded value
+        """
+        return json.loads(s, object_hook=object_hook)
+
+    def join_array(self, fragments: Iterable[str]) -> str:
+        """Assemble a JSON array from its already encoded items.
+
+        Parameters
+        ----------
+        fragments : Iterable[str]
+            The JSON-formatted items, in order
+
+        Returns
+        -------
+        str
+            The JSON-formatted array, as `dumps` would encode it
+        """
+        return "[" + self.item_separator.join(fragments) + "]"
+
+    def join_object(self, members: Iterable[Tuple[str, str]]) -> str:
+        """Assemble a JSON object from its keys and already encoded values.
+
+        Parameters
+        ----------
+        members : Iterable[Tuple[str, str]]
+            The keys and their JSON-formatted values, in order
+
+        Returns
+        -------
+        str
+            The JSON-formatted object, as `dumps` would encode it
+        """
+        key_separator = self.key_separator
+        return "{" + self.item_separator.join(
+            self.dumps(key) + key_separator + fragment for key, fragment in members) + "}"
+
+
+class OrjsonCodec(JsonCodec):
+    """Encodes and decodes JSON via `orjson`, falling back to the stdlib where they differ.
+
+    Values that the stdlib does not natively encode, like datetimes and dataclasses, are
+    passed to `default`, as with the stdlib. Values that `orjson` cannot encode or decode,
+    like integers beyond 64 bits or `NaN` literals, are handled by the stdlib instead.
+    Decoding with an `object_hook` is always done by the stdlib.
+
+    Unlike the stdlib, non-ASCII characters are not escaped, no whitespace is emitted
+    between tokens, `NaN` and infinite floats are encoded as `null`, and enums and UUIDs
+    are encoded natively rather than passed to `default`.
+    """
+
+    name = "orjson"
+    item_separator = ","
+    key_separator = ":"
+
+    def __init__(self):
+        """Create a codec based on `orjson`, which must be installed."""
+        if orjson is None:
+            raise ImportError("The 'orjson' package is required to use the orjson codec.")
+        self._options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+                         | orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        """Encode a value as a JSON-formatted string.
+
+        Parameters
+        ----------
+        obj : Any
+            The value to encode
+        default : Optional[Callable[[Any], Any]]
+            Function that obtains an encodable version of a value that is not
+            natively supported. It should raise a TypeError otherwise.
+
+        Returns
+        -------
+        str
+            The JSON-formatted string
+        """
+        try:
+            return orjson.dumps(obj, default=default, option=self._options).decode()
+        except orjson.JSONEncodeError:
+            # let the stdlib either encode the value, or raise its own error
+            return super().dumps(obj, default)
+
+    def loads(self, s: Union[str, bytes],
+              object_hook: Optional[Callable[[dict], Any]] = None) -> Any:
+        """Decode a JSON-formatted string.
+
+        Parameters
+        ----------
+        s : Union[str, bytes]
+            The JSON-formatted string
+        object_hook : Optional[Callable[[dict], Any]]
+            Function that transforms every decoded JSON object
+
+        Returns
+        -------
+        Any
+            The decoded value
+        """
+        if object_hook is not None:
+            return super().loads(s, object_hook)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # let the stdlib either decode the value, or raise its own error
+            return super().loads(s)
+
+
+_CODECS = {JsonCodec.name: JsonCodec, OrjsonCodec.name: OrjsonCodec}
+
+
+def _get_default_codec() -> JsonCodec:
+    codec_name = os.environ.get(JSON_CODEC_ENVIRONMENT_VARIABLE)
+    return _create_codec(codec_name) if codec_name else JsonCodec()
+
+
+def _create_codec(codec_name: str) -> JsonCodec:
+    try:
+        codec_type = _CODECS[codec_name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec '{codec_name}'. "
+                         f"Supported codecs are: {', '.join(_CODECS)}.")
+    return codec_type()
+
+
+_codec: JsonCodec = _get_default_codec()
+
+
+def get_codec() -> JsonCodec:
+    """Get the active JSON codec.
+
+    Returns
+    -------
+    JsonCodec
+        The codec used by `dumps` and `loads`
+    """
+    return _codec
+
+
+def set_codec(codec: Union[JsonCodec, str]):
+    """Set the active JSON codec.
+
+    Parameters
+    ----------
+    codec : Union[JsonCodec, str]
+        The codec, or the name of a built-in codec: "json" or "orjson"
+    """
+    global _codec
+    _codec = _create_codec(codec) if isinstance(codec, str) else codec
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Encode a value as a JSON-formatted string, via the active codec.
+
+    Parameters
+    ----------
+    obj : Any
+        The value to encode
+    default : Optional[Callable[[Any], Any]]
+        Function that obtains an encodable version of a value that is not
+        natively supported. It should raise a TypeError otherwise.
+
+    Returns
+    -------
+    str
+        The JSON-formatted string
+    """
+    return _codec.dumps(obj, default)
+
+
+def loads(s: Union[str, bytes], object_hook: Optional[Callable[[dict], Any]] = None) -> Any:
+    """Decode a JSON-formatted string, via the active codec.
+
+    Parameters
+    ----------
+    s : Union[str, bytes]
+        The JSON-formatted string
+    object_hook : Optional[Callable[[dict], Any]]
+        Function that transforms every decoded JSON object
+
+    Returns
+    -------
+    Any
+        The decoded value
+    """
+    return _codec.loads(s, object_hook)
+
+
+def loads_custom_objects(s: Union[str, bytes]) -> Any:
+    """Decode a JSON-formatted string that may encode custom objects, via the active codec.
+
+    Decoding custom objects calls back into Python for every JSON object of the payload.
+    Payloads that do not contain the keys marking custom objects, as found by a substring
+    search, are therefore decoded without doing so.
+
+    Parameters
+    ----------
+    s : Union[str, bytes]
+        The JSON-formatted string
+
+    Returns
+    -------
+    Any
+        The decoded value, including its custom objects
+    """
+    markers = _CUSTOM_OBJECT_MARKERS if isinstance(s, str) else _CUSTOM_OBJECT_MARKERS_BYTES
+    if any(marker in s for marker in markers):
+        return _codec.loads(s, deserialize_custom_object)
+    return _codec.loads(s)
+
+
+def join_array(fragments: Iterable[str]) -> str:
+    """Assemble a JSON array from its already encoded items, via the active codec.
+
+    Parameters
+    ----------
+    fragments : Iterable[str]
+        The JSON-formatted items, in order
+
+    Returns
+    -------
+    str
+        The JSON-formatted array
+    """
+    return _codec.join_array(fragments)
+
+
+def join_object(members: Iterable[Tuple[str, str]]) -> str:
+    """Assemble a JSON object from its keys and already encoded values, via the active codec.
+
+    Parameters
+    ----------
+    members : Iterable[Tuple[str, str]]
+        The keys and their JSON-formatted values, in order
+
+    Returns
+    -------
+    str
+        The JSON-formatted object
+    """
+    return _codec.join_object(members)
@@ -0,0 +1,49 @@
+from typing import Any, Generator, List, Sequence
+
+
+def split_into_partitions(inputs: Sequence[Any], partition_size: int) -> List[Sequence[Any]]:
+    """Split inputs into at most `partition_size` contiguous partitions.
+
+    Partitions are as small as possible, while being a power of `partition_size` in size,
+    so that each of them can in turn be split into at most `partition_size` partitions,
+    and so on, until there are at most `partition_size` inputs in a partition.
+
+    Parameters
+    ----------
+    inputs : Sequence[Any]
+        The inputs to split
+    partition_size : int
+        The maximum number of partitions, and of inputs in the smallest partitions
+
+    Returns
+    -------
+    List[Sequence[Any]]
+        The partitions, in order
+    """
+    size = partition_size
+    while size * partition_size < len(inputs):
+        size *= partition_size
+    return [inputs[start:start + size] for start in range(0, len(inputs), size)]
+
+
+def partition_orchestrator(context) -> Generator[Any, Any, List[Any]]:
+    """Orchestrate the activities of a partition of `call_activity_partitioned`.
+
+    This is the built-in orchestrator named `PARTITION_ORCHESTRATOR_NAME`, which `DFApp`
+    registers automatically, via `register_partition_orchestrator`.
+
+    Parameters
+    ----------
+    context : DurableOrchestrationContext
+        The context of the partition, whose input names the activity, the inputs
+        of the partition and the partition size
+
+    Returns
+    -------
+    List[Any]
+        The results of the activities, in the order of their inputs
+    """
+    partition = context.get_input()
+    results = yield context.call_activity_partitioned(
+        partition["name"], partition["inputs"], partition["partitionSize"])
+    return results
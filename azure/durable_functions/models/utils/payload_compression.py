@@ -0,0 +1,279 @@
+"""Compression of large payloads, inside the JSON the durable extension expects.
+
+When a compressor is set, activity and sub-orchestrator inputs, activity and orchestration
+outputs, custom statuses and entity states whose JSON encoding is at least the
+compressor's `threshold` characters long are compressed. They are replaced by a JSON
+object carrying the name of the compression algorithm and the base64-encoded compressed
+payload. Such objects are decompressed automatically when they are decoded, whether or
+not a compressor is set.
+
+Compression is disabled by default. It can be enabled via `set_compressor`, via
+`DFApp(payload_compressor=...)`, or via the `DURABLE_FUNCTIONS_PAYLOAD_COMPRESSION`
+environment variable naming a built-in compressor: "zlib" or "zstd". The latter requires
+the optional `zstandard` package.
+"""
+import base64
+import os
+import zlib
+from typing import Any, Callable, Dict, Optional, Union
+
+from . import json_codec
+from .type_codecs import serialize_custom_object
+
+try:
+    import zstandard
+except ImportError:  # zstandard is an optional dependency
+    zstandard = None
+
+PAYLOAD_COMPRESSION_ENVIRONMENT_VARIABLE = "DURABLE_FUNCTIONS_PAYLOAD_COMPRESSION"
+# The size, in characters, from which payloads are compressed by default
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+# The keys of the JSON object that replaces a compressed payload
+COMPRESSION_KEY = "$durableCompression"
+DATA_KEY = "data"
+
+
+class PayloadCompressor:
+    """Compresses payloads via zlib."""
+
+    name = "zlib"
+
+    def __init__(self, threshold: int = DEFAULT_COMPRESSION_THRESHOLD, level: int = 6):
+        """Create a compressor.
+
+        Parameters
+        ----------
+        threshold : int
+            The size, in characters, from which payloads are compressed
+        level : int
+            The compression level, from 0 (none) to 9 (best)
+        """
+        if threshold < 1:
+            raise ValueError(f"threshold must be positive, but was {threshold}.")
+        self.threshold: int = threshold
+        self.level: int = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data.
+
+        Parameters
+        ----------
+        data : bytes
+            The data to compress
+
+        Returns
+        -------
+        bytes
+            The compressed data
+        """
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data.
+
+        Parameters
+        ----------
+        data : bytes
+            The compressed data
+
+        Returns
+        -------
+        bytes
+            The decompressed data
+        """
+        return zlib.decompress(data)
+
+
+class ZstdPayloadCompressor(PayloadCompressor):
+    """Compresses payloads via Zstandard, which is faster than zlib at similar ratios."""
+
+    name = "zstd"
+
+    def __init__(self, threshold: int = DEFAULT_COMPRESSION_THRESHOLD, level: int = 3):
+        """Create a compressor based on `zstandard`, which must be installed.
+
+        Parameters
+        ----------
+        threshold : int
+            The size, in characters, from which payloads are compressed
+        level : int
+            The compression level, from 1 (fastest) to 22 (best)
+        """
+        if zstandard is None:
+            raise ImportError("The 'zstandard' package is required to use the zstd compressor.")
+        super().__init__(threshold, level)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data.
+
+        Parameters
+        ----------
+        data : bytes
+            The data to compress
+
+        Returns
+        -------
+        bytes
+            The compressed data
+        """
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data.
+
+        Parameters
+        ----------
+        data : bytes
+            The compressed data
+
+        Returns
+        -------
+        bytes
+            The decompressed data
+        """
+        return self._decompressor.decompress(data)
+
+
+_COMPRESSORS = {PayloadCompressor.name: PayloadCompressor,
+                ZstdPayloadCompressor.name: ZstdPayloadCompressor}
+# the compressors decompressing payloads, by name, created when first needed
+_decompressors: Dict[str, PayloadCompressor] = {}
+
+
+def _create_compressor(compressor_name: str) -> PayloadCompressor:
+    try:
+        compressor_type = _COMPRESSORS[compressor_name]
+    except KeyError:
+        raise ValueError(f"Unknown payload compressor '{compressor_name}'. "
+                         f"Supported compressors are: {', '.join(_COMPRESSORS)}.")
+    return compressor_type()
+
+
+def _get_default_compressor() -> Optional[PayloadCompressor]:
+    compressor_name = os.environ.get(PAYLOAD_COMPRESSION_ENVIRONMENT_VARIABLE)
+    return _create_compressor(compressor_name) if compressor_name else None
+
+
+_compressor: Optional[PayloadCompressor] = _get_default_compressor()
+
+
+def get_compressor() -> Optional[PayloadCompressor]:
+    """Get the active payload compressor.
+
+    Returns
+    -------
+    Optional[PayloadCompressor]
+        The compressor of large payloads, or None if payloads are not compressed
+    """
+    return _compressor
+
+
+def set_compressor(compressor: Optional[Union[PayloadCompressor, str]]):
+    """Set the active payload compressor.
+
+    Parameters
+    ----------
+    compressor : Optional[Union[PayloadCompressor, str]]
+        The compressor, the name of a built-in compressor: "zlib" or "zstd",
+        or None to stop compressing payloads
+    """
+    global _compressor
+    _compressor = _create_compressor(compressor) if isinstance(compressor, str) else compressor
+
+
+def compress(json_string: str) -> str:
+    """Compress a JSON-formatted payload via the active compressor, if it is large enough.
+
+    Parameters
+    ----------
+    json_string : str
+        The JSON-formatted payload
+
+    Returns
+    -------
+    str
+        The JSON-formatted compressed payload, or the payload itself
+    """
+    compressor = _compressor
+    if compressor is None or len(json_string) < compressor.threshold:
+        return json_string
+    compressed = _compress(compressor, json_string)
+    if compressed is None:
+        return json_string
+    return json_codec.dumps(compressed)
+
+
+def compress_value(value: Any) -> Any:
+    """Compress a value via the active compressor, if its JSON encoding is large enough.
+
+    Parameters
+    ----------
+    value : Any
+        The JSON-serializable value
+
+    Returns
+    -------
+    Any
+        The compressed value, or the value itself
+    """
+    compressor = _compressor
+    if compressor is None or value is None or isinstance(value, (bool, int, float)):
+        return value
+    json_string = json_codec.dumps(value, default=serialize_custom_object)
+    if len(json_string) < compressor.threshold:
+        return value
+    compressed = _compress(compressor, json_string)
+    return value if compressed is None else compressed
+
+
+def is_compressed(value: Any) -> bool:
+    """Determine if a decoded value is a compressed payload.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded value
+
+    Returns
+    -------
+    bool
+        True if the value is a compressed payload
+    """
+    return type(value) is dict and len(value) == 2 and COMPRESSION_KEY in value \
+        and DATA_KEY in value
+
+
+def decompress(value: Any, object_hook: Optional[Callable[[dict], Any]] = None) -> Any:
+    """Decompress and decode a decoded value, if it is a compressed payload.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded value
+    object_hook : Optional[Callable[[dict], Any]]
+        Function that transforms every decoded JSON object of the payload
+
+    Returns
+    -------
+    Any
+        The decompressed payload, or the value itself if it is not compressed
+    """
+    if not is_compressed(value):
+        return value
+    compressor_name = value[COMPRESSION_KEY]
+    compressor = _decompressors.get(compressor_name)
+    if compressor is None:
+        compressor = _create_compressor(compressor_name)
+        _decompressors[compressor_name] = compressor
+    data = compressor.decompress(base64.b64decode(value[DATA_KEY]))
+    return json_codec.loads(data, object_hook)
+
+
+def _compress(compressor: PayloadCompressor, json_string: str) -> Optional[dict]:
+    data = base64.b64encode(compressor.compress(json_string.encode())).decode("ascii")
+    # payloads that do not compress well are left as they are
+    if len(data) >= len(json_string):
+        return None
+    return {COMPRESSION_KEY: compressor.name, DATA_KEY: data}
@@ -0,0 +1,287 @@
+"""Binary encoding of payloads, inside the JSON the durable extension expects.
+
+When a binary format is set, activity, sub-orchestrator and entity operation inputs,
+activity and orchestration outputs, and entity states are encoded in that format rather
+than as JSON. Binary formats encode numbers compactly, and `bytes`, `bytearray` and
+`memoryview` values natively. Encoded payloads are replaced by a JSON object carrying
+the name of the format and the base64-encoded payload. Such objects are decoded
+automatically, whether or not a binary format is set.
+
+Binary formats are disabled by default. They can be enabled via `set_binary_format`,
+via `DFApp(payload_format=...)`, or via the `DURABLE_FUNCTIONS_PAYLOAD_FORMAT`
+environment variable naming a built-in format: "msgpack" or "cbor". These require the
+optional `msgpack` and `cbor2` packages, respectively.
+"""
+import base64
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+
+from .type_codecs import deserialize_custom_object, serialize_custom_object
+
+try:
+    import msgpack
+except ImportError:  # msgpack is an optional dependency
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # cbor2 is an optional dependency
+    cbor2 = None
+
+PAYLOAD_FORMAT_ENVIRONMENT_VARIABLE = "DURABLE_FUNCTIONS_PAYLOAD_FORMAT"
+# The keys of the JSON object that replaces a binary payload
+FORMAT_KEY = "$durableFormat"
+DATA_KEY = "data"
+
+
+class BinaryFormat(ABC):
+    """Encodes and decodes values in a binary format."""
+
+    name = ""
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode a value.
+
+        Parameters
+        ----------
+        value : Any
+            The value to encode
+
+        Returns
+        -------
+        bytes
+            The encoded value
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode a value.
+
+        Parameters
+        ----------
+        data : bytes
+            The encoded value
+
+        Returns
+        -------
+        Any
+            The decoded value
+        """
+        pass
+
+
+class MsgpackFormat(BinaryFormat):
+    """Encodes and decodes values as MessagePack, via `msgpack`."""
+
+    name = "msgpack"
+
+    def __init__(self):
+        """Create a format based on `msgpack`, which must be installed."""
+        if msgpack is None:
+            raise ImportError("The 'msgpack' package is required to use the msgpack format.")
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value.
+
+        Parameters
+        ----------
+        value : Any
+            The value to encode
+
+        Returns
+        -------
+        bytes
+            The encoded value
+        """
+        # msgpack writes the buffers of bytes-like objects, including memoryviews, as is
+        return msgpack.packb(value, default=serialize_custom_object, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a value.
+
+        Parameters
+        ----------
+        data : bytes
+            The encoded value
+
+        Returns
+        -------
+        Any
+            The decoded value
+        """
+        return msgpack.unpackb(data, raw=False, strict_map_key=False,
+                               object_hook=deserialize_custom_object)
+
+
+def _encode_cbor_memoryview(encoder: Any, value: memoryview):
+    # write the buffer as a byte string, rather than as an array of its items
+    encoder.encode_length(2, value.nbytes)
+    encoder.write(value.cast("B"))
+
+
+def _encode_cbor_custom_object(encoder: Any, value: Any):
+    encoder.encode(serialize_custom_object(value))
+
+
+def _decode_custom_objects(value: Any) -> Any:
+    # cbor2 versions disagree on the arguments of `object_hook`, so objects are decoded
+    # after the fact, innermost first, as an object hook would
+    if type(value) is list:
+        return [_decode_custom_objects(item) for item in value]
+    if type(value) is dict:
+        return deserialize_custom_object(
+            {key: _decode_custom_objects(item) for key, item in value.items()})
+    return value
+
+
+class CborFormat(BinaryFormat):
+    """Encodes and decodes values as CBOR, via `cbor2`."""
+
+    name = "cbor"
+
+    def __init__(self):
+        """Create a format based on `cbor2`, which must be installed."""
+        if cbor2 is None:
+            raise ImportError("The 'cbor2' package is required to use the cbor format.")
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value.
+
+        Parameters
+        ----------
+        value : Any
+            The value to encode
+
+        Returns
+        -------
+        bytes
+            The encoded value
+        """
+        return cbor2.dumps(value, default=_encode_cbor_custom_object,
+                           encoders={memoryview: _encode_cbor_memoryview})
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a value.
+
+        Parameters
+        ----------
+        data : bytes
+            The encoded value
+
+        Returns
+        -------
+        Any
+            The decoded value
+        """
+        return _decode_custom_objects(cbor2.loads(data))
+
+
+_FORMATS = {MsgpackFormat.name: MsgpackFormat, CborFormat.name: CborFormat}
+# the formats decoding payloads, by name, created when first needed
+_decoders: Dict[str, BinaryFormat] = {}
+
+
+def _create_format(format_name: str) -> BinaryFormat:
+    try:
+        format_type = _FORMATS[format_name]
+    except KeyError:
+        raise ValueError(f"Unknown payload format '{format_name}'. "
+                         f"Supported formats are: {', '.join(_FORMATS)}.")
+    return format_type()
+
+
+def _get_default_format() -> Optional[BinaryFormat]:
+    format_name = os.environ.get(PAYLOAD_FORMAT_ENVIRONMENT_VARIABLE)
+    return _create_format(format_name) if format_name else None
+
+
+_format: Optional[BinaryFormat] = _get_default_format()
+
+
+def get_binary_format() -> Optional[BinaryFormat]:
+    """Get the active binary format.
+
+    Returns
+    -------
+    Optional[BinaryFormat]
+        The binary format of payloads, or None if payloads are encoded as JSON
+    """
+    return _format
+
+
+def set_binary_format(binary_format: Optional[Union[BinaryFormat, str]]):
+    """Set the active binary format.
+
+    Parameters
+    ----------
+    binary_format : Optional[Union[BinaryFormat, str]]
+        The binary format, the name of a built-in format: "msgpack" or "cbor",
+        or None to encode payloads as JSON
+    """
+    global _format
+    _format = _create_format(binary_format) if isinstance(binary_format, str) \
+        else binary_format
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a value via the active binary format, if any.
+
+    Parameters
+    ----------
+    value : Any
+        The value to encode
+
+    Returns
+    -------
+    Any
+        The JSON object carrying the encoded value, or the value itself. Strings and
+        numbers are left as they are, as JSON encodes them compactly already.
+    """
+    binary_format = _format
+    if binary_format is None or value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    data = base64.b64encode(binary_format.encode(value)).decode("ascii")
+    return {FORMAT_KEY: binary_format.name, DATA_KEY: data}
+
+
+def is_encoded(value: Any) -> bool:
+    """Determine if a decoded JSON value carries a value encoded in a binary format.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded JSON value
+
+    Returns
+    -------
+    bool
+        True if the value carries a binary-encoded value
+    """
+    return type(value) is dict and len(value) == 2 and FORMAT_KEY in value \
+        and DATA_KEY in value
+
+
+def decode_value(value: Any) -> Any:
+    """Decode the value a decoded JSON value carries, if it is binary-encoded.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded JSON value
+
+    Returns
+    -------
+    Any
+        The decoded binary-encoded value, or the value itself
+    """
+    if not is_encoded(value):
+        return value
+    format_name = value[FORMAT_KEY]
+    binary_format = _decoders.get(format_name)
+    if binary_format is None:
+        binary_format = _create_format(format_name)
+        _decoders[format_name] = binary_format
+    return binary_format.decode(base64.b64decode(value[DATA_KEY]))
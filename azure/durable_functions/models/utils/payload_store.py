@@ -0,0 +1,268 @@
+"""Offloading of large payloads to a payload store, following the claim-check pattern.
+
+When a payload store is set, activity inputs, activity outputs and orchestration outputs
+whose JSON encoding is at least `get_offload_threshold()` characters long are written to
+the store. They are replaced by a small reference, which is resolved when the value is
+consumed. Offloading is disabled by default. It can be enabled via `set_payload_store`,
+or for the file-based store via the `DURABLE_FUNCTIONS_PAYLOAD_STORE_DIRECTORY`
+environment variable. All workers of an app must be able to read the same store.
+"""
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from . import json_codec
+from .type_codecs import serialize_custom_object
+
+PAYLOAD_STORE_DIRECTORY_ENVIRONMENT_VARIABLE = "DURABLE_FUNCTIONS_PAYLOAD_STORE_DIRECTORY"
+# The size, in characters, from which payloads are offloaded by default. Payloads of
+# the durable extension above 45 KB are compressed into blobs by the extension itself.
+DEFAULT_OFFLOAD_THRESHOLD = 45 * 1024
+# The key of the JSON object that replaces an offloaded payload
+REFERENCE_KEY = "$durablePayloadRef"
+
+
+class PayloadStore(ABC):
+    """Stores offloaded payloads by key.
+
+    Keys are derived from the content of their payload, so a key is always stored
+    with the same payload and a payload may be stored again, e.g. during replay.
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        """Store a payload.
+
+        Parameters
+        ----------
+        key : str
+            The key of the payload
+        data : bytes
+            The UTF-8 encoded, JSON-formatted payload
+        """
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Load a payload.
+
+        Parameters
+        ----------
+        key : str
+            The key of the payload
+
+        Returns
+        -------
+        bytes
+            The UTF-8 encoded, JSON-formatted payload
+        """
+        pass
+
+
+class FilePayloadStore(PayloadStore):
+    """Stores payloads as files of a directory.
+
+    The directory may be shared by workers, e.g. via a mounted file share. Payloads are
+    written to uniquely named temporary files first, which are then renamed, so that
+    concurrent writers, whether processes or threads, never expose partial payloads.
+    """
+
+    def __init__(self, directory: str):
+        """Create a store of the files in a directory, creating it if needed.
+
+        Parameters
+        ----------
+        directory : str
+            The directory containing the payloads
+        """
+        self.directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, key: str, data: bytes):
+        """Store a payload, unless it was stored before.
+
+        Parameters
+        ----------
+        key : str
+            The key of the payload
+        data : bytes
+            The UTF-8 encoded, JSON-formatted payload
+        """
+        path = self._get_path(key)
+        if os.path.exists(path):
+            return
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        """Load a payload.
+
+        Parameters
+        ----------
+        key : str
+            The key of the payload
+
+        Returns
+        -------
+        bytes
+            The UTF-8 encoded, JSON-formatted payload
+        """
+        with open(self._get_path(key), "rb") as file:
+            return file.read()
+
+    def _get_path(self, key: str) -> str:
+        if not key or os.path.basename(key) != key or key.startswith("."):
+            raise ValueError(f"Invalid payload key '{key}'.")
+        return os.path.join(self.directory, key)
+
+
+def _get_default_payload_store() -> Optional[PayloadStore]:
+    directory = os.environ.get(PAYLOAD_STORE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    return FilePayloadStore(directory) if directory else None
+
+
+_payload_store: Optional[PayloadStore] = _get_default_payload_store()
+_offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD
+
+
+def get_payload_store() -> Optional[PayloadStore]:
+    """Get the active payload store.
+
+    Returns
+    -------
+    Optional[PayloadStore]
+        The store of offloaded payloads, or None if payloads are not offloaded
+    """
+    return _payload_store
+
+
+def get_offload_threshold() -> int:
+    """Get the size, in characters, from which payloads are offloaded.
+
+    Returns
+    -------
+    int
+        The offload threshold
+    """
+    return _offload_threshold
+
+
+def set_payload_store(store: Optional[PayloadStore],
+                      offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD):
+    """Set the active payload store.
+
+    Parameters
+    ----------
+    store : Optional[PayloadStore]
+        The store of offloaded payloads, or None to stop offloading payloads.
+        Previously offloaded payloads can then no longer be resolved.
+    offload_threshold : int
+        The size, in characters, from which payloads are offloaded
+    """
+    global _payload_store, _offload_threshold
+    if offload_threshold < 1:
+        raise ValueError(f"offload_threshold must be positive, but was {offload_threshold}.")
+    _payload_store = store
+    _offload_threshold = offload_threshold
+
+
+def offload(json_string: str) -> str:
+    """Offload a JSON-formatted payload to the active store, if it is large enough.
+
+    Parameters
+    ----------
+    json_string : str
+        The JSON-formatted payload
+
+    Returns
+    -------
+    str
+        The JSON-formatted reference to the offloaded payload, or the payload itself
+    """
+    store = _payload_store
+    if store is None or len(json_string) < _offload_threshold:
+        return json_string
+    return json_codec.dumps(_put(store, json_string))
+
+
+def offload_value(value: Any) -> Any:
+    """Offload a value to the active store, if its JSON encoding is large enough.
+
+    Parameters
+    ----------
+    value : Any
+        The JSON-serializable value
+
+    Returns
+    -------
+    Any
+        The reference to the offloaded value, or the value itself
+    """
+    store = _payload_store
+    if store is None or value is None or isinstance(value, (bool, int, float)):
+        return value
+    json_string = json_codec.dumps(value, default=serialize_custom_object)
+    if len(json_string) < _offload_threshold:
+        return value
+    return _put(store, json_string)
+
+
+def is_reference(value: Any) -> bool:
+    """Determine if a decoded value is a reference to an offloaded payload.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded value
+
+    Returns
+    -------
+    bool
+        True if the value is a reference
+    """
+    return type(value) is dict and len(value) == 1 and REFERENCE_KEY in value
+
+
+def resolve(value: Any, object_hook: Optional[Callable[[dict], Any]] = None) -> Any:
+    """Load and decode the payload a decoded value refers to, if it is a reference.
+
+    Parameters
+    ----------
+    value : Any
+        The decoded value
+    object_hook : Optional[Callable[[dict], Any]]
+        Function that transforms every decoded JSON object of the payload
+
+    Returns
+    -------
+    Any
+        The decoded payload, or the value itself if it is not a reference
+
+    Raises
+    ------
+    ValueError
+        When the value is a reference, but no payload store is set
+    """
+    if not is_reference(value):
+        return value
+    store = _payload_store
+    if store is None:
+        raise ValueError("Cannot resolve the offloaded payload "
+                         f"'{value[REFERENCE_KEY]}', as no payload store is set.")
+    return json_codec.loads(store.get(value[REFERENCE_KEY]), object_hook)
+
+
+def _put(store: PayloadStore, json_string: str) -> dict:
+    data = json_string.encode()
+    key = hashlib.sha256(data).hexdigest()
+    store.put(key, data)
+    return {REFERENCE_KEY: key}
@@ -0,0 +1,228 @@
+"""Encoding and decoding of custom objects in JSON payloads.
+
+Custom objects are encoded as JSON objects marked with the name of their type, and decoded
+back into instances of that type. The codec of a type is resolved once, and cached:
+
+- types registered via `register_codec` use the registered functions,
+- dataclasses and NamedTuples are encoded as the values of their fields,
+- other types must follow the `to_json` and `from_json` convention of
+  `azure.functions._durable_functions`, whose JSON objects are decoded as well.
+
+Only the names of types known to this worker are decoded: types that are registered, that
+were encoded, or that annotate an activity's input. JSON objects marked with other names are
+left as they are, rather than importing the modules they name.
+
+Tuples, NamedTuples included, are encoded as JSON arrays by every JSON codec and binary
+format, as the stdlib encodes them. Like the values of other types with a codec, such arrays
+are decoded by the annotation of an activity's input.
+"""
+import inspect
+import typing
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from azure.functions._durable_functions import _serialize_custom_object
+
+try:
+    import dataclasses
+except ImportError:  # dataclasses require Python 3.7
+    dataclasses = None
+
+# The keys of the JSON objects encoding instances of types with a codec
+TYPE_KEY = "$durableType"
+DATA_KEY = "data"
+
+
+class TypeCodec(NamedTuple):
+    """The functions encoding and decoding instances of a type."""
+
+    name: str
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+
+
+# the codec of every type resolved so far, or None for types without codec
+_codecs_by_type: Dict[type, Optional[TypeCodec]] = {}
+_codecs_by_name: Dict[str, TypeCodec] = {}
+
+
+def _get_type_name(type_: type) -> str:
+    return f"{type_.__module__}:{type_.__qualname__}"
+
+
+def register_codec(type_: type, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+    """Register the functions encoding and decoding instances of a type.
+
+    Registered codecs take precedence over the `to_json` and `from_json` methods of a type,
+    and over the built-in codecs of dataclasses and NamedTuples. Instances of the type are
+    decoded where the type is registered, and wherever the type can be imported from.
+    Instances of tuple sub-classes are always encoded as JSON arrays, so their codecs only
+    decode values by annotation.
+
+    Parameters
+    ----------
+    type_ : type
+        The type whose instances are encoded and decoded
+    encode : Callable[[Any], Any]
+        Function that converts an instance into a JSON-serializable value
+    decode : Callable[[Any], Any]
+        Function that converts a value returned by `encode` back into an instance
+    """
+    codec = TypeCodec(_get_type_name(type_), encode, decode)
+    _codecs_by_type[type_] = codec
+    _codecs_by_name[codec.name] = codec
+
+
+def _is_named_tuple(type_: type) -> bool:
+    return isinstance(type_, type) and issubclass(type_, tuple) and hasattr(type_, "_fields")
+
+
+def _create_codec(type_: type) -> Optional[TypeCodec]:
+    if dataclasses is not None and isinstance(type_, type) and dataclasses.is_dataclass(type_):
+        # fields that are not arguments of __init__ are left to __post_init__
+        field_names = [field.name for field in dataclasses.fields(type_) if field.init]
+        return TypeCodec(
+            _get_type_name(type_),
+            lambda obj: {name: getattr(obj, name) for name in field_names},
+            lambda data: type_(**data))
+    if _is_named_tuple(type_):
+        return TypeCodec(_get_type_name(type_), list, lambda data: type_(*data))
+    return None
+
+
+def get_type_codec(type_: type) -> Optional[TypeCodec]:
+    """Get the codec of a type.
+
+    Parameters
+    ----------
+    type_ : type
+        The type whose instances are encoded and decoded
+
+    Returns
+    -------
+    Optional[TypeCodec]
+        The registered or built-in codec of the type, or None if it has none
+    """
+    try:
+        return _codecs_by_type[type_]
+    except KeyError:
+        codec = _create_codec(type_)
+        _codecs_by_type[type_] = codec
+        if codec is not None:
+            _codecs_by_name.setdefault(codec.name, codec)
+        return codec
+
+
+@lru_cache(maxsize=None)
+def _import_type(module_name: str, qualified_name: str) -> Any:
+    type_ = import_module(module_name)
+    for name in qualified_name.split("."):
+        type_ = getattr(type_, name)
+    return type_
+
+
+def _is_custom_object(value: Any) -> bool:
+    return type(value) is dict and len(value) == 2 and TYPE_KEY in value and DATA_KEY in value
+
+
+def serialize_custom_object(obj: Any) -> Any:
+    """Encode a custom object into a JSON-serializable value.
+
+    To be passed as the `default` of JSON encoders.
+
+    Parameters
+    ----------
+    obj : Any
+        The custom object
+
+    Returns
+    -------
+    Any
+        A JSON object marked with the type of the object, or the items of a tuple
+
+    Raises
+    ------
+    TypeError
+        If the type of the object has no codec, nor a `to_json` method
+    """
+    if isinstance(obj, tuple):
+        # the stdlib encodes NamedTuples as arrays, without calling `default`
+        return list(obj)
+    codec = get_type_codec(type(obj))
+    if codec is None:
+        return _serialize_custom_object(obj)
+    return {TYPE_KEY: codec.name, DATA_KEY: codec.encode(obj)}
+
+
+def deserialize_custom_object(obj: dict) -> Any:
+    """Decode a JSON object, if it encodes a custom object.
+
+    To be passed as the `object_hook` of JSON decoders.
+
+    Parameters
+    ----------
+    obj : dict
+        The decoded JSON object
+
+    Returns
+    -------
+    Any
+        The custom object, or the JSON object itself if it does not encode one, or if
+        the type of the custom object is not known to this worker
+
+    Raises
+    ------
+    TypeError
+        If the class of an object following the `to_json` convention has no
+        `from_json` method
+    """
+    if _is_custom_object(obj):
+        codec = _codecs_by_name.get(obj[TYPE_KEY])
+        return obj if codec is None else codec.decode(obj[DATA_KEY])
+    if "__class__" in obj and "__module__" in obj and "__data__" in obj:
+        # the encoding of `_serialize_custom_object`
+        class_ = _import_type(obj["__module__"], obj["__class__"])
+        if not hasattr(class_, "from_json"):
+            raise TypeError(f"class {class_} does not expose a `from_json` function")
+        return class_.from_json(obj["__data__"])
+    return obj
+
+
+def get_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Get the function converting decoded values into instances of an annotated type.
+
+    Parameters
+    ----------
+    annotation : Any
+        The annotation of a value, e.g. of an activity's input
+
+    Returns
+    -------
+    Optional[Callable[[Any], Any]]
+        The converter, or None if values of the annotated type need no conversion.
+        Lists are converted item by item.
+    """
+    # `typing.get_origin` and `typing.get_args` require Python 3.8
+    if getattr(annotation, "__origin__", None) in (list, typing.List):
+        arguments = getattr(annotation, "__args__", None)
+        item_converter = get_converter(arguments[0]) if arguments else None
+        if item_converter is None:
+            return None
+        return lambda value: value if value is None else [item_converter(item) for item in value]
+
+    if not isinstance(annotation, type) or annotation is inspect.Parameter.empty:
+        return None
+    # resolving the codec also makes the name of the annotated type known to this worker
+    codec = get_type_codec(annotation)
+    if codec is None:
+        return None
+
+    def convert(value: Any) -> Any:
+        if value is None or isinstance(value, annotation):
+            return value
+        if _is_custom_object(value):
+            return deserialize_custom_object(value)
+        return codec.decode(value)
+
+    return convert
@@ -3,10 +3,15 @@
 Responsible for orchestrating the execution of the user defined generator
 function.
 """
+import warnings
 from azure.durable_functions.models.TaskOrchestrationExecutor import TaskOrchestrationExecutor
-from typing import Callable, Any, Generator
+from time import perf_counter
+from typing import Callable, Any, Generator, Optional
 
 from .models import DurableOrchestrationContext
+from .models.OrchestrationMetrics import OrchestrationMetrics
+from .models.ReplayCache import ReplayCache, ReplayCacheEntry
+from .models.history import HistoryEventCache
 
 import azure.functions as func
 
@@ -19,15 +24,25 @@ class Orchestrator:
     """
 
     def __init__(self,
-                 activity_func: Callable[[DurableOrchestrationContext], Generator[Any, Any, Any]]):
+                 activity_func: Callable[[DurableOrchestrationContext], Generator[Any, Any, Any]],
+                 replay_cache: Optional[ReplayCache] = None,
+                 metrics_callback: Optional[Callable[[OrchestrationMetrics], None]] = None,
+                 deduplicate_inputs: bool = False):
         """Create a new orchestrator for the user defined generator.
 
         Responsible for orchestrating the execution of the user defined
         generator function.
         :param activity_func: Generator function to orchestrate.
+        :param replay_cache: Optional cache of suspended orchestration instances.
+        :param metrics_callback: Optional callback receiving the metrics of each invocation.
+        :param deduplicate_inputs: Whether to encode each input object only once per invocation.
         """
         self.fn: Callable[[DurableOrchestrationContext], Generator[Any, Any, Any]] = activity_func
         self.task_orchestration_executor = TaskOrchestrationExecutor()
+        self.replay_cache: Optional[ReplayCache] = replay_cache
+        self.metrics_callback: Optional[Callable[[OrchestrationMetrics], None]] = \
+            metrics_callback
+        self.deduplicate_inputs: bool = deduplicate_inputs
 
     def handle(self, context: DurableOrchestrationContext) -> str:
         """Handle the orchestration of the user defined generator function.
@@ -37,6 +52,27 @@ class Orchestrator:
         context : DurableOrchestrationContext
             The DF orchestration context
 
+        Returns
+        -------
+        str
+            The JSON-formatted string representing the user's orchestration
+            state after this invocation
+        """
+        if self.metrics_callback is None:
+            return self._handle(context)
+        return self._handle_with_metrics(context, OrchestrationMetrics())
+
+    def _handle(self, context: DurableOrchestrationContext,
+                metrics: Optional[OrchestrationMetrics] = None) -> str:
+        """Handle the orchestration, collecting metrics when provided.
+
+        Parameters
+        ----------
+        context : DurableOrchestrationContext
+            The DF orchestration context
+        metrics : Optional[OrchestrationMetrics]
+            The metrics of this invocation, if collected
+
         Returns
         -------
         str
@@ -44,17 +80,115 @@ class Orchestrator:
             state after this invocation
         """
         self.durable_context = context
-        return self.task_orchestration_executor.execute(context, context.histories, self.fn)
+        context._set_input_deduplication(self.deduplicate_inputs)
+        if self.replay_cache is None:
+            executor = self.task_orchestration_executor
+            executor.metrics = metrics
+            return executor.execute(context, context.histories, self.fn)
+        return self._handle_with_replay_cache(context, self.replay_cache, metrics)
+
+    def _handle_with_metrics(self, context: DurableOrchestrationContext,
+                             metrics: OrchestrationMetrics) -> str:
+        """Handle the orchestration, and report its metrics to the metrics callback.
+
+        The metrics are reported even if the orchestration failed. Exceptions raised by
+        the metrics callback are reported as warnings.
+
+        Parameters
+        ----------
+        context : DurableOrchestrationContext
+            The DF orchestration context
+        metrics : OrchestrationMetrics
+            The metrics of this invocation, possibly including its decoding phase
+
+        Returns
+        -------
+        str
+            The JSON-formatted string representing the user's orchestration
+            state after this invocation
+        """
+        metrics.instance_id = context.instance_id
+        start = perf_counter()
+        try:
+            return self._handle(context, metrics)
+        finally:
+            # time not spent in user code or serialization is spent replaying history
+            metrics.replay_duration = (perf_counter() - start - metrics.user_code_duration
+                                       - metrics.serialize_duration)
+            try:
+                self.metrics_callback(metrics)
+            except Exception as e:
+                # metrics must not change the result of the orchestration
+                warnings.warn(f"The orchestration metrics callback failed: {e!r}")
+
+    def _handle_with_replay_cache(self, context: DurableOrchestrationContext,
+                                  replay_cache: ReplayCache,
+                                  metrics: Optional[OrchestrationMetrics] = None) -> str:
+        """Handle the orchestration, resuming a cached instance when possible.
+
+        Parameters
+        ----------
+        context : DurableOrchestrationContext
+            The DF orchestration context
+        replay_cache : ReplayCache
+            The cache of suspended orchestration instances
+        metrics : Optional[OrchestrationMetrics]
+            The metrics of this invocation, if collected
+
+        Returns
+        -------
+        str
+            The JSON-formatted string representing the user's orchestration
+            state after this invocation
+        """
+        instance_id = context.instance_id
+        history = context.histories
+        entry = replay_cache.take(instance_id, history)
+        if entry is None:
+            executor = self.task_orchestration_executor
+            executor.metrics = metrics
+            state = executor.execute(context, history, self.fn)
+        else:
+            executor = entry.executor
+            executor.metrics = metrics
+            self.task_orchestration_executor = executor
+            self.durable_context = executor.context
+            executor.context._set_input_deduplication(self.deduplicate_inputs)
+            # an exception raised here drops the instance from the cache,
+            # as it was already removed by `take`
+            state = executor.resume(context, history, entry.num_events)
+
+        if not executor.has_execution_completed:
+            replay_cache.put(instance_id, ReplayCacheEntry(executor, history))
+        return state
 
     @classmethod
-    def create(cls, fn: Callable[[DurableOrchestrationContext], Generator[Any, Any, Any]]) \
-            -> Callable[[Any], str]:
+    def create(cls, fn: Callable[[DurableOrchestrationContext], Generator[Any, Any, Any]],
+               replay_cache: Optional[ReplayCache] = None,
+               history_cache: Optional[HistoryEventCache] = None,
+               metrics_callback: Optional[Callable[[OrchestrationMetrics], None]] = None,
+               deduplicate_inputs: bool = False) -> Callable[[Any], str]:
         """Create an instance of the orchestration class.
 
         Parameters
         ----------
         fn: Callable[[DurableOrchestrationContext], Iterator[Any]]
             Generator function that needs orchestration
+        replay_cache: Optional[ReplayCache]
+            Opt-in cache of suspended orchestration instances. When provided, an instance
+            invoked again on this worker only processes its newly appended history events,
+            as long as its history did not diverge from the previously processed one.
+        history_cache: Optional[HistoryEventCache]
+            Opt-in cache of decoded histories. When provided, an instance invoked again on
+            this worker only decodes its newly appended history events.
+        metrics_callback: Optional[Callable[[OrchestrationMetrics], None]]
+            Opt-in callback receiving the phase durations and counters of each invocation,
+            e.g. to forward them to a metrics sink. Invoked even if the orchestration failed.
+        deduplicate_inputs: bool
+            Opt-in to encode an input object only once per invocation, even if it is passed
+            to many activities or sub-orchestrators. Objects are identified by identity, so
+            an object must not be modified after it was passed as an input. Inputs can also
+            be encoded explicitly, via `EncodedInput.encode`.
 
         Returns
         -------
@@ -66,6 +200,16 @@ class Orchestrator:
             context_body = getattr(context, "body", None)
             if context_body is None:
                 context_body = context
-            return Orchestrator(fn).handle(DurableOrchestrationContext.from_json(context_body))
+            orchestrator = Orchestrator(fn, replay_cache, metrics_callback, deduplicate_inputs)
+            if metrics_callback is None:
+                return orchestrator.handle(
+                    DurableOrchestrationContext.from_json(context_body, history_cache))
+
+            metrics = OrchestrationMetrics()
+            metrics.input_size = len(context_body)
+            start = perf_counter()
+            durable_context = DurableOrchestrationContext.from_json(context_body, history_cache)
+            metrics.decode_duration = perf_counter() - start
+            return orchestrator._handle_with_metrics(durable_context, metrics)
 
         return handle
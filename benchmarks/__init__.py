@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Durable Functions Python SDK.
+
+These are not part of the test suite. Run them from the repository root, e.g.
+`python -m benchmarks.timestamp_decoding`.
+"""
@@ -0,0 +1,143 @@
+"""Cost of serializing the actions payload of orchestrations with many actions.
+
+Every invocation returns all actions scheduled so far, even though only the
+newest ones changed since the previous invocation. With the replay cache, the
+Action objects of earlier invocations are reused, and so are their cached json
+strings. For a sequential orchestration (V1, one action per episode) and a
+fan-out (V2, one compound action), reports the best-of-N time of:
+
+- full: encoding the whole `OrchestratorState.to_json()` dictionary
+- cold: `OrchestratorState.to_json_string` with freshly created actions
+- second: serializing the actions again, which encodes and caches them one by one
+- warm: `OrchestratorState.to_json_string` after scheduling one more action
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.models.actions.Action import Action
+from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
+from azure.durable_functions.models.actions.WhenAllAction import WhenAllAction
+from azure.durable_functions.models.utils import json_codec
+from azure.functions._durable_functions import _serialize_custom_object
+
+
+def sequential_actions(num_actions: int) -> List[List[Action]]:
+    """Create the actions of a sequential orchestration, one per episode.
+
+    Parameters
+    ----------
+    num_actions : int
+        The number of actions
+
+    Returns
+    -------
+    List[List[Action]]
+        The actions, per episode
+    """
+    return [[CallActivityAction("Hello", {"index": index, "city": "Seattle"})]
+            for index in range(num_actions)]
+
+
+def fan_out_actions(num_actions: int) -> List[List[Action]]:
+    """Create the actions of a fan-out, in a single compound action.
+
+    Parameters
+    ----------
+    num_actions : int
+        The number of activity actions
+
+    Returns
+    -------
+    List[List[Action]]
+        The actions, per episode
+    """
+    return [[WhenAllAction([CallActivityAction("Hello", {"index": index, "city": "Seattle"})
+                            for index in range(num_actions)])]]
+
+
+def best_time(function: Callable[[], None], repeats: int) -> float:
+    """Time a function, keeping the fastest of several runs.
+
+    Parameters
+    ----------
+    function : Callable[[], None]
+        The function to time
+    repeats : int
+        The number of runs
+
+    Returns
+    -------
+    float
+        The fastest run, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_scenario(create_actions, replay_schema: ReplaySchema, num_actions: int,
+                  repeats: int):
+    """Time serializing the actions of a scenario.
+
+    Parameters
+    ----------
+    create_actions : Callable[[int], List[List[Action]]]
+        Function creating the actions of the scenario
+    replay_schema : ReplaySchema
+        The replay schema of the orchestrator state
+    num_actions : int
+        The number of actions
+    repeats : int
+        The number of runs per measurement
+
+    Returns
+    -------
+    Tuple[float, float, float, float]
+        The full, cold, second and warm timings, in seconds
+    """
+    def create_state():
+        return OrchestratorState(is_done=False, actions=create_actions(num_actions),
+                                 output=None, replay_schema=replay_schema)
+
+    state = create_state()
+    full = best_time(
+        lambda: json_codec.dumps(state.to_json(), default=_serialize_custom_object), repeats)
+
+    cold = second = float("inf")
+    for _ in range(repeats):
+        state = create_state()
+        cold = min(cold, best_time(state.to_json_string, 1))
+        second = min(second, best_time(state.to_json_string, 1))
+
+    def schedule_and_serialize():
+        state.actions.append([CallActivityAction("Hello", "next")])
+        state.to_json_string()
+
+    warm = best_time(schedule_and_serialize, repeats)
+    return full, cold, second, warm
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"codec: {json_codec.get_codec().name}, actions: {args.actions}")
+    print(f"{'scenario':<12} {'full ms':>10} {'cold ms':>10} {'second ms':>10} {'warm ms':>10}")
+    for name, create_actions, replay_schema in [
+            ("sequential", sequential_actions, ReplaySchema.V1),
+            ("fan-out", fan_out_actions, ReplaySchema.V2)]:
+        timings = time_scenario(create_actions, replay_schema, args.actions, args.repeats)
+        print(f"{name:<12}" + "".join(f" {timing * 1e3:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
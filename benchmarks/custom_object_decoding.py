@@ -0,0 +1,142 @@
+"""Micro-benchmark of decoding task results that may encode custom objects.
+
+Compares decoding payloads via the `_deserialize_custom_object` object hook of
+`azure.functions`, which calls back into Python for every JSON object, against
+`json_codec.loads_custom_objects`, which only does so for payloads containing custom
+objects. For payloads of custom objects, compares the reflective `from_json` lookups of
+the former against the cached codecs of the latter, for `to_json` classes and dataclasses.
+"""
+import argparse
+import time
+from dataclasses import dataclass
+
+from azure.durable_functions.models.utils import json_codec
+from azure.durable_functions.models.utils.type_codecs import serialize_custom_object
+from azure.functions._durable_functions import _deserialize_custom_object, \
+    _serialize_custom_object
+
+
+class City:
+    """A custom object following the `to_json` and `from_json` convention."""
+
+    def __init__(self, index: int, name: str):
+        self.index = index
+        self.name = name
+
+    @staticmethod
+    def to_json(obj: "City") -> dict:
+        """Encode a city.
+
+        Parameters
+        ----------
+        obj : City
+            The city
+
+        Returns
+        -------
+        dict
+            The JSON-serializable fields of the city
+        """
+        return {"index": obj.index, "name": obj.name}
+
+    @staticmethod
+    def from_json(data: dict) -> "City":
+        """Decode a city.
+
+        Parameters
+        ----------
+        data : dict
+            The fields of the city, as returned by `to_json`
+
+        Returns
+        -------
+        City
+            The city
+        """
+        return City(data["index"], data["name"])
+
+
+@dataclass
+class CityRecord:
+    """A custom object encoded via the built-in codec of dataclasses."""
+
+    index: int
+    name: str
+
+
+def generate_payload(num_objects: int) -> str:
+    """Generate a payload of JSON objects without custom objects.
+
+    Parameters
+    ----------
+    num_objects : int
+        The number of objects in the payload
+
+    Returns
+    -------
+    str
+        The JSON-formatted payload
+    """
+    return json_codec.dumps([{"index": index, "city": "Seattle", "tags": {"a": 1, "b": 2}}
+                             for index in range(num_objects)])
+
+
+def time_per_call(fn, repeats: int) -> float:
+    """Time the average call of a function.
+
+    Parameters
+    ----------
+    fn : Callable[[], Any]
+        The function to time
+    repeats : int
+        The number of calls
+
+    Returns
+    -------
+    float
+        The time per call, in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = generate_payload(args.objects)
+    hook_cost = time_per_call(
+        lambda: json_codec.loads(payload, object_hook=_deserialize_custom_object), args.repeats)
+    fast_path_cost = time_per_call(
+        lambda: json_codec.loads_custom_objects(payload), args.repeats)
+
+    print(f"codec: {json_codec.get_codec().name}, objects: {args.objects}")
+    print(f"object_hook decode per payload:   {hook_cost * 1e3:8.2f} ms")
+    print(f"fast-path decode per payload:     {fast_path_cost * 1e3:8.2f} ms")
+    print(f"speedup:                          {hook_cost / fast_path_cost:8.1f}x")
+
+    legacy_payload = json_codec.dumps([City(index, "Seattle") for index in range(args.objects)],
+                                      default=_serialize_custom_object)
+    dataclass_payload = json_codec.dumps(
+        [CityRecord(index, "Seattle") for index in range(args.objects)],
+        default=serialize_custom_object)
+    reflective_cost = time_per_call(
+        lambda: json_codec.loads(legacy_payload, object_hook=_deserialize_custom_object),
+        args.repeats)
+    cached_cost = time_per_call(
+        lambda: json_codec.loads_custom_objects(legacy_payload), args.repeats)
+    dataclass_cost = time_per_call(
+        lambda: json_codec.loads_custom_objects(dataclass_payload), args.repeats)
+
+    print(f"to_json objects, reflective:      {reflective_cost * 1e3:8.2f} ms")
+    print(f"to_json objects, cached lookups:  {cached_cost * 1e3:8.2f} ms")
+    print(f"dataclasses, cached codecs:       {dataclass_cost * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
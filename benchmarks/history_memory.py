@@ -0,0 +1,113 @@
+"""Peak memory of decoding and replaying a large sequential orchestration history.
+
+Reports the `tracemalloc` peak and the process' peak RSS of a full
+`Orchestrator.handle` invocation. Run each measurement in a fresh process.
+
+Also reports the objects that are still alive after the replay, per activity. Memory grows
+linearly with the number of activities, because every activity's history events are held
+by the context, and its action is re-sent in every invocation's actions. No completed
+tasks or results should be among them.
+"""
+import argparse
+import gc
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+
+from azure.durable_functions.constants import DATETIME_STRING_FORMAT
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.history import HistoryEventType
+from azure.durable_functions.orchestrator import Orchestrator
+
+
+def sequential_orchestrator(context):
+    """Call activities one after another."""
+    num_activities = context.get_input()
+    for index in range(num_activities):
+        yield context.call_activity("Hello", index)
+
+
+def generate_context_json(num_events: int) -> str:
+    """Generate the trigger payload of `sequential_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_activities = max((num_events - 2) // 4, 1)
+    current_time = datetime(2023, 1, 1)
+    history = []
+
+    def add_event(event_type, **kwargs):
+        nonlocal current_time
+        current_time += timedelta(milliseconds=1)
+        event = {"EventType": event_type, "EventId": -1, "IsPlayed": True,
+                 "Timestamp": current_time.strftime(DATETIME_STRING_FORMAT)}
+        event.update(kwargs)
+        history.append(event)
+
+    add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+    add_event(HistoryEventType.EXECUTION_STARTED, Name="sequential", Input=str(num_activities))
+    for index in range(num_activities):
+        add_event(HistoryEventType.TASK_SCHEDULED, EventId=index, Name="Hello")
+        add_event(HistoryEventType.ORCHESTRATOR_COMPLETED)
+        add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+        add_event(HistoryEventType.TASK_COMPLETED, TaskScheduledId=index,
+                  Result=json.dumps(f"Hello {index}!"))
+    return json.dumps({"history": history, "instanceId": "benchmark", "isReplaying": True,
+                       "parentInstanceId": None, "input": str(num_activities)})
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--stream-history", choices=("auto", "yes", "no"), default="auto",
+                        help="whether to decode the history while decoding the payload")
+    args = parser.parse_args()
+    stream_history = {"auto": None, "yes": True, "no": False}[args.stream_history]
+
+    context_json = generate_context_json(args.events)
+    gc.collect()
+    baseline_objects = Counter(type(obj).__name__ for obj in gc.get_objects())
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    context = DurableOrchestrationContext.from_json(context_json, stream_history=stream_history)
+    orchestrator = Orchestrator(sequential_orchestrator)
+    orchestrator.handle(context)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_activities = context.get_input()
+    live_objects = Counter(type(obj).__name__ for obj in gc.get_objects()) - baseline_objects
+
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"history events:          {len(context.histories)}")
+    print(f"replay time:             {elapsed:8.2f} s (includes tracemalloc overhead)")
+    print(f"tracemalloc peak:        {peak / 2 ** 20:8.1f} MiB")
+    print(f"peak RSS:                {peak_rss * rss_unit / 2 ** 20:8.1f} MiB")
+    print(f"peak RSS over baseline:  {(peak_rss - baseline_rss) * rss_unit / 2 ** 20:8.1f} MiB")
+    print(f"retained per activity:   {retained / num_activities:8.0f} B")
+    print("live objects per activity after the replay:")
+    for type_name, count in live_objects.most_common():
+        if count >= num_activities / 10:
+            print(f"  {type_name:<22} {count / num_activities:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
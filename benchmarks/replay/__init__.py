@@ -0,0 +1,5 @@
+"""Replay engine benchmark suite.
+
+Generates synthetic orchestration histories of various shapes and sizes, and times
+their decoding, replay and serialization. Run with `python -m benchmarks.replay --help`.
+"""
@@ -0,0 +1,195 @@
+"""Time `Orchestrator.handle` over synthetic histories, split into its phases.
+
+For every scenario and history size, reports the best-of-N wall time of:
+
+- decode: `DurableOrchestrationContext.from_json` on the trigger payload
+- replay: `TaskOrchestrationExecutor.execute`, i.e. replaying the history through user code
+- serialize: `TaskOrchestrationExecutor.get_orchestrator_state_str`
+- total: the sum of the above, i.e. the handler of `Orchestrator.create`
+
+Results can be written as JSON via `--output`, and compared against a previously
+written file via `--compare`. The comparison exits with a non-zero status when any
+phase regressed by more than `--threshold`.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List
+
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.TaskOrchestrationExecutor import TaskOrchestrationExecutor
+from azure.durable_functions.orchestrator import Orchestrator
+from benchmarks.replay.histories import SCENARIOS
+
+PHASES = ("decode", "replay", "serialize", "total")
+DEFAULT_SIZES = "10,100,1000,10000,100000"
+
+
+class PhaseTimingExecutor(TaskOrchestrationExecutor):
+    """An executor that records the time spent serializing the orchestrator state."""
+
+    def get_orchestrator_state_str(self) -> str:
+        """Serialize the orchestrator state, recording the time it takes.
+
+        Returns
+        -------
+        str
+            The JSON-formatted orchestrator state
+        """
+        start = time.perf_counter()
+        state = super().get_orchestrator_state_str()
+        self.serialize_time = time.perf_counter() - start
+        return state
+
+
+def time_phases(scenario_name: str, context_json: str) -> Dict[str, float]:
+    """Time the phases of one invocation of a scenario's orchestrator.
+
+    Parameters
+    ----------
+    scenario_name : str
+        The name of the scenario
+    context_json : str
+        The JSON-formatted trigger payload
+
+    Returns
+    -------
+    Dict[str, float]
+        The time spent in each phase, in seconds
+    """
+    orchestrator = Orchestrator(SCENARIOS[scenario_name].orchestrator)
+    executor = PhaseTimingExecutor()
+    orchestrator.task_orchestration_executor = executor
+
+    start = time.perf_counter()
+    context = DurableOrchestrationContext.from_json(context_json)
+    decoded = time.perf_counter()
+    orchestrator.handle(context)
+    end = time.perf_counter()
+
+    return {"decode": decoded - start,
+            "replay": end - decoded - executor.serialize_time,
+            "serialize": executor.serialize_time,
+            "total": end - start}
+
+
+def run(scenario_names: List[str], sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """Time every scenario over histories of every size, and print the results.
+
+    Parameters
+    ----------
+    scenario_names : List[str]
+        The names of the scenarios
+    sizes : List[int]
+        The approximate numbers of history events
+    repeat : int
+        The number of runs per measurement, of which the fastest is reported
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The results, per scenario and size
+    """
+    results = []
+    for scenario_name in scenario_names:
+        for size in sizes:
+            context_json = SCENARIOS[scenario_name].generate_history(size)
+            timings = [time_phases(scenario_name, context_json) for _ in range(repeat)]
+            result = {"scenario": scenario_name,
+                      "events": len(json.loads(context_json)["history"]),
+                      "payload_bytes": len(context_json)}
+            for phase in PHASES:
+                result[phase] = min(timing[phase] for timing in timings)
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def print_result(result: Dict[str, Any]):
+    """Print the phase timings of a scenario and size.
+
+    Parameters
+    ----------
+    result : Dict[str, Any]
+        The result, as returned by `run`
+    """
+    phases = "  ".join(f"{phase} {result[phase] * 1e3:10.3f} ms" for phase in PHASES)
+    print(f"{result['scenario']:<20}{result['events']:>9} events  {phases}", flush=True)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print the ratios of results to baseline results, per phase.
+
+    Parameters
+    ----------
+    results : List[Dict[str, Any]]
+        The results, as returned by `run`
+    baseline_path : str
+        The path of a file written via `--output`
+    threshold : float
+        The slowdown ratio above which a phase is considered regressed
+
+    Returns
+    -------
+    bool
+        True if any phase regressed
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    baseline_results = {(result["scenario"], result["events"]): result
+                        for result in baseline["results"]}
+
+    has_regressed = False
+    print(f"\nComparison against {baseline_path} (new / baseline):")
+    for result in results:
+        baseline_result = baseline_results.get((result["scenario"], result["events"]))
+        if baseline_result is None:
+            continue
+        ratios = []
+        for phase in PHASES:
+            ratio = result[phase] / max(baseline_result[phase], 1e-9)
+            marker = "!" if ratio > threshold else " "
+            has_regressed = has_regressed or ratio > threshold
+            ratios.append(f"{phase} {ratio:6.2f}x{marker}")
+        print(f"{result['scenario']:<20}{result['events']:>9} events  " + "  ".join(ratios))
+    return has_regressed
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenarios, out of: %(default)s")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="comma-separated approximate history sizes, up to 1000000")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of runs per measurement, the fastest is reported")
+    parser.add_argument("--output", help="path to write the results to, as JSON")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="path of a previous --output file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.1,
+                        help="slowdown ratio above which a phase is considered regressed")
+    args = parser.parse_args()
+
+    scenario_names = args.scenarios.split(",")
+    unknown_scenarios = set(scenario_names) - set(SCENARIOS)
+    if unknown_scenarios:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown_scenarios))}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = run(scenario_names, sizes, args.repeat)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"python": platform.python_version(), "results": results},
+                      output_file, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
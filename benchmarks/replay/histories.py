@@ -0,0 +1,331 @@
+"""Synthetic orchestration histories, in the shape the durable extension sends them.
+
+Each scenario pairs an orchestrator function with a generator of trigger payloads
+whose history replays that orchestrator. Histories are built directly as JSON-ready
+dictionaries, so that generating a million events is cheap.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import azure.durable_functions as df
+from azure.durable_functions.constants import DATETIME_STRING_FORMAT
+from azure.durable_functions.models.history import HistoryEventType
+
+RETRY_OPTIONS = df.RetryOptions(first_retry_interval_in_milliseconds=1000,
+                                max_number_of_attempts=2)
+
+
+class HistoryBuilder:
+    """Builds the JSON-decoded trigger payload of an orchestration."""
+
+    def __init__(self, name: str, input_: Any):
+        """Start the history of an orchestration.
+
+        Parameters
+        ----------
+        name : str
+            The name of the orchestrator
+        input_ : Any
+            The JSON-serializable input of the orchestration
+        """
+        self.instance_id = f"benchmark-{name}"
+        self.input = json.dumps(input_)
+        self.history: List[Dict[str, Any]] = []
+        self.current_time = datetime(2023, 1, 1)
+        self.add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+        self.add_event(HistoryEventType.EXECUTION_STARTED, Name=name, Input=self.input)
+
+    def add_event(self, event_type: HistoryEventType, event_id: int = -1, **fields):
+        """Append an event, one millisecond after the previous one.
+
+        Parameters
+        ----------
+        event_type : HistoryEventType
+            The type of the event
+        event_id : int
+            The ID of the event, or -1 for events that do not schedule a task
+        **fields
+            The fields specific to the event type
+        """
+        self.current_time += timedelta(milliseconds=1)
+        event = {"EventType": event_type, "EventId": event_id, "IsPlayed": True,
+                 "Timestamp": self.current_time.strftime(DATETIME_STRING_FORMAT)}
+        event.update(fields)
+        self.history.append(event)
+
+    def add_episode_boundary(self):
+        """Record the end of an orchestrator episode, and the start of the next one."""
+        self.add_event(HistoryEventType.ORCHESTRATOR_COMPLETED)
+        self.add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+
+    def to_json_string(self) -> str:
+        """Get the trigger payload of the orchestration, as the durable extension sends it.
+
+        Returns
+        -------
+        str
+            The JSON-formatted trigger payload
+        """
+        # events of the latest episode have not been played yet
+        last_episode_start = max(index for index, event in enumerate(self.history)
+                                 if event["EventType"] == HistoryEventType.ORCHESTRATOR_STARTED)
+        for event in self.history[last_episode_start + 1:]:
+            event["IsPlayed"] = False
+        return json.dumps({"history": self.history, "instanceId": self.instance_id,
+                           "isReplaying": True, "parentInstanceId": None,
+                           "input": self.input, "upperSchemaVersion": 0})
+
+
+def _num_units(num_events: int, events_per_unit: int, fixed_events: int = 2) -> int:
+    return max((num_events - fixed_events) // events_per_unit, 1)
+
+
+def sequential_orchestrator(context: df.DurableOrchestrationContext):
+    """Call activities one after another."""
+    results = []
+    for index in range(context.get_input()):
+        results.append((yield context.call_activity("Hello", index)))
+    return len(results)
+
+
+def sequential_history(num_events: int) -> str:
+    """Generate the history of `sequential_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_activities = _num_units(num_events, 4)
+    builder = HistoryBuilder("sequential", num_activities)
+    for index in range(num_activities):
+        builder.add_event(HistoryEventType.TASK_SCHEDULED, index, Name="Hello")
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.TASK_COMPLETED, TaskScheduledId=index,
+                          Result=json.dumps(f"Hello {index}!"))
+    return builder.to_json_string()
+
+
+def fan_out_fan_in_orchestrator(context: df.DurableOrchestrationContext):
+    """Call activities in parallel, and wait for all of them."""
+    tasks = [context.call_activity("Hello", index) for index in range(context.get_input())]
+    results = yield context.task_all(tasks)
+    return len(results)
+
+
+def fan_out_fan_in_history(num_events: int) -> str:
+    """Generate the history of `fan_out_fan_in_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_activities = _num_units(num_events, 2, fixed_events=4)
+    builder = HistoryBuilder("fan_out_fan_in", num_activities)
+    for index in range(num_activities):
+        builder.add_event(HistoryEventType.TASK_SCHEDULED, index, Name="Hello")
+    builder.add_episode_boundary()
+    for index in range(num_activities):
+        builder.add_event(HistoryEventType.TASK_COMPLETED, TaskScheduledId=index,
+                          Result=json.dumps(f"Hello {index}!"))
+    return builder.to_json_string()
+
+
+def retries_orchestrator(context: df.DurableOrchestrationContext):
+    """Call activities with retries, one after another."""
+    results = []
+    for index in range(context.get_input()):
+        results.append((yield context.call_activity_with_retry("Flaky", RETRY_OPTIONS, index)))
+    return len(results)
+
+
+def retries_history(num_events: int) -> str:
+    """Generate the history of `retries_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    # every activity fails once, and succeeds after a retry timer fires
+    num_activities = _num_units(num_events, 12)
+    builder = HistoryBuilder("retries", num_activities)
+    for index in range(num_activities):
+        first_attempt_id, timer_id, second_attempt_id = 3 * index, 3 * index + 1, 3 * index + 2
+        builder.add_event(HistoryEventType.TASK_SCHEDULED, first_attempt_id, Name="Flaky")
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.TASK_FAILED, TaskScheduledId=first_attempt_id,
+                          Reason="Transient failure", Details="Try again")
+        fire_at = builder.current_time.strftime(DATETIME_STRING_FORMAT)
+        builder.add_event(HistoryEventType.TIMER_CREATED, timer_id, FireAt=fire_at)
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.TIMER_FIRED, TimerId=timer_id, FireAt=fire_at)
+        builder.add_event(HistoryEventType.TASK_SCHEDULED, second_attempt_id, Name="Flaky")
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.TASK_COMPLETED, TaskScheduledId=second_attempt_id,
+                          Result=json.dumps(index))
+    return builder.to_json_string()
+
+
+def timers_orchestrator(context: df.DurableOrchestrationContext):
+    """Wait for durable timers, one after another."""
+    for _ in range(context.get_input()):
+        yield context.create_timer(context.current_utc_datetime + timedelta(seconds=1))
+    return context.current_utc_datetime.isoformat()
+
+
+def timers_history(num_events: int) -> str:
+    """Generate the history of `timers_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_timers = _num_units(num_events, 4)
+    builder = HistoryBuilder("timers", num_timers)
+    for index in range(num_timers):
+        fire_at = (builder.current_time + timedelta(seconds=1)).strftime(DATETIME_STRING_FORMAT)
+        builder.add_event(HistoryEventType.TIMER_CREATED, index, FireAt=fire_at)
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.TIMER_FIRED, TimerId=index, FireAt=fire_at)
+    return builder.to_json_string()
+
+
+def external_events_orchestrator(context: df.DurableOrchestrationContext):
+    """Wait for external events, one after another."""
+    approvals = []
+    for _ in range(context.get_input()):
+        approvals.append((yield context.wait_for_external_event("Approval")))
+    return len(approvals)
+
+
+def external_events_history(num_events: int) -> str:
+    """Generate the history of `external_events_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_waits = _num_units(num_events, 3)
+    builder = HistoryBuilder("external_events", num_waits)
+    for index in range(num_waits):
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.EVENT_RAISED, Name="Approval",
+                          Input=json.dumps({"approver": f"user{index}", "approved": True}))
+    return builder.to_json_string()
+
+
+def entities_orchestrator(context: df.DurableOrchestrationContext):
+    """Call an entity operation, one call after another."""
+    entity_id = df.EntityId("Counter", "benchmark")
+    total = 0
+    for index in range(context.get_input()):
+        total = yield context.call_entity(entity_id, "add", index)
+    return total
+
+
+def entities_history(num_events: int) -> str:
+    """Generate the history of `entities_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_calls = _num_units(num_events, 4)
+    builder = HistoryBuilder("entities", num_calls)
+    total = 0
+    for index in range(num_calls):
+        request_id = f"00000000-0000-0000-0000-{index:012d}"
+        total += index
+        builder.add_event(HistoryEventType.EVENT_SENT, index, Name="op",
+                          InstanceId="@counter@benchmark",
+                          Input=json.dumps({"id": request_id, "op": "add"}))
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.EVENT_RAISED, Name=request_id,
+                          Input=json.dumps({"result": json.dumps(total)}))
+    return builder.to_json_string()
+
+
+def sub_orchestrations_orchestrator(context: df.DurableOrchestrationContext):
+    """Call sub-orchestrators, one after another."""
+    results = []
+    for index in range(context.get_input()):
+        results.append((yield context.call_sub_orchestrator("Child", index)))
+    return len(results)
+
+
+def sub_orchestrations_history(num_events: int) -> str:
+    """Generate the history of `sub_orchestrations_orchestrator`.
+
+    Parameters
+    ----------
+    num_events : int
+        The approximate number of history events
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    num_children = _num_units(num_events, 4)
+    builder = HistoryBuilder("sub_orchestrations", num_children)
+    for index in range(num_children):
+        builder.add_event(HistoryEventType.SUB_ORCHESTRATION_INSTANCE_CREATED, index,
+                          Name="Child", Input=json.dumps(index))
+        builder.add_episode_boundary()
+        builder.add_event(HistoryEventType.SUB_ORCHESTRATION_INSTANCE_COMPLETED,
+                          TaskScheduledId=index, Result=json.dumps({"child": index}))
+    return builder.to_json_string()
+
+
+class Scenario(NamedTuple):
+    """An orchestrator, and a generator of histories of a given size that replay it."""
+
+    orchestrator: Callable
+    generate_history: Callable[[int], str]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "sequential": Scenario(sequential_orchestrator, sequential_history),
+    "fan_out_fan_in": Scenario(fan_out_fan_in_orchestrator, fan_out_fan_in_history),
+    "retries": Scenario(retries_orchestrator, retries_history),
+    "timers": Scenario(timers_orchestrator, timers_history),
+    "external_events": Scenario(external_events_orchestrator, external_events_history),
+    "entities": Scenario(entities_orchestrator, entities_history),
+    "sub_orchestrations": Scenario(sub_orchestrations_orchestrator, sub_orchestrations_history),
+}
@@ -0,0 +1,47 @@
+"""Cost of resuming user code that repeatedly yields already-completed tasks.
+
+Orchestrators commonly re-yield tasks that completed earlier in the replay, e.g.
+when polling a cached result in a loop. Each such yield is resumed synchronously,
+so this measures the per-yield overhead of `TaskOrchestrationExecutor.resume_user_code`.
+"""
+import argparse
+import json
+import time
+
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.orchestrator import Orchestrator
+from benchmarks.history_memory import generate_context_json
+
+
+def repeated_yield_orchestrator(context):
+    """Yield the same completed task over and over."""
+    num_yields = context.get_input()
+    task = context.call_activity("Hello", 0)
+    result = None
+    for _ in range(num_yields):
+        result = yield task
+    return result
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--yields", type=int, default=100000)
+    args = parser.parse_args()
+
+    context_dict = json.loads(generate_context_json(6))
+    context_dict["input"] = str(args.yields)
+    context = DurableOrchestrationContext.from_json(json.dumps(context_dict))
+    orchestrator = Orchestrator(repeated_yield_orchestrator)
+
+    start = time.perf_counter()
+    orchestrator.handle(context)
+    elapsed = time.perf_counter() - start
+
+    print(f"yields:                   {args.yields}")
+    print(f"total:                    {elapsed:8.3f} s")
+    print(f"per yield:                {elapsed / args.yields * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Memory allocated by scheduling a wide fan-out of activities.
+
+Reports the memory that remains allocated, per activity, after the orchestrator
+creates its activity tasks and their `task_all`, and the `tracemalloc` peak of
+the whole `Orchestrator.handle` invocation, which also encodes the actions.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.history import HistoryEventType
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.orchestrator import Orchestrator
+
+
+def fan_out_orchestrator(context, report):
+    """Call activities in parallel, and report the memory allocated to schedule them.
+
+    Parameters
+    ----------
+    context : DurableOrchestrationContext
+        The orchestration context
+    report : Callable[[int], None]
+        Function called with the allocated memory, in bytes
+    """
+    num_activities = context.get_input()
+    before, _ = tracemalloc.get_traced_memory()
+    tasks = [context.call_activity("Hello", index) for index in range(num_activities)]
+    when_all = context.task_all(tasks)
+    after, _ = tracemalloc.get_traced_memory()
+    report(after - before)
+    yield when_all
+
+
+def generate_context_json(num_activities: int, replay_schema: ReplaySchema) -> str:
+    """Generate the trigger payload of the first invocation of `fan_out_orchestrator`.
+
+    Parameters
+    ----------
+    num_activities : int
+        The number of activities
+    replay_schema : ReplaySchema
+        The replay schema of the orchestration
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    history = [
+        {"EventType": HistoryEventType.ORCHESTRATOR_STARTED, "EventId": -1, "IsPlayed": False,
+         "Timestamp": "2023-01-01T00:00:00.000000Z"},
+        {"EventType": HistoryEventType.EXECUTION_STARTED, "EventId": -1, "IsPlayed": False,
+         "Name": "fan_out", "Input": str(num_activities),
+         "Timestamp": "2023-01-01T00:00:00.000000Z"},
+    ]
+    return json.dumps({"history": history, "instanceId": "benchmark", "isReplaying": False,
+                       "parentInstanceId": None, "input": str(num_activities),
+                       "upperSchemaVersion": replay_schema.value})
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--activities", type=int, default=100000)
+    parser.add_argument("--replay-schema", choices=("v1", "v2"), default="v1")
+    args = parser.parse_args()
+    replay_schema = {"v1": ReplaySchema.V1, "v2": ReplaySchema.V2}[args.replay_schema]
+
+    context_json = generate_context_json(args.activities, replay_schema)
+    scheduled = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    context = DurableOrchestrationContext.from_json(context_json)
+    Orchestrator(lambda ctx: fan_out_orchestrator(ctx, scheduled.append)).handle(context)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"activities:              {args.activities}")
+    print(f"scheduled per activity:  {scheduled[0] / args.activities:8.0f} B")
+    print(f"scheduled total:         {scheduled[0] / 2 ** 20:8.1f} MiB")
+    print(f"tracemalloc peak:        {peak / 2 ** 20:8.1f} MiB")
+    print(f"invocation time:         {elapsed:8.2f} s (includes tracemalloc overhead)")
+
+
+if __name__ == "__main__":
+    main()
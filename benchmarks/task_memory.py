@@ -0,0 +1,119 @@
+"""Live tasks and traced memory while replaying a long orchestration.
+
+The orchestrator races two activities per iteration with `task_any` and keeps
+the winners, as orchestrators collecting results do. Reports, at checkpoints
+during the replay, how many tasks besides the retained winners are still alive
+and how much memory is traced. The traced memory keeps growing with the
+history and the actions, which the replay protocol retains; the live tasks
+should not.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+import weakref
+from datetime import datetime, timedelta
+
+from azure.durable_functions.constants import DATETIME_STRING_FORMAT
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.history import HistoryEventType
+from azure.durable_functions.orchestrator import Orchestrator
+
+
+def racing_orchestrator(context, checkpoints, report):
+    """Race two activities per iteration, and report the live tasks at checkpoints.
+
+    Parameters
+    ----------
+    context : DurableOrchestrationContext
+        The orchestration context
+    checkpoints : Set[int]
+        The iterations after which to report
+    report : Callable[[int, int], None]
+        Function called with the number of iterations so far, and the number of
+        live tasks besides the winners
+    """
+    num_iterations = context.get_input()
+    live_tasks = weakref.WeakSet()
+    winners = []
+    for index in range(num_iterations):
+        tasks = [context.call_activity("Hello", f"{index}a"),
+                 context.call_activity("Hello", f"{index}b")]
+        live_tasks.update(tasks)
+        when_any = context.task_any(tasks)
+        live_tasks.add(when_any)
+        del tasks
+        winners.append((yield when_any))
+        del when_any
+        if index + 1 in checkpoints:
+            gc.collect()
+            report(index + 1, len(live_tasks) - len(winners))
+
+
+def generate_context_json(num_iterations: int) -> str:
+    """Generate the trigger payload of `racing_orchestrator`.
+
+    Parameters
+    ----------
+    num_iterations : int
+        The number of iterations
+
+    Returns
+    -------
+    str
+        The JSON-formatted trigger payload
+    """
+    current_time = datetime(2023, 1, 1)
+    history = []
+
+    def add_event(event_type, **kwargs):
+        nonlocal current_time
+        current_time += timedelta(milliseconds=1)
+        event = {"EventType": event_type, "EventId": -1, "IsPlayed": True,
+                 "Timestamp": current_time.strftime(DATETIME_STRING_FORMAT)}
+        event.update(kwargs)
+        history.append(event)
+
+    add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+    add_event(HistoryEventType.EXECUTION_STARTED, Name="racing", Input=str(num_iterations))
+    for index in range(num_iterations):
+        for task_id in (2 * index, 2 * index + 1):
+            add_event(HistoryEventType.TASK_SCHEDULED, EventId=task_id, Name="Hello")
+        add_event(HistoryEventType.ORCHESTRATOR_COMPLETED)
+        add_event(HistoryEventType.ORCHESTRATOR_STARTED)
+        for task_id in (2 * index, 2 * index + 1):
+            add_event(HistoryEventType.TASK_COMPLETED, TaskScheduledId=task_id,
+                      Result=json.dumps(f"Hello {task_id}!"))
+    return json.dumps({"history": history, "instanceId": "benchmark", "isReplaying": True,
+                       "parentInstanceId": None, "input": str(num_iterations)})
+
+
+def main():
+    """Run the benchmark with the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--checkpoints", type=int, default=4,
+                        help="number of evenly spaced checkpoints to report at")
+    args = parser.parse_args()
+    step = max(args.iterations // args.checkpoints, 1)
+    checkpoints = set(range(step, args.iterations + 1, step))
+
+    context_json = generate_context_json(args.iterations)
+    print(f"{'iterations':>12} {'other live tasks':>18} {'traced MiB':>12}")
+
+    def report(num_iterations, num_other_live_tasks):
+        current, _ = tracemalloc.get_traced_memory()
+        print(f"{num_iterations:>12} {num_other_live_tasks:>18} {current / 2 ** 20:>12.1f}")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    context = DurableOrchestrationContext.from_json(context_json)
+    Orchestrator(lambda ctx: racing_orchestrator(ctx, checkpoints, report)).handle(context)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    print(f"replay time: {elapsed:.2f} s (includes tracemalloc and gc overhead)")
+
+
+if __name__ == "__main__":
+    main()
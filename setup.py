@@ -30,6 +30,7 @@ setup(
         "tests",
         "samples",
         "scripts",
+        "benchmarks",
         "azure"
     ]),
     use_scm_version=True,
@@ -60,6 +61,12 @@ setup(
         'python-dateutil>=2.8.0',
         'furl>=2.1.0'
     ],
+    extras_require={
+        'orjson': ['orjson>=3.6.0'],
+        'zstd': ['zstandard>=0.15.0'],
+        'msgpack': ['msgpack>=1.0.0'],
+        'cbor': ['cbor2>=5.4.0'],
+    },
     extra_requires=[
         'flake8==3.7.8',
         'flake8-docstrings==1.5.0',
@@ -6,6 +6,8 @@ import azure.functions as func
 from tests.test_utils.constants import RPC_BASE_URL
 from azure.durable_functions.models.DurableOrchestrationBindings import \
     DurableOrchestrationBindings
+from azure.durable_functions.models.utils import json_codec, payload_compression, \
+    payload_formats, payload_store
 
 TASK_HUB_NAME = "DurableFunctionsHub"
 BASE_URL = "http://localhost:7071/runtime/webhooks/durabletask"
@@ -76,3 +78,44 @@ def replace_stand_in_bits(binding_string):
 def app():
     app = df.DFApp(http_auth_level=func.AuthLevel.ANONYMOUS)
     return app
+
+
+@pytest.fixture()
+def stdlib_json_codec():
+    """Use the stdlib JSON codec, for tests asserting its exact formatting."""
+    codec = json_codec.get_codec()
+    json_codec.set_codec("json")
+    yield
+    json_codec.set_codec(codec)
+
+
+@pytest.fixture()
+def file_payload_store(tmp_path):
+    """Offload payloads of at least 100 characters to a temporary directory."""
+    store = payload_store.FilePayloadStore(str(tmp_path))
+    previous_store = payload_store.get_payload_store()
+    previous_threshold = payload_store.get_offload_threshold()
+    payload_store.set_payload_store(store, offload_threshold=100)
+    yield store
+    payload_store.set_payload_store(previous_store, previous_threshold)
+
+
+@pytest.fixture()
+def zlib_payload_compressor():
+    """Compress payloads of at least 100 characters via zlib."""
+    compressor = payload_compression.PayloadCompressor(threshold=100)
+    previous_compressor = payload_compression.get_compressor()
+    payload_compression.set_compressor(compressor)
+    yield compressor
+    payload_compression.set_compressor(previous_compressor)
+
+
+@pytest.fixture()
+def msgpack_payload_format():
+    """Encode payloads as MessagePack."""
+    pytest.importorskip("msgpack")
+    binary_format = payload_formats.MsgpackFormat()
+    previous_format = payload_formats.get_binary_format()
+    payload_formats.set_binary_format(binary_format)
+    yield binary_format
+    payload_formats.set_binary_format(previous_format)
@@ -1,11 +1,22 @@
 import azure.durable_functions as df
 import azure.functions as func
 import json
+import typing
+from typing import List, NamedTuple
+
+from azure.durable_functions.constants import PARTITION_ORCHESTRATOR_NAME
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+
+class Coordinates(NamedTuple):
+    latitude: float
+    longitude: float
 
 
 def get_user_code(app):
     functions = app.get_functions()
-    assert len(functions) == 1
+    assert len(functions) == 2
+    assert functions[-1].get_function_name() == PARTITION_ORCHESTRATOR_NAME
     return functions[0]
 
 def assert_json(user_code, expected_dict):
@@ -105,4 +116,60 @@ def test_durable_client_input(app):
                 "type": "durableClient"
             }
         ]
-    })
\ No newline at end of file
+    })
+
+
+def test_partition_orchestrator_is_registered_once(app):
+    blueprint = df.Blueprint()
+    blueprint.register_partition_orchestrator()
+    blueprint.register_partition_orchestrator()
+    app.register_functions(blueprint)
+
+    functions = app.get_functions()
+    user_code = functions[0]
+
+    assert len(functions) == 1
+    assert user_code.get_function_name() == PARTITION_ORCHESTRATOR_NAME
+    assert_json(user_code, {
+        "scriptFile": "function_app.py",
+        "bindings": [
+            {
+                "direction": "IN",
+                "name": "context",
+                "type": "orchestrationTrigger",
+                "orchestration": "DurableFunctions-PartitionOrchestrator"
+            }
+        ]
+    })
+
+
+def test_activity_trigger_converts_generic_annotations_before_python_3_8(app, monkeypatch):
+    # `typing.get_origin` and `typing.get_args` were added in Python 3.8
+    monkeypatch.delattr(typing, "get_origin", raising=False)
+    monkeypatch.delattr(typing, "get_args", raising=False)
+
+    @app.activity_trigger(input_name="places")
+    def dummy_function(places: List[Coordinates]) -> List[str]:
+        return [type(place).__name__ for place in places]
+
+    user_code = get_user_code(app).get_user_function()
+
+    assert user_code(places=[[47.6, -122.3]]) == ["Coordinates"]
+
+
+def test_orchestrator_options_are_passed_to_orchestrators():
+    app_metrics, orchestrator_metrics = [], []
+    replay_cache = df.ReplayCache()
+    app = df.DFApp(replay_cache=replay_cache, metrics_callback=app_metrics.append)
+
+    @app.orchestration_trigger(context_name="my_context",
+                               metrics_callback=orchestrator_metrics.append)
+    def dummy_function(my_context):
+        yield my_context.call_activity("Hello", "Tokyo")
+
+    user_code = get_user_code(app).get_user_function()
+    user_code(ContextBuilder("test_orchestrator_options").to_json_string())
+
+    assert len(replay_cache) == 1
+    assert len(orchestrator_metrics) == 1
+    assert app_metrics == []
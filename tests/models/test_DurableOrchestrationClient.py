@@ -87,6 +87,7 @@ def test_get_input_returns_none_when_none_supplied():
     assert result is None
 
 
+@pytest.mark.usefixtures("stdlib_json_codec")
 def test_get_input_returns_json_string(binding_string):
     input_ = json.loads(binding_string)
     result = DurableOrchestrationClient._get_json_input(input_)
@@ -110,6 +111,7 @@ def test_get_raise_event_url(binding_string):
     assert expected_url == raise_event_url
 
 
+@pytest.mark.usefixtures("stdlib_json_codec")
 def test_create_check_status_response(binding_string):
     client = DurableOrchestrationClient(binding_string)
     instance_id = "2e2568e7-a906-43bd-8364-c81733c5891e"
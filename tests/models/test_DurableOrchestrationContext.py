@@ -5,6 +5,7 @@ from azure.durable_functions.models.ReplaySchema import ReplaySchema
 
 from azure.durable_functions.models.DurableOrchestrationContext \
     import DurableOrchestrationContext
+from azure.durable_functions.models.history import HistoryEventCache
 from tests.test_utils.ContextBuilder import ContextBuilder
 
 
@@ -100,3 +101,54 @@ def test_get_input_json_str():
     result = context.get_input()
 
     assert 'Seattle' == result['city']
+
+
+def test_streamed_history_matches_decoded_history():
+    builder = ContextBuilder('test_streamed_history')
+    builder.add_task_scheduled_event(name='Hello', id_=0)
+    builder.add_orchestrator_completed_event()
+    builder.add_orchestrator_started_event()
+    builder.add_task_completed_event(id_=0, result=json.dumps("Hello Tokyo!"))
+    builder.input_ = json.dumps({'city': 'Seattle'})
+    # streaming must cope with arbitrary whitespace, unlike the extension's payloads
+    context_as_string = json.dumps(builder.to_json(), indent=2)
+
+    decoded = DurableOrchestrationContext.from_json(context_as_string, stream_history=False)
+    streamed = DurableOrchestrationContext.from_json(context_as_string, stream_history=True)
+
+    assert streamed.instance_id == decoded.instance_id
+    assert streamed.get_input() == decoded.get_input()
+    assert len(streamed.histories) == len(decoded.histories) == 6
+    for streamed_event, decoded_event in zip(streamed.histories, decoded.histories):
+        assert vars(streamed_event) == vars(decoded_event)
+        assert streamed_event.event_type == decoded_event.event_type
+        assert streamed_event.timestamp == decoded_event.timestamp
+        assert getattr(streamed_event, "Result", None) == getattr(decoded_event, "Result", None)
+
+
+def test_streaming_only_decodes_events_of_the_history():
+    builder = ContextBuilder('test_streamed_history')
+    builder.add_task_scheduled_event(name='Hello', id_=0)
+    builder.add_orchestrator_completed_event()
+    builder.add_orchestrator_started_event()
+    builder.add_task_completed_event(id_=0, result=json.dumps("Hello Tokyo!"))
+    context_dict = builder.to_json()
+    user_object = {'EventType': 4, 'Name': 'not an event'}
+    context_dict['history'][-1]['Result'] = user_object
+    context_dict['userData'] = [user_object]
+    history_cache = HistoryEventCache()
+
+    for cache in (None, history_cache, history_cache):
+        context = DurableOrchestrationContext.from_json(
+            json.dumps(context_dict), cache, stream_history=True)
+
+        assert len(context.histories) == 6
+        assert context.histories[-1].Result == user_object
+    assert history_cache.hits == 1
+
+
+def test_streaming_rejects_malformed_payloads():
+    context_as_string = ContextBuilder('test_streamed_history').to_json_string()
+
+    with pytest.raises(json.JSONDecodeError):
+        DurableOrchestrationContext.from_json(context_as_string[:-20], stream_history=True)
@@ -0,0 +1,128 @@
+import json
+
+from azure.durable_functions.models.DurableOrchestrationContext \
+    import DurableOrchestrationContext
+from azure.durable_functions.models.history import HistoryEventCache
+from tests.test_utils.ContextBuilder import ContextBuilder
+from tests.orchestrator.test_fan_out_fan_in import add_completed_event
+
+
+def decode(context_builder, history_cache):
+    return DurableOrchestrationContext.from_json(
+        context_builder.to_json_string(), history_cache).histories
+
+
+def assert_histories_equal(expected, result):
+    assert len(expected) == len(result)
+    for expected_event, event in zip(expected, result):
+        assert expected_event.event_type == event.event_type
+        assert expected_event.event_id == event.event_id
+        assert expected_event.is_played == event.is_played
+        assert expected_event.timestamp == event.timestamp
+        assert getattr(expected_event, "Result", None) == getattr(event, "Result", None)
+
+
+def test_decodes_appended_events_only():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    first_history = decode(context_builder, history_cache)
+
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    second_history = decode(context_builder, history_cache)
+
+    assert history_cache.misses == 1
+    assert history_cache.hits == 1
+    assert all(first is second for first, second in zip(first_history, second_history))
+    assert_histories_equal(decode(context_builder, None), second_history)
+
+
+def test_refreshes_is_played_flag_of_cached_events():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    decode(context_builder, history_cache)
+
+    history_dict = context_builder.to_json()
+    for event in history_dict["history"]:
+        event["IsPlayed"] = True
+    history = DurableOrchestrationContext.from_json(
+        json.dumps(history_dict), history_cache).histories
+
+    assert history_cache.hits == 1
+    assert all(event.is_played for event in history)
+
+
+def test_diverging_history_is_decoded_from_scratch():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    decode(context_builder, history_cache)
+
+    context_builder.history_events = context_builder.history_events[:2]
+    add_completed_event(context_builder, 0, 'Hello', "Hola Tokyo!")
+    add_completed_event(context_builder, 1, 'Hello', "Hola Seattle!")
+    history = decode(context_builder, history_cache)
+
+    assert history_cache.hits == 0
+    assert history_cache.misses == 2
+    assert_histories_equal(decode(context_builder, None), history)
+
+
+def test_cache_is_bounded():
+    history_cache = HistoryEventCache(max_instances=1)
+    for _ in range(3):
+        decode(ContextBuilder('test_history_cache'), history_cache)
+
+    assert len(history_cache) == 1
+    assert history_cache.evictions == 2
+
+
+def decode_streamed(context_builder, history_cache):
+    return DurableOrchestrationContext.from_json(
+        context_builder.to_json_string(), history_cache, stream_history=True).histories
+
+
+def test_streamed_history_decodes_appended_events_only():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    first_history = decode_streamed(context_builder, history_cache)
+
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    second_history = decode_streamed(context_builder, history_cache)
+
+    assert history_cache.misses == 1
+    assert history_cache.hits == 1
+    assert all(first is second for first, second in zip(first_history, second_history))
+    assert_histories_equal(decode(context_builder, None), second_history)
+
+
+def test_diverging_streamed_history_is_decoded_from_scratch():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    decode_streamed(context_builder, history_cache)
+
+    context_builder.history_events = context_builder.history_events[:2]
+    add_completed_event(context_builder, 0, 'Hello', "Hola Tokyo!")
+    add_completed_event(context_builder, 1, 'Hello', "Hola Seattle!")
+    history = decode_streamed(context_builder, history_cache)
+
+    assert history_cache.hits == 0
+    assert history_cache.misses == 2
+    assert_histories_equal(decode(context_builder, None), history)
+    assert len(history_cache) == 1
+
+
+def test_shortened_streamed_history_is_decoded_from_scratch():
+    history_cache = HistoryEventCache()
+    context_builder = ContextBuilder('test_history_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    decode_streamed(context_builder, history_cache)
+
+    context_builder.history_events = context_builder.history_events[:2]
+    history = decode_streamed(context_builder, history_cache)
+
+    assert history_cache.misses == 2
+    assert_histories_equal(decode(context_builder, None), history)
@@ -1,10 +1,19 @@
 from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from datetime import datetime
 from typing import List
 
+import pytest
+
 from azure.durable_functions.models.actions.Action import Action
 from azure.durable_functions.models.actions.CallActivityAction \
     import CallActivityAction
+from azure.durable_functions.models.actions.CreateTimerAction import CreateTimerAction
+from azure.durable_functions.models.actions.WhenAllAction import WhenAllAction
 from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.utils import json_codec
+from azure.functions._durable_functions import _serialize_custom_object
+
+pytestmark = pytest.mark.usefixtures("stdlib_json_codec")
 
 
 def test_empty_state_to_json_string():
@@ -26,3 +35,32 @@ def test_single_action_state_to_json_string():
                        '"functionName": "MyFunction", "input": '
                        '"\\"AwesomeInput\\""}]]}')
     assert expected_result == result
+
+
+def test_reserialized_state_is_assembled_like_dumps():
+    timer = CreateTimerAction(datetime(2023, 1, 1))
+    actions: List[List[Action]] = [
+        [CallActivityAction(function_name="MyFunction", input_="AwesomeInput")],
+        [WhenAllAction([CallActivityAction(function_name="MyFunction", input_=1), timer])]]
+    state = OrchestratorState(is_done=True, actions=actions, output={"result": [1, 2]},
+                              replay_schema=ReplaySchema.V2, custom_status="Running")
+    expected_result = json_codec.dumps(state.to_json(), default=_serialize_custom_object)
+
+    assert expected_result == state.to_json_string()
+    # serialized again, e.g. when resumed from a replay cache, from cached strings
+    assert expected_result == state.to_json_string()
+    assert expected_result == state.to_json_string()
+
+
+def test_cancelled_timer_is_reflected_in_reserialized_state():
+    timer = CreateTimerAction(datetime(2023, 1, 1))
+    actions: List[List[Action]] = [
+        [CallActivityAction(function_name="MyFunction", input_="AwesomeInput")], [timer]]
+    state = OrchestratorState(is_done=False, actions=actions, output=None,
+                              replay_schema=ReplaySchema.V1)
+    state.to_json_string()
+    state.to_json_string()
+
+    timer.is_cancelled = True
+
+    assert '"isCanceled": true' in state.to_json_string()
@@ -0,0 +1,29 @@
+import pytest
+from dateutil.parser import parse as dt_parse
+
+from azure.durable_functions.models.utils.datetime_utils import parse_timestamp
+
+
+@pytest.mark.parametrize("timestamp", [
+    "2019-12-08T23:18:41.3240927Z",
+    "2019-12-08T23:18:39.756132Z",
+    "2019-12-08T23:18:39.123Z",
+    "2019-12-08T23:18:39.5Z",
+    "2019-12-08T23:18:39Z",
+    "2019-12-08T23:18:39.756132",
+    "2019-12-08T23:18:39",
+    "2019-12-08T23:18:39+02:00",
+    "2019-12-08 23:18:39",
+])
+def test_matches_dateutil(timestamp):
+    expected = dt_parse(timestamp)
+    result = parse_timestamp(timestamp)
+
+    assert result == expected
+    assert result.tzinfo == expected.tzinfo
+    assert result.utcoffset() == expected.utcoffset()
+
+
+def test_invalid_timestamp_raises_like_dateutil():
+    with pytest.raises(ValueError):
+        parse_timestamp("2019-13-08T23:18:39Z")
@@ -0,0 +1,109 @@
+import json
+from datetime import datetime
+
+import pytest
+from azure.functions._durable_functions import _deserialize_custom_object, \
+    _serialize_custom_object
+
+from azure.durable_functions.models.utils import json_codec
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def to_json(obj):
+        return {"x": obj.x, "y": obj.y}
+
+    @staticmethod
+    def from_json(data):
+        return Point(data["x"], data["y"])
+
+
+@pytest.fixture(params=["json", "orjson"])
+def codec(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        return json_codec.OrjsonCodec()
+    return json_codec.JsonCodec()
+
+
+def test_encodes_the_same_documents_as_the_stdlib(codec):
+    value = {"name": "Tōkyō", "tags": ["a", "b"], "nested": {"n": 1.5, "ok": True},
+             "none": None, 1: "non-string key"}
+
+    encoded = codec.dumps(value)
+
+    assert json.loads(encoded) == json.loads(json.dumps(value))
+
+
+def test_custom_objects_round_trip(codec):
+    encoded = codec.dumps({"point": Point(1, 2)}, default=_serialize_custom_object)
+    decoded = codec.loads(encoded, object_hook=_deserialize_custom_object)
+
+    assert json.loads(encoded) == json.loads(
+        json.dumps({"point": Point(1, 2)}, default=_serialize_custom_object))
+    assert (decoded["point"].x, decoded["point"].y) == (1, 2)
+
+
+def test_values_unsupported_by_the_stdlib_are_passed_to_default(codec):
+    with pytest.raises(TypeError):
+        codec.dumps(datetime(2023, 1, 1), default=_serialize_custom_object)
+
+
+def test_encodes_integers_beyond_64_bits(codec):
+    assert codec.loads(codec.dumps([2 ** 70])) == [2 ** 70]
+
+
+def test_decodes_non_standard_literals_like_the_stdlib(codec):
+    assert codec.loads('[NaN, 1]')[1] == 1
+
+
+def test_joins_encoded_fragments_like_dumps(codec):
+    value = {"isDone": False, "actions": [[{"a": 1}, {"b": "Tōkyō"}], []]}
+
+    actions = codec.join_array(
+        codec.join_array(codec.dumps(action) for action in action_list)
+        for action_list in value["actions"])
+    encoded = codec.join_object([("isDone", codec.dumps(False)), ("actions", actions)])
+
+    assert encoded == codec.dumps(value)
+
+
+def test_loads_custom_objects_only_when_marked():
+    encoded = json.dumps({"point": Point(1, 2), "plain": {"x": 3}},
+                         default=_serialize_custom_object)
+
+    decoded = json_codec.loads_custom_objects(encoded)
+    decoded_bytes = json_codec.loads_custom_objects(encoded.encode())
+
+    for value in (decoded, decoded_bytes):
+        assert (value["point"].x, value["point"].y) == (1, 2)
+        assert value["plain"] == {"x": 3}
+    assert json_codec.loads_custom_objects('{"__data__": 1, "items": [1]}') \
+        == {"__data__": 1, "items": [1]}
+
+
+def test_default_codec_is_stdlib_unless_configured(monkeypatch):
+    monkeypatch.delenv(json_codec.JSON_CODEC_ENVIRONMENT_VARIABLE, raising=False)
+    assert type(json_codec._get_default_codec()) is json_codec.JsonCodec
+
+    monkeypatch.setenv(json_codec.JSON_CODEC_ENVIRONMENT_VARIABLE, "json")
+    assert type(json_codec._get_default_codec()) is json_codec.JsonCodec
+
+
+def test_set_codec_by_name():
+    codec = json_codec.get_codec()
+    try:
+        json_codec.set_codec("json")
+        assert type(json_codec.get_codec()) is json_codec.JsonCodec
+        assert json_codec.dumps({"a": [1]}) == '{"a": [1]}'
+    finally:
+        json_codec.set_codec(codec)
+
+
+def test_set_codec_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        json_codec.set_codec("yaml")
@@ -0,0 +1,80 @@
+import base64
+import json
+import random
+
+import pytest
+
+from azure.durable_functions.models.DurableEntityContext import from_json_util
+from azure.durable_functions.models.DurableOrchestrationStatus import \
+    DurableOrchestrationStatus
+from azure.durable_functions.models.entities.EntityState import EntityState
+from azure.durable_functions.models.utils import json_codec, payload_compression
+
+LARGE_VALUE = {"cities": ["Tokyo", "Seattle", "London"] * 20}
+
+
+@pytest.fixture(params=["zlib", "zstd"])
+def compressor(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+        compressor = payload_compression.ZstdPayloadCompressor(threshold=100)
+    else:
+        compressor = payload_compression.PayloadCompressor(threshold=100)
+    previous_compressor = payload_compression.get_compressor()
+    payload_compression.set_compressor(compressor)
+    yield compressor
+    payload_compression.set_compressor(previous_compressor)
+
+
+def test_large_payloads_are_compressed_and_decompressed(compressor):
+    json_string = json_codec.dumps(LARGE_VALUE)
+
+    compressed = payload_compression.compress(json_string)
+
+    assert len(compressed) < len(json_string)
+    value = json_codec.loads(compressed)
+    assert value[payload_compression.COMPRESSION_KEY] == compressor.name
+    assert payload_compression.decompress(value) == LARGE_VALUE
+
+
+def test_small_or_incompressible_payloads_are_not_compressed(compressor):
+    small_json_string = json_codec.dumps(["Tokyo"])
+    generator = random.Random(0)
+    random_bytes = bytes(generator.getrandbits(8) for _ in range(300))
+    incompressible_json_string = json_codec.dumps(base64.b64encode(random_bytes).decode())
+
+    assert payload_compression.compress(small_json_string) is small_json_string
+    assert payload_compression.compress(incompressible_json_string) \
+        is incompressible_json_string
+
+
+def test_payloads_are_decompressed_without_compressor(compressor):
+    compressed = payload_compression.compress_value(LARGE_VALUE)
+    payload_compression.set_compressor(None)
+
+    assert payload_compression.decompress(compressed) == LARGE_VALUE
+
+
+def test_set_compressor_by_name(zlib_payload_compressor):
+    payload_compression.set_compressor("zlib")
+    assert payload_compression.get_compressor().name == "zlib"
+
+    with pytest.raises(ValueError):
+        payload_compression.set_compressor("lz4")
+
+
+def test_entity_state_is_compressed_and_decompressed(compressor):
+    entity_state = EntityState(results=[], signals=[], entity_exists=True, state=LARGE_VALUE)
+
+    serialized_state = entity_state.to_json()["entityState"]
+
+    assert payload_compression.is_compressed(json.loads(serialized_state))
+    assert from_json_util(serialized_state) == LARGE_VALUE
+
+
+def test_compressed_custom_status_is_decompressed_on_access(compressor):
+    status = DurableOrchestrationStatus(
+        customStatus=payload_compression.compress_value(LARGE_VALUE))
+
+    assert status.custom_status == LARGE_VALUE
+    assert status.custom_status is status.custom_status
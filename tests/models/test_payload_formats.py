@@ -0,0 +1,82 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from azure.durable_functions.models.DurableEntityContext import from_json_util
+from azure.durable_functions.models.DurableOrchestrationStatus import \
+    DurableOrchestrationStatus
+from azure.durable_functions.models.EncodedInput import encode_input
+from azure.durable_functions.models.entities.EntityState import EntityState
+from azure.durable_functions.models.utils import payload_formats
+
+VALUE = {"cities": ["Tokyo", "Seattle"], "population": 37.4, 1: None}
+
+
+@dataclass
+class Upload:
+    name: str
+    content: bytes
+
+
+@pytest.fixture(params=["msgpack", "cbor"])
+def binary_format(request):
+    pytest.importorskip("msgpack" if request.param == "msgpack" else "cbor2")
+    previous_format = payload_formats.get_binary_format()
+    payload_formats.set_binary_format(request.param)
+    yield payload_formats.get_binary_format()
+    payload_formats.set_binary_format(previous_format)
+
+
+def test_values_are_encoded_and_decoded(binary_format):
+    encoded = payload_formats.encode_value(VALUE)
+
+    assert encoded[payload_formats.FORMAT_KEY] == binary_format.name
+    assert payload_formats.decode_value(json.loads(json.dumps(encoded))) == VALUE
+
+
+def test_bytes_like_values_are_encoded_as_bytes(binary_format):
+    content = bytes(range(256))
+
+    for value in (content, bytearray(content), memoryview(content)):
+        assert payload_formats.decode_value(payload_formats.encode_value(value)) == content
+    multi_byte_view = memoryview(bytearray(content)).cast("H")
+    assert payload_formats.decode_value(
+        payload_formats.encode_value(multi_byte_view)) == content
+
+
+def test_custom_objects_are_encoded_and_decoded(binary_format):
+    upload = Upload("report.pdf", b"%PDF-1.7")
+
+    assert payload_formats.decode_value(payload_formats.encode_value([upload])) == [upload]
+
+
+def test_scalars_are_not_encoded(binary_format):
+    for value in (None, "Tokyo", True, 3, 0.5):
+        assert payload_formats.encode_value(value) is value
+
+
+def test_values_are_decoded_without_binary_format(binary_format):
+    encoded = payload_formats.encode_value(VALUE)
+    payload_formats.set_binary_format(None)
+
+    assert payload_formats.encode_value(VALUE) is VALUE
+    assert payload_formats.decode_value(encoded) == VALUE
+
+
+def test_set_binary_format_by_name(binary_format):
+    with pytest.raises(ValueError):
+        payload_formats.set_binary_format("protobuf")
+
+
+def test_inputs_entity_states_and_outputs_are_encoded(binary_format):
+    assert payload_formats.is_encoded(json.loads(encode_input(VALUE)))
+    assert from_json_util(encode_input(VALUE)) == VALUE
+
+    entity_state = EntityState(results=[], signals=[], entity_exists=True, state=VALUE)
+    serialized_state = entity_state.to_json()["entityState"]
+    assert payload_formats.is_encoded(json.loads(serialized_state))
+    assert from_json_util(serialized_state) == VALUE
+
+    status = DurableOrchestrationStatus(output=payload_formats.encode_value(VALUE))
+    assert status.output == VALUE
@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from azure.durable_functions.models.DurableOrchestrationStatus import \
+    DurableOrchestrationStatus
+from azure.durable_functions.models.utils import json_codec, payload_store
+
+LARGE_VALUE = {"cities": ["Tokyo", "Seattle", "London"] * 20}
+
+
+def test_small_payloads_are_not_offloaded(file_payload_store):
+    json_string = json_codec.dumps(["Tokyo"])
+
+    assert payload_store.offload(json_string) is json_string
+    assert payload_store.offload_value(["Tokyo"]) == ["Tokyo"]
+    assert os.listdir(file_payload_store.directory) == []
+
+
+def test_large_payloads_are_offloaded_and_resolved(file_payload_store):
+    reference = json_codec.loads(payload_store.offload(json_codec.dumps(LARGE_VALUE)))
+
+    assert payload_store.is_reference(reference)
+    assert os.listdir(file_payload_store.directory) == [reference[payload_store.REFERENCE_KEY]]
+    assert payload_store.resolve(reference) == LARGE_VALUE
+
+
+def test_offloaded_payloads_are_keyed_by_content(file_payload_store):
+    reference = payload_store.offload_value(LARGE_VALUE)
+
+    assert payload_store.offload_value(dict(LARGE_VALUE)) == reference
+    assert len(os.listdir(file_payload_store.directory)) == 1
+
+
+def test_concurrent_writers_of_a_payload_do_not_share_temporary_files(file_payload_store):
+    data = json_codec.dumps(LARGE_VALUE).encode()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: file_payload_store.put("payload", data), range(64)))
+
+    assert os.listdir(file_payload_store.directory) == ["payload"]
+    assert file_payload_store.get("payload") == data
+
+
+def test_payloads_are_not_offloaded_without_store():
+    json_string = json_codec.dumps(LARGE_VALUE)
+
+    assert payload_store.get_payload_store() is None
+    assert payload_store.offload(json_string) is json_string
+    with pytest.raises(ValueError):
+        payload_store.resolve({payload_store.REFERENCE_KEY: "0123"})
+
+
+def test_file_store_rejects_keys_outside_its_directory(file_payload_store):
+    with pytest.raises(ValueError):
+        file_payload_store.get(os.path.join("..", "payload"))
+
+
+def test_offloaded_orchestration_output_is_resolved_on_access(file_payload_store):
+    status = DurableOrchestrationStatus(output=payload_store.offload_value(LARGE_VALUE))
+
+    assert status.output == LARGE_VALUE
+
+
+def test_offloaded_orchestration_output_is_loaded_once(file_payload_store):
+    status = DurableOrchestrationStatus(output=payload_store.offload_value(LARGE_VALUE))
+    output = status.output
+    for file_name in os.listdir(file_payload_store.directory):
+        os.remove(os.path.join(file_payload_store.directory, file_name))
+
+    assert status.output is output
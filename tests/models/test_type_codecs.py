@@ -0,0 +1,135 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, NamedTuple
+
+import pytest
+
+import azure.durable_functions as df
+from azure.durable_functions.models.utils import json_codec, type_codecs
+from azure.functions._durable_functions import _serialize_custom_object
+
+
+@dataclass
+class City:
+    name: str
+    population: int
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Trip:
+    cities: List[City]
+    length: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.length = len(self.cities)
+
+
+@dataclass
+class Parcel:
+    weight: int
+
+
+class Coordinates(NamedTuple):
+    latitude: float
+    longitude: float
+
+
+class Money:
+    def __init__(self, cents: int):
+        self.cents = cents
+
+
+class LegacyPoint:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def to_json(obj):
+        return {"x": obj.x, "y": obj.y}
+
+    @staticmethod
+    def from_json(data):
+        return LegacyPoint(data["x"], data["y"])
+
+
+def round_trip(value):
+    return json_codec.loads_custom_objects(
+        json_codec.dumps(value, default=type_codecs.serialize_custom_object))
+
+
+def test_dataclasses_round_trip():
+    trip = Trip([City("Tokyo", 14, ["jp"]), City("Seattle", 1)])
+
+    decoded = round_trip({"trip": trip})
+
+    assert decoded == {"trip": trip}
+    assert decoded["trip"].length == 2
+
+
+def test_registered_codecs_take_precedence():
+    df.register_codec(Money, lambda money: money.cents, lambda cents: Money(cents))
+
+    encoded = json.loads(json_codec.dumps([Money(250)],
+                                          default=type_codecs.serialize_custom_object))
+    decoded = round_trip([Money(250)])
+
+    assert encoded == [{type_codecs.TYPE_KEY: type_codecs.get_type_codec(Money).name,
+                        type_codecs.DATA_KEY: 250}]
+    assert decoded[0].cents == 250
+
+
+@pytest.mark.parametrize("codec_name", ["json", "orjson"])
+def test_named_tuples_are_encoded_as_arrays_by_every_codec(codec_name):
+    if codec_name == "orjson":
+        pytest.importorskip("orjson")
+    codec = json_codec._create_codec(codec_name)
+
+    encoded = codec.dumps({"place": Coordinates(47.6, -122.3)},
+                          default=type_codecs.serialize_custom_object)
+
+    assert json.loads(encoded) == {"place": [47.6, -122.3]}
+    assert type_codecs.get_converter(Coordinates)(codec.loads(encoded)["place"]) \
+        == Coordinates(47.6, -122.3)
+
+
+def test_only_types_known_to_the_worker_are_decoded_by_name():
+    value = {type_codecs.TYPE_KEY: f"{__name__}:Parcel", type_codecs.DATA_KEY: {"weight": 3}}
+    encoded = json.dumps(value)
+
+    assert json_codec.loads_custom_objects(encoded) == value
+    # annotations make their types known
+    assert type_codecs.get_converter(Parcel)(json.loads(encoded)) == Parcel(3)
+    assert json_codec.loads_custom_objects(encoded) == Parcel(3)
+
+
+def test_user_objects_resembling_custom_objects_round_trip_unchanged():
+    value = {"__type__": "order", "__data__": {"id": 1}}
+
+    assert round_trip(value) == value
+    assert json.loads(json.dumps(value),
+                      object_hook=type_codecs.deserialize_custom_object) == value
+
+
+def test_legacy_custom_objects_round_trip():
+    decoded = json_codec.loads_custom_objects(
+        json.dumps([LegacyPoint(1, 2)], default=_serialize_custom_object))
+
+    assert (decoded[0].x, decoded[0].y) == (1, 2)
+
+
+def test_types_without_codec_are_rejected():
+    with pytest.raises(TypeError):
+        json_codec.dumps(object(), default=type_codecs.serialize_custom_object)
+
+
+def test_converters_follow_annotations():
+    convert_cities = type_codecs.get_converter(List[City])
+    convert_coordinates = type_codecs.get_converter(Coordinates)
+
+    assert convert_cities([{"name": "Tokyo", "population": 14, "tags": []}]) \
+        == [City("Tokyo", 14)]
+    assert convert_coordinates([47.6, -122.3]) == Coordinates(47.6, -122.3)
+    assert type_codecs.get_converter(dict) is None
+    assert type_codecs.get_converter(List[str]) is None
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+from azure.durable_functions.constants import PARTITION_ORCHESTRATOR_NAME
+from azure.durable_functions.models.DurableOrchestrationContext import \
+    DurableOrchestrationContext
+from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
+from azure.durable_functions.models.actions.CallSubOrchestratorAction import \
+    CallSubOrchestratorAction
+from azure.durable_functions.models.utils.partition_utils import partition_orchestrator, \
+    split_into_partitions
+from .orchestrator_test_utils import assert_orchestration_state_equals, \
+    get_orchestration_state_result, assert_valid_schema
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+CITIES = ["Tokyo", "Seattle", "London", "Cairo", "Lima"]
+
+
+def generator_function(context):
+    outputs = yield context.call_activity_partitioned("Hello", CITIES, partition_size=2)
+    return outputs
+
+
+def generator_function_small_fan_out(context):
+    outputs = yield context.call_activity_partitioned("Hello", CITIES)
+    return outputs
+
+
+def base_expected_state(output=None) -> OrchestratorState:
+    return OrchestratorState(is_done=False, actions=[], output=output,
+                             replay_schema=ReplaySchema.V1)
+
+
+def partition_action(instance_id, partition):
+    return CallSubOrchestratorAction(
+        PARTITION_ORCHESTRATOR_NAME,
+        {"name": "Hello", "inputs": partition, "partitionSize": 2}, instance_id)
+
+
+def get_call_id(context_builder):
+    # the partitions of the first call are identified by the first `new_uuid`
+    return DurableOrchestrationContext.from_json(context_builder.to_json_string()).new_uuid()
+
+
+def get_partition_instance_ids(result):
+    return [action["instanceId"] for action in result["actions"][0]]
+
+
+def add_sub_orchestrator_completed_event(context_builder, id_, result):
+    context_builder.add_orchestrator_completed_event()
+    context_builder.add_orchestrator_started_event()
+    context_builder.add_sub_orchestrator_completed_event(json.dumps(result), id_)
+
+
+def test_partitions_are_as_small_as_possible():
+    assert split_into_partitions(list(range(4)), 2) == [[0, 1], [2, 3]]
+    assert split_into_partitions(list(range(5)), 2) == [[0, 1, 2, 3], [4]]
+    assert split_into_partitions(list(range(10)), 3) == [list(range(9)), [9]]
+
+
+def test_small_fan_outs_call_activities_directly():
+    context_builder = ContextBuilder('test_call_activity_partitioned')
+
+    result = get_orchestration_state_result(context_builder, generator_function_small_fan_out)
+
+    expected_state = base_expected_state()
+    expected_state._actions.append(
+        [CallActivityAction("Hello", city) for city in CITIES])
+    assert_valid_schema(result)
+    assert_orchestration_state_equals(expected_state.to_json(), result)
+
+
+def test_large_fan_outs_call_partition_orchestrators():
+    context_builder = ContextBuilder('test_call_activity_partitioned')
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    call_id = get_call_id(context_builder)
+    expected_state = base_expected_state()
+    expected_state._actions.append([
+        partition_action(f"{call_id}:0", CITIES[:4]),
+        partition_action(f"{call_id}:1", CITIES[4:])])
+    assert_orchestration_state_equals(expected_state.to_json(), result)
+
+
+def test_partition_instance_ids_are_unique_per_execution():
+    first_execution = ContextBuilder('test_call_activity_partitioned')
+    # `continue_as_new` starts a new execution of the same instance
+    second_execution = ContextBuilder('test_call_activity_partitioned',
+                                      starting_time=first_execution.current_datetime)
+    second_execution.instance_id = first_execution.instance_id
+
+    first_instance_ids = get_partition_instance_ids(
+        get_orchestration_state_result(first_execution, generator_function))
+    second_instance_ids = get_partition_instance_ids(
+        get_orchestration_state_result(second_execution, generator_function))
+
+    assert len(set(first_instance_ids + second_instance_ids)) == 4
+
+
+def test_partition_results_are_concatenated():
+    context_builder = ContextBuilder('test_call_activity_partitioned')
+    add_sub_orchestrator_completed_event(context_builder, 1, ["Hello Lima!"])
+    add_sub_orchestrator_completed_event(
+        context_builder, 0, [f"Hello {city}!" for city in CITIES[:4]])
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    assert result["isDone"]
+    assert result["output"] == [f"Hello {city}!" for city in CITIES]
+
+
+def test_partition_orchestrator_partitions_its_inputs_recursively():
+    context_builder = ContextBuilder('test_partition_orchestrator')
+    context_builder.input_ = json.dumps(
+        {"name": "Hello", "inputs": CITIES[:4], "partitionSize": 2})
+
+    result = get_orchestration_state_result(context_builder, partition_orchestrator)
+
+    call_id = get_call_id(context_builder)
+    expected_state = base_expected_state()
+    expected_state._actions.append([
+        partition_action(f"{call_id}:0", CITIES[:2]),
+        partition_action(f"{call_id}:1", CITIES[2:4])])
+    assert_orchestration_state_equals(expected_state.to_json(), result)
+
+
+def test_partition_size_must_allow_partitioning():
+    def generator_function_invalid_partition_size(context):
+        yield context.call_activity_partitioned("Hello", CITIES, partition_size=1)
+
+    with pytest.raises(Exception, match="partition_size must be at least 2"):
+        get_orchestration_state_result(
+            ContextBuilder('test_call_activity_partitioned'),
+            generator_function_invalid_partition_size)
+
+
+@pytest.mark.parametrize("inputs", [CITIES[:2], CITIES])
+def test_callables_without_activity_trigger_are_rejected(inputs):
+    def generator_function_with_callable(context):
+        yield context.call_activity_partitioned(lambda city: city, inputs, partition_size=2)
+
+    with pytest.raises(Exception, match="received a `Callable` without an associated"):
+        get_orchestration_state_result(
+            ContextBuilder('test_call_activity_partitioned'), generator_function_with_callable)
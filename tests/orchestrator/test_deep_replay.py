@@ -0,0 +1,46 @@
+from .orchestrator_test_utils import get_orchestration_state_result
+from .test_fan_out_fan_in import add_completed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+NUM_REPEATS = 5000
+NESTING_DEPTH = 300
+
+
+def generator_function_repeated_yield(context):
+    task = context.call_activity("Hello", "Tokyo")
+    result = None
+    for _ in range(NUM_REPEATS):
+        result = yield task
+    return result
+
+
+def generator_function_nested_task_all(context):
+    task = context.call_activity("Hello", "Tokyo")
+    for _ in range(NESTING_DEPTH):
+        task = context.task_all([task])
+    result = yield task
+    for _ in range(NESTING_DEPTH):
+        result = result[0]
+    return result
+
+
+def test_repeatedly_yielding_a_completed_task():
+    context_builder = ContextBuilder('test_repeated_yield')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_repeated_yield)
+
+    assert result["isDone"]
+    assert result["output"] == "Hello Tokyo!"
+
+
+def test_deeply_nested_compound_tasks():
+    context_builder = ContextBuilder('test_nested_task_all')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_nested_task_all)
+
+    assert result["isDone"]
+    assert result["output"] == "Hello Tokyo!"
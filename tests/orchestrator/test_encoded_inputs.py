@@ -0,0 +1,60 @@
+import json
+
+from azure.durable_functions import EncodedInput, RetryOptions
+from azure.durable_functions.models.EncodedInput import EncodedInputCache
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+CONFIG = {"cities": ["Tokyo", "Seattle", "London"], "greeting": "Hello"}
+
+
+def generator_function(context):
+    tasks = [context.call_activity("Hello", CONFIG) for _ in range(3)]
+    return (yield context.task_all(tasks))
+
+
+def pre_encoded_generator_function(context):
+    config = EncodedInput.encode(CONFIG)
+    tasks = [context.call_activity("Hello", config),
+             context.call_activity_with_retry("Hello", RetryOptions(1000, 2), config),
+             context.call_sub_orchestrator("HelloOrchestrator", config)]
+    return (yield context.task_all(tasks))
+
+
+def get_actions(fn, deduplicate_inputs=False):
+    context_builder = ContextBuilder('test_encoded_inputs')
+    handle = Orchestrator.create(fn, deduplicate_inputs=deduplicate_inputs)
+    return json.loads(handle(context_builder.to_json_string()))["actions"][0]
+
+
+def test_pre_encoded_inputs_are_passed_as_is():
+    actions = get_actions(pre_encoded_generator_function)
+
+    assert len(actions) == 3
+    for action in actions:
+        assert json.loads(action["input"]) == CONFIG
+
+
+def test_deduplicated_inputs_are_encoded_like_other_inputs():
+    assert get_actions(generator_function, deduplicate_inputs=True) \
+        == get_actions(generator_function)
+
+
+def test_cache_encodes_an_object_once():
+    cache = EncodedInputCache()
+    config = dict(CONFIG)
+
+    encoded = cache.encode(config)
+
+    assert json.loads(encoded.json_string) == CONFIG
+    assert cache.encode(config) is encoded
+    assert cache.encode(dict(CONFIG)) is not encoded
+
+
+def test_cache_passes_through_scalar_and_encoded_inputs():
+    cache = EncodedInputCache()
+    encoded = EncodedInput('"Tokyo"')
+
+    assert cache.encode(None) is None
+    assert cache.encode(42) == 42
+    assert cache.encode(encoded) is encoded
@@ -0,0 +1,44 @@
+from azure.durable_functions.models.Task import TaskBase
+from .orchestrator_test_utils import get_orchestration_state_result
+from .test_fan_out_fan_in import add_completed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+
+def generator_function_polling_fan_out(context):
+    width = context.get_input()
+    work = context.task_all([context.call_activity("Work", i) for i in range(width)])
+    # the fan-out is re-yielded, within a new `task_any`, once per completed ping
+    for i in range(width):
+        yield context.task_any([work, context.call_activity("Ping", i)])
+    return "Done!"
+
+
+def count_scheduling_checks(monkeypatch, width):
+    num_checks = 0
+    is_scheduled = TaskBase._is_scheduled.fget
+
+    def counting_is_scheduled(task):
+        nonlocal num_checks
+        num_checks += 1
+        return is_scheduled(task)
+    monkeypatch.setattr(TaskBase, "_is_scheduled", property(counting_is_scheduled))
+
+    context_builder = ContextBuilder('test_fan_out_scaling')
+    context_builder.input_ = str(width)
+    for i in range(width):
+        add_completed_event(context_builder, width + i, 'Ping', "Pong")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_polling_fan_out)
+
+    assert result["isDone"]
+    monkeypatch.undo()
+    return num_checks
+
+
+def test_scheduling_checks_grow_linearly_with_fan_out_width(monkeypatch):
+    narrow_checks = count_scheduling_checks(monkeypatch, 100)
+    wide_checks = count_scheduling_checks(monkeypatch, 400)
+
+    # a quadratic replay would perform 16 times as many checks
+    assert wide_checks <= 5 * narrow_checks
@@ -0,0 +1,103 @@
+import pytest
+
+from azure.durable_functions.models.ReplayCache import ReplayCache
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+
+def generator_function(context):
+    outputs = []
+    outputs.append((yield context.call_activity("Hello", "Tokyo")))
+    outputs.append((yield context.task_all([context.call_activity("Hello", "Seattle"),
+                                            context.call_activity("Hello", "London")])))
+    return outputs
+
+
+def failing_generator_function(context):
+    yield context.call_activity("Hello", "Tokyo")
+    raise ValueError("Oops!")
+
+
+def run(context_builder, fn=generator_function, replay_cache=None):
+    collected_metrics = []
+    handle = Orchestrator.create(fn, replay_cache=replay_cache,
+                                 metrics_callback=collected_metrics.append)
+    context_json = context_builder.to_json_string()
+    try:
+        handle(context_json)
+    finally:
+        assert len(collected_metrics) == 1
+    return collected_metrics[0], len(context_json)
+
+
+def test_metrics_of_a_suspended_orchestration():
+    context_builder = ContextBuilder('test_orchestration_metrics')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    for event in context_builder.history_events[:2]:
+        event._is_played = True
+
+    metrics, input_size = run(context_builder)
+
+    assert metrics.instance_id == context_builder.instance_id
+    assert metrics.events_processed == 6
+    assert metrics.events_replayed == 2
+    assert metrics.events_new == 4
+    assert metrics.actions_emitted == 3
+    assert metrics.input_size == input_size
+    assert metrics.output_size > 0
+    for duration in (metrics.decode_duration, metrics.replay_duration,
+                     metrics.user_code_duration, metrics.serialize_duration):
+        assert duration > 0
+    assert metrics.total_duration == pytest.approx(
+        metrics.decode_duration + metrics.replay_duration
+        + metrics.user_code_duration + metrics.serialize_duration)
+
+
+def test_metrics_only_count_events_processed_by_a_cached_instance():
+    replay_cache = ReplayCache()
+    context_builder = ContextBuilder('test_orchestration_metrics')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    run(context_builder, replay_cache=replay_cache)
+
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    metrics, _ = run(context_builder, replay_cache=replay_cache)
+
+    assert replay_cache.hits == 1
+    assert metrics.events_processed == 4
+    assert metrics.actions_emitted == 3
+
+
+def test_metrics_are_reported_for_failed_orchestrations():
+    context_builder = ContextBuilder('test_orchestration_metrics')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+
+    with pytest.raises(Exception, match="Oops!"):
+        run(context_builder, failing_generator_function)
+
+
+def failing_metrics_callback(metrics):
+    raise RuntimeError("Metrics are down")
+
+
+def test_failing_metrics_callback_does_not_change_the_result():
+    context_builder = ContextBuilder('test_orchestration_metrics')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    expected_state = Orchestrator.create(generator_function)(context_builder.to_json_string())
+    handle = Orchestrator.create(generator_function, metrics_callback=failing_metrics_callback)
+
+    with pytest.warns(UserWarning, match="Metrics are down"):
+        state = handle(context_builder.to_json_string())
+
+    assert state == expected_state
+
+
+def test_failing_metrics_callback_does_not_replace_the_orchestration_error():
+    context_builder = ContextBuilder('test_orchestration_metrics')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    handle = Orchestrator.create(failing_generator_function,
+                                 metrics_callback=failing_metrics_callback)
+
+    with pytest.warns(UserWarning, match="Metrics are down"):
+        with pytest.raises(Exception, match="Oops!"):
+            handle(context_builder.to_json_string())
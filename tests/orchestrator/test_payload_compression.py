@@ -0,0 +1,45 @@
+import json
+
+from azure.durable_functions.models.DurableOrchestrationContext import \
+    DurableOrchestrationContext
+from azure.durable_functions.models.utils import payload_compression
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+LARGE_VALUE = {"cities": ["Tokyo", "Seattle", "London"] * 20}
+
+
+def generator_function(context):
+    context.set_custom_status(LARGE_VALUE)
+    result = yield context.call_activity("Hello", LARGE_VALUE)
+    yield context.call_sub_orchestrator("HelloOrchestrator", result)
+    return result
+
+
+def get_state(context_builder):
+    handle = Orchestrator.create(generator_function)
+    return json.loads(handle(context_builder.to_json_string()))
+
+
+def test_inputs_and_custom_status_are_compressed(zlib_payload_compressor):
+    context_builder = ContextBuilder('test_payload_compression')
+    add_completed_event(
+        context_builder, 0, 'Hello', payload_compression.compress_value(LARGE_VALUE))
+
+    state = get_state(context_builder)
+
+    activity_action, sub_orchestrator_action = (
+        action_list[0] for action_list in state["actions"])
+    for serialized_input in (activity_action["input"], sub_orchestrator_action["input"]):
+        assert payload_compression.decompress(json.loads(serialized_input)) == LARGE_VALUE
+    assert payload_compression.decompress(state["customStatus"]) == LARGE_VALUE
+
+
+def test_compressed_orchestration_input_is_decompressed(zlib_payload_compressor):
+    context_builder = ContextBuilder('test_payload_compression')
+    context_builder.input_ = payload_compression.compress(json.dumps(LARGE_VALUE))
+
+    context = DurableOrchestrationContext.from_json(context_builder.to_json_string())
+
+    assert context.get_input() == LARGE_VALUE
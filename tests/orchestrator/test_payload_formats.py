@@ -0,0 +1,42 @@
+import json
+
+from azure.durable_functions.models.DurableOrchestrationContext import \
+    DurableOrchestrationContext
+from azure.durable_functions.models.utils import payload_formats
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+VALUE = {"name": "report.pdf", "content": b"%PDF-1.7"}
+
+
+def generator_function(context):
+    result = yield context.call_activity("Hello", VALUE)
+    yield context.call_sub_orchestrator("HelloOrchestrator", result)
+    return result
+
+
+def get_state(context_builder):
+    handle = Orchestrator.create(generator_function)
+    return json.loads(handle(context_builder.to_json_string()))
+
+
+def test_inputs_and_output_are_binary_encoded(msgpack_payload_format):
+    context_builder = ContextBuilder('test_payload_formats')
+    add_completed_event(context_builder, 0, 'Hello', payload_formats.encode_value(VALUE))
+
+    state = get_state(context_builder)
+
+    activity_action, sub_orchestrator_action = (
+        action_list[0] for action_list in state["actions"])
+    for serialized_input in (activity_action["input"], sub_orchestrator_action["input"]):
+        assert payload_formats.decode_value(json.loads(serialized_input)) == VALUE
+
+
+def test_binary_encoded_orchestration_input_is_decoded(msgpack_payload_format):
+    context_builder = ContextBuilder('test_payload_formats')
+    context_builder.input_ = json.dumps(payload_formats.encode_value(VALUE))
+
+    context = DurableOrchestrationContext.from_json(context_builder.to_json_string())
+
+    assert context.get_input() == VALUE
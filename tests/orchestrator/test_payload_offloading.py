@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from azure.durable_functions.models.utils import payload_store
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+LARGE_VALUE = {"cities": ["Tokyo", "Seattle", "London"] * 20}
+
+
+def generator_function(context):
+    result = yield context.call_activity("Hello", LARGE_VALUE)
+    return [result, result]
+
+
+def get_state(context_builder):
+    handle = Orchestrator.create(generator_function)
+    return json.loads(handle(context_builder.to_json_string()))
+
+
+def test_large_activity_input_is_offloaded(file_payload_store):
+    state = get_state(ContextBuilder('test_payload_offloading'))
+
+    reference = json.loads(state["actions"][0][0]["input"])
+    assert payload_store.resolve(reference) == LARGE_VALUE
+
+
+def test_offloaded_activity_output_is_resolved_and_orchestration_output_offloaded(
+        file_payload_store):
+    context_builder = ContextBuilder('test_payload_offloading')
+    add_completed_event(context_builder, 0, 'Hello', payload_store.offload_value(LARGE_VALUE))
+
+    state = get_state(context_builder)
+
+    assert state["isDone"]
+    assert payload_store.is_reference(state["output"])
+    assert payload_store.resolve(state["output"]) == [LARGE_VALUE, LARGE_VALUE]
+
+
+def test_activity_functions_resolve_inputs_and_offload_outputs(app, file_payload_store):
+    @app.activity_trigger(input_name="cities")
+    def repeat_cities(cities):
+        return {"cities": cities["cities"] * 2}
+
+    activity = app.get_functions()[0].get_user_function()
+    output = activity(cities=payload_store.offload_value(LARGE_VALUE))
+
+    assert payload_store.is_reference(output)
+    assert payload_store.resolve(output) == {"cities": LARGE_VALUE["cities"] * 2}
+
+
+def test_async_activity_functions_offload_outputs(app, file_payload_store):
+    @app.activity_trigger(input_name="name")
+    async def get_large_value(name):
+        return LARGE_VALUE
+
+    activity = app.get_functions()[0].get_user_function()
+    output = asyncio.run(activity(name="Tokyo"))
+
+    assert payload_store.resolve(output) == LARGE_VALUE
+
+
+def test_activity_functions_are_left_as_they_are_without_payload_features(app):
+    def repeat_cities(cities):
+        return {"cities": cities["cities"] * 2}
+
+    app.activity_trigger(input_name="cities")(repeat_cities)
+
+    assert app.get_functions()[0].get_user_function() is repeat_cities
+
+
+def test_activity_functions_configured_by_other_decorators_resolve_inputs(
+        app, file_payload_store):
+    @app.activity_trigger(input_name="cities")
+    @app.function_name(name="RepeatCities")
+    def repeat_cities(cities):
+        return {"cities": cities["cities"] * 2}
+
+    function = app.get_functions()[0]
+    output = function.get_user_function()(cities=payload_store.offload_value(LARGE_VALUE))
+
+    assert function.get_function_name() == "RepeatCities"
+    assert payload_store.resolve(output) == {"cities": LARGE_VALUE["cities"] * 2}
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.ReplayCache import ReplayCache
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+
+def counting_generator_function(context):
+    counting_generator_function.starts += 1
+    outputs = []
+    outputs.append((yield context.call_activity("Hello", "Tokyo")))
+    outputs.append((yield context.call_activity("Hello", "Seattle")))
+    outputs.append((yield context.call_activity("Hello", "London")))
+    return outputs
+
+
+counting_generator_function.starts = 0
+
+
+def run(context_builder, replay_cache=None):
+    orchestrator = Orchestrator(counting_generator_function, replay_cache)
+    context = DurableOrchestrationContext.from_json(context_builder.to_json_string())
+    return json.loads(orchestrator.handle(context))
+
+
+def test_cached_instance_resumes_with_new_events_only():
+    counting_generator_function.starts = 0
+    replay_cache = ReplayCache()
+    context_builder = ContextBuilder('test_replay_cache')
+
+    run(context_builder, replay_cache)
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    run(context_builder, replay_cache)
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+    result = run(context_builder, replay_cache)
+
+    assert counting_generator_function.starts == 1
+    assert replay_cache.hits == 2
+    assert replay_cache.misses == 1
+    assert result == run(context_builder)
+    assert result["isDone"]
+    assert result["output"] == ["Hello Tokyo!", "Hello Seattle!", "Hello London!"]
+
+
+def test_completed_instance_is_not_cached():
+    replay_cache = ReplayCache()
+    context_builder = ContextBuilder('test_replay_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+
+    run(context_builder, replay_cache)
+
+    assert len(replay_cache) == 0
+
+
+def test_diverging_history_falls_back_to_full_replay():
+    counting_generator_function.starts = 0
+    replay_cache = ReplayCache()
+    context_builder = ContextBuilder('test_replay_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    run(context_builder, replay_cache)
+
+    # same instance, but a different history than the one that was cached
+    context_builder.history_events = context_builder.history_events[:2]
+    add_completed_event(context_builder, 0, 'Hello', "Hola Tokyo!")
+    add_completed_event(context_builder, 1, 'Hello', "Hola Seattle!")
+    result = run(context_builder, replay_cache)
+
+    assert counting_generator_function.starts == 2
+    assert replay_cache.hits == 0
+    assert replay_cache.misses == 2
+    assert result == run(context_builder)
+
+
+def test_least_recently_used_instances_are_evicted():
+    replay_cache = ReplayCache(max_instances=2)
+    context_builders = [ContextBuilder('test_replay_cache') for _ in range(3)]
+    for context_builder in context_builders:
+        run(context_builder, replay_cache)
+
+    assert len(replay_cache) == 2
+    assert replay_cache.evictions == 1
+    assert str(context_builders[0].instance_id) not in replay_cache
+
+
+def test_history_budget_is_enforced():
+    replay_cache = ReplayCache(max_history_events=3)
+    context_builder = ContextBuilder('test_replay_cache')
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+
+    run(context_builder, replay_cache)
+
+    assert len(replay_cache) == 0
+    assert replay_cache.evictions == 1
+
+
+def test_invalid_bounds_are_rejected():
+    with pytest.raises(ValueError):
+        ReplayCache(max_instances=0)
+    with pytest.raises(ValueError):
+        ReplayCache(max_history_events=0)
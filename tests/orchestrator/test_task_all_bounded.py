@@ -0,0 +1,108 @@
+import pytest
+
+from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
+from azure.durable_functions.models.actions.WhenAllAction import WhenAllAction
+from .orchestrator_test_utils import assert_orchestration_state_equals, \
+    get_orchestration_state_result, assert_valid_schema
+from .test_fan_out_fan_in import add_completed_event, add_failed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+CITIES = ["Tokyo", "Seattle", "London", "Cairo", "Lima"]
+
+
+def generator_function(context):
+    outputs = yield context.task_all_bounded(
+        lambda city: context.call_activity("Hello", city), CITIES, max_concurrency=2)
+    return outputs
+
+
+def generator_function_invalid_concurrency(context):
+    yield context.task_all_bounded(
+        lambda city: context.call_activity("Hello", city), CITIES, max_concurrency=0)
+
+
+def base_expected_state(output=None, replay_schema: ReplaySchema = ReplaySchema.V1) \
+        -> OrchestratorState:
+    return OrchestratorState(is_done=False, actions=[], output=output, replay_schema=replay_schema)
+
+
+def add_hello_action(state: OrchestratorState, cities):
+    actions = [CallActivityAction(function_name='Hello', input_=city) for city in cities]
+    if state._replay_schema is ReplaySchema.V1:
+        state._actions.append(actions)
+    elif not state._actions:
+        state._actions.append([WhenAllAction(actions)])
+    else:
+        state._actions[0].extend(actions)
+
+
+def test_initial_tasks_are_bounded():
+    context_builder = ContextBuilder('test_task_all_bounded')
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state()
+    add_hello_action(expected_state, CITIES[:2])
+    expected = expected_state.to_json()
+
+    assert_valid_schema(result)
+    assert_orchestration_state_equals(expected, result)
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_next_task_is_scheduled_when_a_task_completes(replay_schema):
+    context_builder = ContextBuilder('test_task_all_bounded', replay_schema=replay_schema)
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state(replay_schema=replay_schema)
+    add_hello_action(expected_state, CITIES[:2])
+    add_hello_action(expected_state, CITIES[2:3])
+    expected = expected_state.to_json()
+
+    assert_orchestration_state_equals(expected, result)
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_results_are_in_the_order_of_the_items(replay_schema):
+    context_builder = ContextBuilder('test_task_all_bounded', replay_schema=replay_schema)
+    # task IDs are assigned as tasks are scheduled, i.e. in the order of the items
+    for id_ in [1, 0, 3, 2, 4]:
+        add_completed_event(context_builder, id_, 'Hello', f"Hello {CITIES[id_]}!")
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state(
+        [f"Hello {city}!" for city in CITIES], replay_schema=replay_schema)
+    add_hello_action(expected_state, CITIES[:2])
+    for city in CITIES[2:]:
+        add_hello_action(expected_state, [city])
+    expected_state._is_done = True
+    expected = expected_state.to_json()
+
+    assert_orchestration_state_equals(expected, result)
+
+
+def test_no_tasks_are_scheduled_after_a_failure():
+    context_builder = ContextBuilder('test_task_all_bounded')
+    add_failed_event(context_builder, 0, 'Hello', "Kaboom!", "Kaboom!")
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+
+    with pytest.raises(Exception) as exception:
+        get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state()
+    add_hello_action(expected_state, CITIES[:2])
+    expected_state._error = "Kaboom! \n Kaboom!"
+    assert str(exception.value).endswith(expected_state.to_json_string())
+
+
+def test_max_concurrency_must_be_positive():
+    context_builder = ContextBuilder('test_task_all_bounded')
+
+    with pytest.raises(Exception, match="max_concurrency must be at least 1"):
+        get_orchestration_state_result(
+            context_builder, generator_function_invalid_concurrency)
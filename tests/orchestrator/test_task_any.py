@@ -58,4 +58,54 @@ def test_succeeds_on_one_result():
     add_multi_actions(expected_state, function_name='Hello', volume=3)
     expected_state._is_done = True
     expected = expected_state.to_json()
-    assert_orchestration_state_equals(expected, result)
\ No newline at end of file
+    assert_orchestration_state_equals(expected, result)
+
+
+def generator_function_ignores_slower_results(context):
+    task1 = context.call_activity("Hello", "0")
+    task2 = context.call_activity("Hello", "1")
+    first_completed_task = yield context.task_any([task1, task2])
+    yield context.call_activity("Hello", "2")
+    return first_completed_task.result
+
+
+def test_results_are_only_deserialized_when_accessed():
+    context_builder = ContextBuilder()
+    add_completed_event(context_builder, 0, "Hello", result="1")
+    context_builder.add_task_scheduled_event(name="Hello", id_=2)
+    # a payload that would fail to deserialize, were it ever accessed
+    context_builder.add_task_completed_event(id_=1, result="{not json")
+    add_completed_event(context_builder, 2, "Hello", result="3")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_ignores_slower_results)
+
+    assert result["isDone"]
+    assert result["output"] == "1"
+
+
+def generator_function_nested_in_task_all(context):
+    task1 = context.call_activity("Hello", "0")
+    yield task1
+    task2 = context.call_activity("Hello", "1")
+    any_task = context.task_any([task1, task2])
+    task3 = context.call_activity("Hello", "2")
+    yield context.task_all([any_task, task3])
+    return "Done!"
+
+
+def test_task_any_completed_when_created_notifies_its_parent_once():
+    context_builder = ContextBuilder()
+    add_completed_event(context_builder, 0, "Hello", result="1")
+    context_builder.add_task_scheduled_event(name="Hello", id_=1)
+    context_builder.add_task_scheduled_event(name="Hello", id_=2)
+    context_builder.add_orchestrator_completed_event()
+    context_builder.add_orchestrator_started_event()
+    context_builder.add_task_completed_event(id_=1, result='"2"')
+    context_builder.add_task_completed_event(id_=2, result='"3"')
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_nested_in_task_all)
+
+    assert result["isDone"]
+    assert result["output"] == "Done!"
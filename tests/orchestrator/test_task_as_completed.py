@@ -0,0 +1,88 @@
+import pytest
+
+from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
+from azure.durable_functions.models.actions.WhenAnyAction import WhenAnyAction
+from .orchestrator_test_utils import assert_orchestration_state_equals, \
+    get_orchestration_state_result, assert_valid_schema
+from .test_fan_out_fan_in import add_completed_event, add_failed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+CITIES = ["Tokyo", "Seattle", "London"]
+
+
+def generator_function(context):
+    tasks = [context.call_activity("Hello", city) for city in CITIES]
+    outputs = []
+    for next_completed in context.task_as_completed(tasks):
+        completed_task = yield next_completed
+        result = completed_task.result
+        outputs.append(str(result) if isinstance(result, Exception) else result)
+    return outputs
+
+
+def base_expected_state(output=None, replay_schema: ReplaySchema = ReplaySchema.V1) \
+        -> OrchestratorState:
+    state = OrchestratorState(is_done=False, actions=[], output=output,
+                              replay_schema=replay_schema)
+    actions = [CallActivityAction(function_name='Hello', input_=city) for city in CITIES]
+    if replay_schema is ReplaySchema.V1:
+        state._actions.append(actions)
+    else:
+        state._actions.append([WhenAnyAction(actions)])
+    return state
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_all_tasks_are_scheduled_at_once(replay_schema):
+    context_builder = ContextBuilder('test_task_as_completed', replay_schema=replay_schema)
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected = base_expected_state(replay_schema=replay_schema).to_json()
+    if replay_schema is ReplaySchema.V1:
+        assert_valid_schema(result)
+    assert_orchestration_state_equals(expected, result)
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_results_are_processed_as_they_complete(replay_schema):
+    context_builder = ContextBuilder('test_task_as_completed', replay_schema=replay_schema)
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected = base_expected_state(replay_schema=replay_schema).to_json()
+    assert_orchestration_state_equals(expected, result)
+    assert result["isDone"] is False
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_results_are_in_order_of_completion(replay_schema):
+    context_builder = ContextBuilder('test_task_as_completed', replay_schema=replay_schema)
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state(
+        ["Hello London!", "Hello Tokyo!", "Hello Seattle!"], replay_schema=replay_schema)
+    expected_state._is_done = True
+    assert_orchestration_state_equals(expected_state.to_json(), result)
+
+
+def test_failed_tasks_are_returned_in_order_of_completion():
+    context_builder = ContextBuilder('test_task_as_completed')
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    add_failed_event(context_builder, 0, 'Hello', "Kaboom!", "Kaboom!")
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+
+    result = get_orchestration_state_result(context_builder, generator_function)
+
+    expected_state = base_expected_state(
+        ["Hello Seattle!", "Kaboom! \n Kaboom!", "Hello London!"])
+    expected_state._is_done = True
+    assert_orchestration_state_equals(expected_state.to_json(), result)
@@ -0,0 +1,143 @@
+import gc
+import json
+import weakref
+from datetime import datetime
+
+from azure.durable_functions.models import DurableOrchestrationContext
+from azure.durable_functions.models.Task import TaskBase
+from azure.durable_functions.models.actions.WaitForExternalEventAction import \
+    WaitForExternalEventAction
+from azure.durable_functions.orchestrator import Orchestrator
+from .orchestrator_test_utils import get_orchestration_state_result
+from .test_fan_out_fan_in import add_completed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+NUM_ITERATIONS = 50
+
+
+def generator_function_retained_winners(context):
+    winners = []
+    other_task_refs = []
+    for i in range(NUM_ITERATIONS):
+        tasks = [context.call_activity("Hello", f"{i}a"), context.call_activity("Hello", f"{i}b")]
+        when_any = context.task_any(tasks)
+        # the executor still references the tasks of the last iteration
+        if i < NUM_ITERATIONS - 1:
+            other_task_refs.extend(weakref.ref(task) for task in tasks + [when_any])
+        del tasks
+        winners.append((yield when_any))
+        del when_any
+    gc.collect()
+    return sum(task_ref() is not None for task_ref in other_task_refs) - (len(winners) - 1)
+
+
+def generator_function_sequential(context, num_activities):
+    for i in range(num_activities):
+        yield context.call_activity("Hello", i)
+    return "Done!"
+
+
+def replay_sequential_activities(num_activities):
+    context_builder = ContextBuilder('test_task_memory')
+    for i in range(num_activities):
+        add_completed_event(context_builder, i, 'Hello', f"Hello {i}!")
+    context = DurableOrchestrationContext.from_json(context_builder.to_json_string())
+    orchestrator = Orchestrator(
+        lambda context: generator_function_sequential(context, num_activities))
+
+    state = json.loads(orchestrator.handle(context))
+
+    gc.collect()
+    live_tasks = [obj for obj in gc.get_objects() if isinstance(obj, TaskBase)]
+    return state, len(live_tasks)
+
+
+def generator_function_repeated_event(context):
+    yield context.wait_for_external_event("B")
+    first = yield context.wait_for_external_event("A")
+    second = yield context.wait_for_external_event("A")
+    return [first, second]
+
+
+def generator_function_inspects_children(context):
+    when_all = context.task_all([context.call_activity("Hello", "Tokyo"),
+                                 context.call_activity("Hello", "Seattle")])
+    when_any = context.task_any([context.call_activity("Hello", "London")])
+    yield when_all
+    yield when_any
+    return [[task.result for task in compound_task.children]
+            + [task.result for task in compound_task.completed_tasks]
+            for compound_task in (when_all, when_any)]
+
+
+def test_completed_task_all_and_task_any_keep_their_children():
+    context_builder = ContextBuilder('test_task_memory')
+    add_completed_event(context_builder, 1, 'Hello', "Hello Seattle!")
+    add_completed_event(context_builder, 0, 'Hello', "Hello Tokyo!")
+    add_completed_event(context_builder, 2, 'Hello', "Hello London!")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_inspects_children)
+
+    assert result["output"] == [
+        ["Hello Tokyo!", "Hello Seattle!", "Hello Seattle!", "Hello Tokyo!"],
+        ["Hello London!", "Hello London!"]]
+
+
+def test_retained_tasks_do_not_retain_their_siblings():
+    context_builder = ContextBuilder('test_task_memory')
+    for i in range(NUM_ITERATIONS):
+        add_completed_event(context_builder, 2 * i, 'Hello', f"Hello {i}a!")
+        add_completed_event(context_builder, 2 * i + 1, 'Hello', f"Hello {i}b!")
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_retained_winners)
+
+    assert result["isDone"]
+    assert result["output"] == 0
+
+
+def test_sequential_replays_do_not_retain_completed_tasks():
+    # the history and the actions grow with every activity, but the live tasks must not
+    state, num_live_tasks = replay_sequential_activities(NUM_ITERATIONS)
+    longer_state, longer_num_live_tasks = replay_sequential_activities(2 * NUM_ITERATIONS)
+
+    assert state["isDone"] and longer_state["isDone"]
+    assert longer_num_live_tasks == num_live_tasks
+
+
+def test_early_events_are_delivered_once():
+    timestamp = datetime.now()
+    context_builder = ContextBuilder('test_task_memory')
+    context_builder.add_event_raised_event(
+        "A", input_=json.dumps("first"), timestamp=timestamp, id_=-1)
+    context_builder.add_event_raised_event(
+        "B", input_=json.dumps("other"), timestamp=timestamp, id_=-1)
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_repeated_event)
+
+    # the second wait for "A" has no event of its own, so it must not reuse the first one
+    assert not result["isDone"]
+
+
+def test_scheduled_tasks_and_actions_have_no_instance_dict():
+    context_builder = ContextBuilder('test_task_memory')
+    context = DurableOrchestrationContext.from_json(context_builder.to_json_string())
+
+    tasks = [context.call_activity("Hello", "Tokyo"), context.create_timer(datetime.now())]
+    when_all = context.task_all(tasks)
+
+    for task in tasks + [when_all]:
+        assert not hasattr(task, "__dict__")
+        for action in task.action_repr:
+            assert not hasattr(action, "__dict__")
+
+
+def test_public_action_attributes_remain_assignable():
+    action = WaitForExternalEventAction("Approval")
+
+    action.reason = "Approval"
+
+    assert action.to_json()["reason"] == "Approval"
+    assert not hasattr(action, "__dict__")
@@ -0,0 +1,140 @@
+import gc
+import weakref
+
+import pytest
+
+from azure.durable_functions.models.OrchestratorState import OrchestratorState
+from azure.durable_functions.models.ReplaySchema import ReplaySchema
+from azure.durable_functions.models.actions.CallActivityAction import CallActivityAction
+from azure.durable_functions.models.actions.WhenAllAction import WhenAllAction
+from .orchestrator_test_utils import assert_orchestration_state_equals, \
+    get_orchestration_state_result
+from .test_fan_out_fan_in import add_completed_event, add_failed_event
+from tests.test_utils.ContextBuilder import ContextBuilder
+
+NUM_ACTIVITIES = 4
+
+
+def generator_function_sum(context):
+    total = yield context.task_reduce(
+        [context.call_activity("GetSize", i) for i in range(NUM_ACTIVITIES)],
+        lambda total, size: total + size, 0)
+    return total
+
+
+def generator_function_completion_order(context):
+    order = yield context.task_reduce(
+        [context.call_activity("GetSize", i) for i in range(NUM_ACTIVITIES)],
+        lambda order, size: order + [size], [])
+    return order
+
+
+def generator_function_released_tasks(context):
+    tasks = [context.call_activity("GetSize", i) for i in range(NUM_ACTIVITIES)]
+    task_refs = [weakref.ref(task) for task in tasks]
+    reduce_task = context.task_reduce(tasks, lambda total, size: total + size, 0)
+    del tasks
+    yield reduce_task
+    gc.collect()
+    return sum(task_ref() is not None for task_ref in task_refs)
+
+
+def generator_function_empty(context):
+    total = yield context.task_reduce([], lambda total, size: total + size, 0)
+    return total
+
+
+def generator_function_failing_reducer(context):
+    try:
+        yield context.task_reduce(
+            [context.call_activity("GetSize", i) for i in range(NUM_ACTIVITIES)],
+            lambda total, size: total / 0, 0)
+    except ZeroDivisionError as e:
+        return f"Handled: {e}"
+
+
+def base_expected_state(output=None, replay_schema: ReplaySchema = ReplaySchema.V1) \
+        -> OrchestratorState:
+    state = OrchestratorState(is_done=False, actions=[], output=output,
+                              replay_schema=replay_schema)
+    actions = [CallActivityAction("GetSize", i) for i in range(NUM_ACTIVITIES)]
+    if replay_schema is ReplaySchema.V1:
+        state._actions.append(actions)
+    else:
+        state._actions.append([WhenAllAction(actions)])
+    return state
+
+
+def add_completed_events(context_builder, ids):
+    for id_ in ids:
+        add_completed_event(context_builder, id_, "GetSize", 10 ** id_)
+
+
+@pytest.mark.parametrize("replay_schema", [ReplaySchema.V1, ReplaySchema.V2])
+def test_all_tasks_are_scheduled_at_once(replay_schema):
+    context_builder = ContextBuilder('test_task_reduce', replay_schema=replay_schema)
+    add_completed_events(context_builder, [2])
+
+    result = get_orchestration_state_result(context_builder, generator_function_sum)
+
+    expected = base_expected_state(replay_schema=replay_schema).to_json()
+    assert_orchestration_state_equals(expected, result)
+
+
+def test_results_are_folded():
+    context_builder = ContextBuilder('test_task_reduce')
+    add_completed_events(context_builder, range(NUM_ACTIVITIES))
+
+    result = get_orchestration_state_result(context_builder, generator_function_sum)
+
+    assert result["isDone"]
+    assert result["output"] == 1111
+
+
+def test_results_are_folded_in_order_of_completion():
+    context_builder = ContextBuilder('test_task_reduce')
+    add_completed_events(context_builder, [2, 0, 3, 1])
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_completion_order)
+
+    assert result["output"] == [100, 1, 1000, 10]
+
+
+def test_completed_tasks_are_released():
+    context_builder = ContextBuilder('test_task_reduce')
+    add_completed_events(context_builder, range(NUM_ACTIVITIES))
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_released_tasks)
+
+    assert result["output"] == 0
+
+
+def test_no_tasks_result_in_the_initial_value():
+    context_builder = ContextBuilder('test_task_reduce')
+
+    result = get_orchestration_state_result(context_builder, generator_function_empty)
+
+    assert result["isDone"]
+    assert result["output"] == 0
+
+
+def test_first_failure_fails_the_task():
+    context_builder = ContextBuilder('test_task_reduce')
+    add_completed_events(context_builder, [0])
+    add_failed_event(context_builder, 1, "GetSize", "Kaboom!", "Kaboom!")
+
+    with pytest.raises(Exception, match="Kaboom!"):
+        get_orchestration_state_result(context_builder, generator_function_sum)
+
+
+def test_reducer_errors_fail_the_task():
+    context_builder = ContextBuilder('test_task_reduce')
+    add_completed_events(context_builder, range(NUM_ACTIVITIES))
+
+    result = get_orchestration_state_result(
+        context_builder, generator_function_failing_reducer)
+
+    assert result["isDone"]
+    assert result["output"] == "Handled: division by zero"
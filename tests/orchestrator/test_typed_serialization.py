@@ -0,0 +1,62 @@
+import json
+from dataclasses import dataclass
+from typing import List
+
+from azure.durable_functions.models.utils import json_codec, type_codecs
+from azure.durable_functions.orchestrator import Orchestrator
+from tests.test_utils.ContextBuilder import ContextBuilder
+from .test_fan_out_fan_in import add_completed_event
+
+
+@dataclass
+class City:
+    name: str
+    population: int
+
+
+def generator_function(context):
+    cities = yield context.call_activity("GetCities", [City("Tokyo", 14)])
+    return sum(city.population for city in cities)
+
+
+def encode(value):
+    return json.loads(json_codec.dumps(value, default=type_codecs.serialize_custom_object))
+
+
+def test_dataclass_inputs_and_results_round_trip():
+    context_builder = ContextBuilder('test_typed_serialization')
+    add_completed_event(context_builder, 0, 'GetCities',
+                        encode([City("Tokyo", 14), City("Seattle", 1)]))
+
+    handle = Orchestrator.create(generator_function)
+    state = json.loads(handle(context_builder.to_json_string()))
+
+    assert json.loads(state["actions"][0][0]["input"]) == encode([City("Tokyo", 14)])
+    assert state["output"] == 15
+
+
+def test_activities_decode_inputs_by_annotation_and_encode_outputs(app):
+    @app.activity_trigger(input_name="cities")
+    def double_populations(cities: List[City]) -> List[City]:
+        return [City(city.name, city.population * 2) for city in cities]
+
+    activity = app.get_functions()[0].get_user_function()
+    # the activity trigger decodes inputs, but leaves objects encoded via codecs as they are
+    output = activity(cities=encode([City("Tokyo", 14)]))
+
+    assert json.loads(json.dumps(output)) == encode([City("Tokyo", 28)])
+    assert activity(cities=[{"name": "Tokyo", "population": 14}]) == output
+
+
+def test_activity_outputs_without_custom_objects_are_not_encoded(app, monkeypatch):
+    @app.activity_trigger(input_name="cities")
+    def get_names(cities: List[City]) -> List[dict]:
+        return [{"name": city.name} for city in cities]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the output was encoded")
+
+    monkeypatch.setattr(json_codec, "dumps", fail)
+    activity = app.get_functions()[0].get_user_function()
+
+    assert activity(cities=[{"name": "Tokyo", "population": 14}]) == [{"name": "Tokyo"}]